@@ -0,0 +1,45 @@
+"""Building figures with many traces, trace by trace and in one batch.
+
+python benchmarks/bench_add_traces.py
+"""
+
+import time
+import numpy as np
+import plotly.graph_objects as go
+from plotly_presentation._core.plotter import Plotter
+
+N_POINTS = 50
+
+
+def make_traces(n_traces):
+    x = np.arange(N_POINTS)
+    return [go.Scatter(x=x, y=x * i, name=f"series {i}") for i in range(n_traces)]
+
+
+def one_by_one(traces):
+    p = Plotter()
+    for trace in traces:
+        p.add_trace(trace)
+
+
+def batched(traces):
+    Plotter().add_traces(traces)
+
+
+def main():
+    for n_traces in [250, 500, 1000]:
+        traces = make_traces(n_traces)
+        timings = []
+        for build in [one_by_one, batched]:
+            start = time.perf_counter()
+            build(traces)
+            timings.append(time.perf_counter() - start)
+        print(
+            f"{n_traces:>5} traces  add_trace: {timings[0]:7.3f} s  "
+            f"add_traces: {timings[1]:7.3f} s  "
+            f"({timings[1] / n_traces * 1000:.2f} ms per trace)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Adding many circle highlights, callout by callout and with add_many, as shapes and as markers.
+
+python benchmarks/bench_callouts.py
+"""
+
+import time
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly_presentation._core.plotter import Plotter
+
+
+def make_plotter(n_callouts):
+    p = Plotter()
+    p.add_trace(go.Scatter(x=np.arange(n_callouts), y=np.arange(n_callouts)))
+    return p
+
+
+def make_callouts(n_callouts):
+    return pd.DataFrame(
+        {
+            "x": np.arange(n_callouts),
+            "y": np.arange(n_callouts),
+            "text": [f"{i}%" for i in range(n_callouts)],
+        }
+    )
+
+
+def one_by_one(p, callouts):
+    for row in callouts.itertuples():
+        p.callout.add_circle_highlight(x=row.x, y=row.y, text=row.text)
+
+
+def bulk(p, callouts):
+    p.callout.add_many(callouts, kind="circle_highlight")
+
+
+def bulk_markers(p, callouts):
+    p.callout.add_many(callouts, kind="circle_highlight", backend="marker")
+
+
+def main():
+    for n_callouts in [10, 100, 1000]:
+        callouts = make_callouts(n_callouts)
+        timings = []
+        for add in [one_by_one, bulk, bulk_markers]:
+            p = make_plotter(n_callouts)
+            start = time.perf_counter()
+            add(p, callouts)
+            timings.append(time.perf_counter() - start)
+        print(
+            f"{n_callouts:>5} callouts  one by one: {timings[0]:7.3f} s  "
+            f"add_many: {timings[1]:7.3f} s  ({timings[0] / timings[1]:.1f}x)  "
+            f"markers: {timings[2]:7.3f} s  ({timings[0] / timings[2]:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Adjusting the brightness of 1M colors, one at a time and batched.
+
+python benchmarks/bench_color_brightness.py
+"""
+
+import time
+import numpy as np
+from plotly_presentation._core.utils.color_helper import (
+    adjust_color_brightness,
+    adjust_colors_brightness,
+)
+
+N_COLORS = 1_000_000
+
+
+def main():
+    rng = np.random.default_rng(0)
+    rgb = rng.integers(0, 256, size=(N_COLORS, 3))
+    levels = rng.integers(-5, 6, size=N_COLORS)
+    colors = ["#{:02X}{:02X}{:02X}".format(*color) for color in rgb.tolist()]
+
+    start = time.perf_counter()
+    expected = [
+        adjust_color_brightness(color, level)
+        for color, level in zip(colors, levels.tolist())
+    ]
+    loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = adjust_colors_brightness(colors, levels)
+    batched_hex = time.perf_counter() - start
+
+    start = time.perf_counter()
+    adjust_colors_brightness(rgb, levels)
+    batched_array = time.perf_counter() - start
+
+    assert batched == expected
+    print(f"loop:             {loop:.3f} s")
+    print(f"batched (hex):    {batched_hex:.3f} s ({loop / batched_hex:.0f}x)")
+    print(f"batched (array):  {batched_array:.3f} s ({loop / batched_array:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
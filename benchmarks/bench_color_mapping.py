@@ -0,0 +1,24 @@
+"""Coloring 1M values through the ColorMapper lookup table.
+
+python benchmarks/bench_color_mapping.py
+"""
+
+import time
+import numpy as np
+from plotly_presentation._core.colors import ColorMapper
+
+N_VALUES = 1_000_000
+
+
+def main():
+    values = np.random.default_rng(0).normal(size=N_VALUES)
+    mapper = ColorMapper.diverging(midpoint=0)
+    for output in ["array", "hex", "rgba"]:
+        start = time.perf_counter()
+        mapper.map(values, output=output)
+        elapsed = time.perf_counter() - start
+        print(f"{output:<6} {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""plotly.express charts of a wide fact table, with and without column projection.
+
+python benchmarks/bench_column_projection.py
+"""
+
+import time
+import numpy as np
+import pandas as pd
+import plotly.express as px
+from plotly_presentation._core.utils.frame_helper import project_frame
+
+N_ROWS = 1_000_000
+N_COLUMNS = 80
+
+CHARTS = {
+    "bar": {"x": "category", "y": "value_0", "color": "region"},
+    "histogram": {"x": "value_1", "color": "region"},
+    "box": {"x": "category", "y": "value_2"},
+}
+
+
+def make_frame():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({f"value_{i}": rng.random(N_ROWS) for i in range(N_COLUMNS - 2)})
+    df["category"] = rng.choice([f"c{i}" for i in range(20)], N_ROWS)
+    df["region"] = rng.choice(["north", "east", "south", "west"], N_ROWS)
+    return df
+
+
+def main():
+    df = make_frame()
+    print(f"{N_ROWS} rows x {N_COLUMNS} columns")
+    for chart, arguments in CHARTS.items():
+        timings = []
+        for projected in [False, True]:
+            kwargs = dict(arguments, data_frame=df)
+            start = time.perf_counter()
+            if projected:
+                project_frame(kwargs)
+            getattr(px, chart)(**kwargs)
+            timings.append(time.perf_counter() - start)
+        print(
+            f"{chart:>10}  full frame: {timings[0]:6.3f} s  "
+            f"projected: {timings[1]:6.3f} s  ({timings[0] / timings[1]:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Line charts of a long sensor signal, with and without downsampling.
+
+python benchmarks/bench_downsample.py
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from plotly_presentation._core.plotter import Plotter
+
+N_POINTS = 2_000_000
+
+
+def make_signal():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "time": pd.date_range("2024-01-01", periods=N_POINTS, freq="s"),
+            "value": rng.normal(size=N_POINTS).cumsum(),
+        }
+    )
+
+
+def main():
+    df = make_signal()
+    print(f"{N_POINTS} points")
+    for downsample in [False, "lttb", "minmax"]:
+        start = time.perf_counter()
+        p = Plotter()
+        p.express(
+            type="line", data_frame=df, x="time", y="value", downsample=downsample
+        )
+        built = time.perf_counter()
+        size = len(p.to_json())
+        exported = time.perf_counter()
+        print(
+            f"{str(downsample):>7}  points: {len(p.figure.data[0].y):>8}  "
+            f"express: {built - start:6.3f} s  to_json: {exported - built:6.3f} s  "
+            f"json: {size / 1e6:7.2f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
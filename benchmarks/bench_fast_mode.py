@@ -0,0 +1,58 @@
+"""Building a figure of 100 traces with 100k points each, with and without fast mode.
+
+python benchmarks/bench_fast_mode.py
+"""
+
+import time
+import numpy as np
+import plotly.graph_objects as go
+from plotly_presentation._core.plotter import Plotter
+
+N_TRACES = 100
+N_POINTS = 100_000
+
+
+def make_data():
+    rng = np.random.default_rng(0)
+    x = np.arange(N_POINTS)
+    return x, [rng.normal(size=N_POINTS).cumsum() for _ in range(N_TRACES)]
+
+
+def default_mode(x, ys):
+    p = Plotter()
+    for i, y in enumerate(ys):
+        p.add_trace(go.Scatter(x=x, y=y, name=f"series {i}"))
+        p.callout.add_circle_highlight(x=int(x[-1]), y=float(y[-1]), text=str(i))
+    return p
+
+
+def fast_mode(x, ys, validate):
+    p = Plotter(fast=True, validate=validate)
+    for i, y in enumerate(ys):
+        p.add_trace({"type": "scatter", "x": x, "y": y, "name": f"series {i}"})
+        p.callout.add_circle_highlight(x=int(x[-1]), y=float(y[-1]), text=str(i))
+    return p
+
+
+def main():
+    x, ys = make_data()
+    builds = {
+        "default": lambda: default_mode(x, ys),
+        "fast": lambda: fast_mode(x, ys, validate=True),
+        "fast, validate=False": lambda: fast_mode(x, ys, validate=False),
+    }
+    print(f"{N_TRACES} traces x {N_POINTS} points")
+    for name, build in builds.items():
+        start = time.perf_counter()
+        p = build()
+        built = time.perf_counter()
+        p.to_dict()
+        exported = time.perf_counter()
+        print(
+            f"{name:>22}  build: {built - start:7.3f} s  "
+            f"to_dict: {exported - built:7.3f} s  total: {exported - start:7.3f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Per-figure json size with the full template and with the slimmed template.
+
+python benchmarks/bench_template_slimming.py
+"""
+
+import plotly.graph_objects as go
+from plotly_presentation._core.plotter import Plotter
+
+CATEGORIES = ["North", "South", "East", "West", "Central"]
+
+
+def bar_slide():
+    p = Plotter()
+    p.express(type="bar", x=CATEGORIES, y=[5, 3, 4, 2, 6])
+    return p
+
+
+def line_slide():
+    p = Plotter()
+    p.express(type="line", x=list(range(24)), y=[i**0.5 for i in range(24)])
+    return p
+
+
+def waterfall_slide():
+    p = Plotter()
+    p.add_trace(
+        go.Waterfall(
+            x=["Start", "Price", "Volume", "Mix", "End"],
+            y=[100, 10, -5, 2, 0],
+            measure=["absolute", "relative", "relative", "relative", "total"],
+        )
+    )
+    return p
+
+
+def main():
+    for name, build in [
+        ("bar", bar_slide),
+        ("line", line_slide),
+        ("waterfall", waterfall_slide),
+    ]:
+        p = build()
+        full = len(p.figure.to_json())
+        slim = len(p.to_json())
+        print(
+            f"{name:<10} full: {full:>6} bytes  slim: {slim:>6} bytes  "
+            f"saved: {full - slim:>6} bytes ({(full - slim) / full:.0%})"
+        )
+
+
+if __name__ == "__main__":
+    main()
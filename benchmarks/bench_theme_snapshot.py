@@ -0,0 +1,44 @@
+"""Start up cost of loading the theme configs with and without a compiled snapshot.
+
+python benchmarks/bench_theme_snapshot.py
+"""
+
+import os
+import shutil
+import tempfile
+import timeit
+from pathlib import Path
+from unittest import mock
+from plotly_presentation._core.options import Options
+from plotly_presentation._core.snapshot import THEME_FILES, compile_snapshot
+from plotly_presentation._core.utils.root_searcher import get_file_path
+
+REPEAT = 200
+
+
+def load_theme(config_dir):
+    with mock.patch.dict(os.environ, {"PLOTLY_CONFIG_DIR": str(config_dir)}):
+        options = Options()
+    for option_name in ["config.layout", "config.colors", "config.callout_settings"]:
+        options.get_option(option_name)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config_dir = Path(tmp_dir)
+        for filename in THEME_FILES:
+            path = Path(get_file_path(filename))
+            if path.is_file():
+                shutil.copy(path, config_dir / filename)
+
+        without = timeit.timeit(lambda: load_theme(config_dir), number=REPEAT)
+        compile_snapshot(config_dir)
+        with_snapshot = timeit.timeit(lambda: load_theme(config_dir), number=REPEAT)
+
+    print(f"yaml:     {without / REPEAT * 1000:.2f} ms per start up")
+    print(f"snapshot: {with_snapshot / REPEAT * 1000:.2f} ms per start up")
+    print(f"speed up: {without / with_snapshot:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
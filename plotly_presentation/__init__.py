@@ -1,2 +1,26 @@
-from plotly_presentation._core.plotter import Plotter
-from plotly_presentation import examples
+import importlib
+
+__all__ = ["Plotter", "Analysis", "examples"]
+
+# Public names are resolved on first access so that `import plotly_presentation`
+# does not pull in plotly, pandas or the examples (which change the renderer).
+_LAZY_ATTRIBUTES = {
+    "Plotter": ("plotly_presentation._core.plotter", "Plotter"),
+    "Analysis": ("plotly_presentation._core.analysis", "Analysis"),
+    "examples": ("plotly_presentation.examples", None),
+}
+
+
+def __getattr__(name):
+    try:
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(module_name)
+    value = module if attribute is None else getattr(module, attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -5,6 +5,7 @@ from plotly_presentation._core.analysis_helper.comparison import Comparison
 import plotly.graph_objects as go
 import numpy as np
 from plotly_presentation._core.analysis_helper.utils import assign_figure_to_self
+from plotly_presentation._core.plan import recorded
 
 
 class Analysis(Plotter):
@@ -14,6 +15,7 @@ class Analysis(Plotter):
         self.comparison = Comparison(parent=self)
         self.price_volume = PriceVolume(parent=self)
 
+    @recorded
     def adjust_yaxis(self, range: list) -> go.Figure:
         self.figure.update_yaxes(range=range)
         # Create a secondary x-axis
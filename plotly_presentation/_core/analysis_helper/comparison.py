@@ -1,12 +1,15 @@
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
+import plotly.io as pio
 from plotly_presentation._core.utils.color_helper import adjust_color_brightness
 from plotly_presentation._core.colors import Color
+from plotly_presentation._core.style import get_template
 from plotly_presentation._core.analysis_helper.utils import (
     assign_figure_to_self,
     apply_setting,
 )
+from plotly_presentation._core.plan import recorded
 
 
 class Comparison:
@@ -21,10 +24,17 @@ class Comparison:
         horisontal_stacked_bar_with_total(...): Creates a horizontal stacked bar chart with totals.
     """
 
+    _plan_target = "comparison"
+
     def __init__(self, parent=None):
         # self.figure = None
         self.parent = parent
 
+    @property
+    def _plan(self):
+        """The plan of the parent when it is lazy"""
+        return getattr(self.parent, "_plan", None)
+
     def _get_original_sorting(self, df: pd.DataFrame, columns: list | str) -> dict:
         """
         Returns a dictionary mapping each unique value in the specified columns to its original order.
@@ -171,6 +181,34 @@ class Comparison:
             )
         return color_discrete_map
 
+    def _get_bar_colors(self, categories: pd.Series, **kwargs) -> list:
+        """
+        Returns the color of every bar, as plotly.express would color one trace per category.
+
+        Categories missing from `color_discrete_map` get the next color of the
+        `color_discrete_sequence`, or of the template colorway.
+
+        Args:
+            categories (pd.Series): The category of every bar.
+
+        Returns:
+            list: The color of every bar.
+        """
+        color_map = dict(kwargs.get("color_discrete_map") or {})
+        sequence = kwargs.get("color_discrete_sequence")
+        if not sequence:
+            template = kwargs.get("template")
+            if isinstance(template, str):
+                template = pio.templates[template]
+            sequence = (
+                template.layout.colorway if template is not None else None
+            ) or px.colors.qualitative.D3
+        for category in categories.unique():
+            if category not in color_map:
+                color_map[category] = sequence[len(color_map) % len(sequence)]
+        return categories.map(color_map).tolist()
+
+    @recorded
     @assign_figure_to_self
     @apply_setting
     def vertical_stacked_bar_with_total(
@@ -184,6 +222,7 @@ class Comparison:
         total_formula: str = None,
         total_as_first: bool = True,
         total_color_adjustment: int = 2,
+        single_trace: bool = False,
         **kwargs,
     ) -> go.Figure:
         """
@@ -199,6 +238,10 @@ class Comparison:
             total_formula (str, optional): Formula for calculating the total.
             total_as_first (bool, optional): Place total first or last.
             total_color_adjustment (int, optional): Adjustment level for the total category color.
+            single_trace (bool, optional): Without `color`, draw all bars as one trace with
+                a color per bar instead of one trace per category. The bars look the same,
+                but the categories are not repeated in the legend. Much faster for many
+                categories. Defaults to False.
 
         Returns:
             go.Figure: Plotly bar chart figure.
@@ -227,10 +270,14 @@ class Comparison:
             )
             kwargs["color_discrete_map"] = color_discrete_map
 
+        kwargs.setdefault("template", get_template())
+        if single_trace and color == x:
+            return self._single_trace_bar(df, x=x, y=y, category=x, **kwargs)
         figure = px.bar(df, x=x, y=y, color=color, **kwargs)
 
         return figure
 
+    @recorded
     @assign_figure_to_self
     @apply_setting
     def horisontal_stacked_bar_with_total(
@@ -244,6 +291,7 @@ class Comparison:
         total_formula: str = None,
         total_as_first: bool = True,
         total_color_adjustment: int = 2,
+        single_trace: bool = False,
         **kwargs,
     ) -> go.Figure:
         """
@@ -259,6 +307,10 @@ class Comparison:
             total_formula (str, optional): Formula for calculating the total.
             total_as_first (bool, optional): Place total first or last.
             total_color_adjustment (int, optional): Adjustment level for the total category color.
+            single_trace (bool, optional): Without `color`, draw all bars as one trace with
+                a color per bar instead of one trace per category. The bars look the same,
+                but the categories are not repeated in the legend. Much faster for many
+                categories. Defaults to False.
 
         Returns:
             go.Figure: Plotly bar chart figure.
@@ -287,10 +339,35 @@ class Comparison:
             )
             kwargs["color_discrete_map"] = color_discrete_map
 
+        kwargs.setdefault("template", get_template())
+        if single_trace and color == y:
+            return self._single_trace_bar(df, x=x, y=y, category=y, **kwargs)
         figure = px.bar(df, x=x, y=y, color=color if color is not None else y, **kwargs)
 
         return figure
 
+    def _single_trace_bar(
+        self, df: pd.DataFrame, x: str, y: str, category: str, **kwargs
+    ) -> go.Figure:
+        """
+        Creates a bar chart with a single trace, colored per bar by category.
+
+        Args:
+            df (pd.DataFrame): Prepared data.
+            x (str): X-axis column.
+            y (str): Y-axis column.
+            category (str): The category column, which determines the bar colors.
+
+        Returns:
+            go.Figure: Plotly bar chart figure.
+        """
+        colors = self._get_bar_colors(df[category], **kwargs)
+        for key in ["color_discrete_map", "color_discrete_sequence"]:
+            kwargs.pop(key, None)
+        figure = px.bar(df, x=x, y=y, **kwargs)
+        figure.data[0].marker.color = colors
+        return figure
+
     def _calculate_total(
         self,
         df: pd.DataFrame,
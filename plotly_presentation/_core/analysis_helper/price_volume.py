@@ -5,9 +5,12 @@ from plotly_presentation._core.analysis_helper.utils import (
     assign_figure_to_self,
     apply_setting,
 )
+from plotly_presentation._core.plan import recorded
 
 
 class PriceVolume:
+    _plan_target = "price_volume"
+
     def __init__(self, parent=None):
         """
         Initialize the PriceVolumeAnalysis class.
@@ -19,6 +22,11 @@ class PriceVolume:
         # self.figure = None
         self.parent = parent
 
+    @property
+    def _plan(self):
+        """The plan of the parent when it is lazy"""
+        return getattr(self.parent, "_plan", None)
+
     def _price_volume_mix_analysis(
         self,
         df: pd.DataFrame,
@@ -224,6 +232,7 @@ class PriceVolume:
 
         return x, y, measure
 
+    @recorded
     @assign_figure_to_self
     @apply_setting
     def price_volume_mix_analysis(
@@ -281,6 +290,7 @@ class PriceVolume:
             self.parent.figure = self.figure
         return self.figure
 
+    @recorded
     @assign_figure_to_self
     @apply_setting
     def price_volume_analysis(
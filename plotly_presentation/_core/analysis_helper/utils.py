@@ -7,10 +7,13 @@ def assign_figure_to_self(method):
     def wrapper(self, *args, **kwargs):
         result = method(self, *args, **kwargs)
         # If parent exists, assign to parent.figure, otherwise assign to self.figure
+        owner = self
         if hasattr(self, "parent") and self.parent is not None:
-            self.parent.figure = result
-        else:
-            self.figure = result
+            owner = self.parent
+        owner.figure = result
+        # Move the style, callouts and pending batch of the owner to the new figure
+        if callable(getattr(owner, "_apply_settings", None)):
+            owner._apply_settings()
 
         return result
 
@@ -0,0 +1,147 @@
+import copy
+from contextlib import contextmanager
+from plotly.basedatatypes import BaseTraceType
+from plotly_presentation._core.utils.dict_funcs import update_dict
+from plotly_presentation._core.utils.trace_helper import (
+    keep_callout_traces_last,
+    sort_callout_traces_last,
+)
+
+# add_shape/add_annotation arguments which need plotly to resolve subplot references
+_SUBPLOT_ARGUMENTS = {"row", "col", "secondary_y", "exclude_empty_subplots"}
+
+
+class LayoutBatch:
+    """Collects traces, layout updates, shapes and annotations for a figure.
+
+    Everything is applied in `flush` inside plotly's `batch_update`, with a single
+    layout update, so the layout is validated once and a `FigureWidget` redraws once.
+    """
+
+    def __init__(self, figure) -> None:
+        self.figure = figure
+        self._traces = []
+        self._layout = {}
+        self._shapes = []
+        self._annotations = []
+
+    def __bool__(self) -> bool:
+        return bool(self._traces or self._layout or self._shapes or self._annotations)
+
+    def add_traces(self, traces) -> None:
+        """Collect traces as plain dicts. They are only validated on `flush`"""
+        self._traces.extend(
+            trace.to_plotly_json() if isinstance(trace, BaseTraceType) else trace
+            for trace in traces
+        )
+
+    def update_layout(self, **kwargs) -> None:
+        update_dict(self._layout, kwargs)
+
+    def add_shape(self, **kwargs) -> None:
+        self._shapes.append(kwargs)
+
+    def add_annotation(self, **kwargs) -> None:
+        self._annotations.append(kwargs)
+
+    def flush_traces(self) -> None:
+        """Add the collected traces to the figure, keeping the layout updates"""
+        if self._traces:
+            traces, self._traces = self._traces, []
+            self.figure.add_traces(traces)
+            keep_callout_traces_last(self.figure)
+
+    def flush(self) -> None:
+        """Apply the collected updates to the figure"""
+        if not self:
+            return
+        traces, layout = self._traces, self._layout
+        if self._shapes:
+            layout["shapes"] = self.figure.layout.shapes + tuple(self._shapes)
+        if self._annotations:
+            layout["annotations"] = self.figure.layout.annotations + tuple(
+                self._annotations
+            )
+        self._traces, self._layout, self._shapes, self._annotations = [], {}, [], []
+        with self.figure.batch_update():
+            if traces:
+                self.figure.add_traces(traces)
+                keep_callout_traces_last(self.figure)
+            if layout:
+                self.figure.update_layout(layout)
+
+    def to_dict(self) -> dict:
+        """Return the figure including the collected updates as a plain dict.
+
+        Nothing is validated and the trace data is not copied, so this is meant for
+        serializing the figure right away.
+        """
+        figure = self.figure.to_plotly_json()
+        layout = update_dict(copy.deepcopy(figure["layout"]), self._layout)
+        if self._shapes:
+            layout["shapes"] = list(layout.get("shapes", ())) + self._shapes
+        if self._annotations:
+            layout["annotations"] = list(layout.get("annotations", ())) + (
+                self._annotations
+            )
+        data = sort_callout_traces_last(list(figure["data"]) + self._traces)
+        return {"data": data, "layout": layout}
+
+
+class FigureUpdater:
+    """Routes layout, shape and annotation updates through an active `LayoutBatch`.
+
+    Without a batch the updates are applied to `self.figure` right away.
+    """
+
+    _batch = None
+    _plan = None
+
+    def _sync(self) -> None:
+        """Apply the pending updates, for methods that read the figure"""
+        if self._batch is not None:
+            self._batch.flush()
+
+    @contextmanager
+    def _collect(self):
+        """Collect the updates made inside the block and apply them in one update"""
+        if self._batch is not None:
+            # Already batching, the outer batch applies the updates
+            yield
+            return
+        self._batch = LayoutBatch(self.figure)
+        try:
+            yield
+        finally:
+            batch, self._batch = self._batch, None
+            batch.flush()
+
+    def _sync_data(self) -> None:
+        """Add the pending traces, for methods that only read the figure data"""
+        if self._batch is not None:
+            self._batch.flush_traces()
+
+    def _update_layout(self, **kwargs) -> None:
+        if self._batch is not None:
+            self._batch.update_layout(**kwargs)
+        else:
+            self.figure.update_layout(**kwargs)
+
+    def _add_shape(self, **kwargs) -> None:
+        if self._batch is None:
+            self.figure.add_shape(**kwargs)
+        elif _SUBPLOT_ARGUMENTS & kwargs.keys():
+            # Keep the order of the shapes while letting plotly resolve the subplot
+            self._batch.flush()
+            self.figure.add_shape(**kwargs)
+        else:
+            self._batch.add_shape(**kwargs)
+
+    def _add_annotation(self, **kwargs) -> None:
+        if self._batch is None:
+            self.figure.add_annotation(**kwargs)
+        elif _SUBPLOT_ARGUMENTS & kwargs.keys():
+            self._batch.flush()
+            self.figure.add_annotation(**kwargs)
+        else:
+            self._batch.add_annotation(**kwargs)
@@ -1,16 +1,121 @@
 import plotly.graph_objs as go
 from plotly_presentation._core.colors import CalloutColor
 from plotly_presentation._core.options import options
-from plotly_presentation._core.utils.dict_funcs import update_dict
+from plotly_presentation._core.batch import FigureUpdater
+from plotly_presentation._core.plan import recorded
+from plotly_presentation._core.utils.dict_funcs import update_dict, freeze
+from plotly_presentation._core.utils.label_helper import spread_labels
+from plotly_presentation._core.utils.trace_helper import (
+    CALLOUT_TRACE_META,
+    is_callout_trace,
+)
+import numpy as np
 import pandas as pd
 import datetime
+from itertools import chain
+
+_VALID_KINDS = ["circle_highlight", "square_growth_line", "dash_growth_lines"]
+_VALID_BACKENDS = ["shape", "marker"]
+# The add_circle_highlight arguments which the marker backend draws per highlight
+_CIRCLE_MARKER_ARGUMENTS = {
+    "x",
+    "y",
+    "circle_x_pixel_width",
+    "circle_y_pixel_width",
+    "shape_form",
+    "text",
+    "text_format",
+}
+
+# The compiled callout styles and the config object they were compiled from
+_compiled_styles = (None, None)
+
+
+def _create_default_styles() -> dict:
+    """Return the callout styles for the current theme.
+
+    The styles are compiled once from the callout settings config and shared by all
+    `Callout` instances. They are only recompiled when the config changes.
+    """
+    global _compiled_styles
+    settings = options.get_option("config.callout_settings")
+    if _compiled_styles[0] is settings:
+        return _compiled_styles[1]
+
+    color_styles = {
+        "default_line_style": {
+            "line": {
+                "color": CalloutColor.LINE_COLOR.value,
+            }
+        },
+        "default_dash_line_style": {
+            "line": {
+                "color": CalloutColor.LINE_COLOR.value,
+            },
+        },
+        "default_arrow_style": {
+            "arrowcolor": CalloutColor.LINE_COLOR.value,
+        },
+        "default_text_style": {
+            "bgcolor": CalloutColor.TEXT_BG_COLOR.value,
+            "font": {
+                "color": CalloutColor.TEXT_COLOR.value,
+            },
+        },
+        "default_small_text_style": {
+            "bgcolor": CalloutColor.TEXT_BG_COLOR.value,
+            "font": {
+                "color": CalloutColor.TEXT_COLOR.value,
+            },
+        },
+        "default_circle_style": {
+            "line": {
+                "color": CalloutColor.CIRCLE_LINE_COLOR.value,
+            },
+            "fillcolor": CalloutColor.CIRCLE_FILL_COLOR.value,
+        },
+        "default_circle_text_style": {
+            "font": {
+                "color": CalloutColor.TEXT_COLOR.value,
+            },
+        },
+    }
+    styles = freeze(update_dict(color_styles, settings))
+    _compiled_styles = (settings, styles)
+    return styles
+
+
+def _is_date(values) -> bool:
+    """Whether the first value of an axis is a date, like plotly detects date axes"""
+    if len(values) == 0:
+        return False
+    value = values[0]
+    if isinstance(value, (datetime.date, np.datetime64)):
+        return True
+    if isinstance(value, str):
+        try:
+            datetime.date.fromisoformat(value[:10])
+            return True
+        except ValueError:
+            return False
+    return False
+
+
+def _first_set(*values):
+    """Returns the first value which is not None"""
+    return next(value for value in values if value is not None)
+
 
+class Callout(FigureUpdater):
+    _plan_target = "callout"
+
+    # The index of every axis and the axis properties it was built from
+    _axis_index = None
 
-class Callout:
     def __init__(self, figure) -> None:
         self.figure = figure
 
-        styles = self.__create_default_styles()
+        styles = _create_default_styles()
 
         self._DEFAULT_LINE_STYLE = styles["default_line_style"]
         self._DEFAULT_DASH_LINE_STYLE = styles["default_dash_line_style"]
@@ -21,54 +126,65 @@ class Callout:
         self._DEFAULT_CIRCLE_TEXT_STYLE = styles["default_circle_text_style"]
         self._DEFAULT_CIRCLE_SIZE = styles["default_circle_size"]
 
-    def __create_default_styles(self) -> dict:
-        color_styles = {
-            "default_line_style": {
-                "line": {
-                    "color": CalloutColor.LINE_COLOR.value,
-                }
-            },
-            "default_dash_line_style": {
-                "line": {
-                    "color": CalloutColor.LINE_COLOR.value,
-                },
-            },
-            "default_arrow_style": {
-                "arrowcolor": CalloutColor.LINE_COLOR.value,
-            },
-            "default_text_style": {
-                "bgcolor": CalloutColor.TEXT_BG_COLOR.value,
-                "font": {
-                    "color": CalloutColor.TEXT_COLOR.value,
-                },
-            },
-            "default_small_text_style": {
-                "bgcolor": CalloutColor.TEXT_BG_COLOR.value,
-                "font": {
-                    "color": CalloutColor.TEXT_COLOR.value,
-                },
-            },
-            "default_circle_style": {
-                "line": {
-                    "color": CalloutColor.CIRCLE_LINE_COLOR.value,
-                },
-                "fillcolor": CalloutColor.CIRCLE_FILL_COLOR.value,
-            },
-            "default_circle_text_style": {
-                "font": {
-                    "color": CalloutColor.TEXT_COLOR.value,
-                },
-            },
-        }
-        styles = options.get_option("config.callout_settings")
-        styles = update_dict(color_styles, styles)
-        return styles
+    def _bind_figure(self, figure) -> None:
+        """Point the callouts at another figure, reusing the compiled styles"""
+        self.figure = figure
+        self._axis_index = None
+
+    def _get_axis_index(self, axis: str = "x") -> tuple:
+        """Returns whether the axis shows dates and the position of every category on it.
+
+        The positions follow plotly's default category order: the `categoryarray` of the
+        axis first, then the values of all traces on the axis in order of appearance.
+        The index is built once per axis and rebuilt when the traces, their values on
+        the axis, or the `categoryarray` or `type` of the axis are set. The values are
+        compared by identity, as stored by plotly, so checking the cache does not
+        depend on the number of points.
+
+        Args:
+            axis (str, optional):
+                The axis, "x" or "y". Defaults to "x".
+
+        Returns:
+            tuple: Whether the axis is a date axis and a dict of category positions.
+        """
+        self._sync_data()
+        # plotly's stored properties: reading e.g. `trace.x` would copy a list
+        axis_props = self.figure.layout[f"{axis}axis"]._props or {}
+        trace_props = [trace._props for trace in self.figure.data]
+        axis_type = axis_props.get("type")
+        categoryarray = axis_props.get("categoryarray")
+        key = [axis_type, categoryarray]
+        for props in trace_props:
+            key += [props.get(axis), props.get(f"{axis}axis")]
+        if self._axis_index is None:
+            self._axis_index = {}
+        cached = self._axis_index.get(axis)
+        if (
+            cached is not None
+            and len(cached[0]) == len(key)
+            and all(old is new for old, new in zip(cached[0], key))
+        ):
+            return cached[1]
+
+        values = [
+            props.get(axis)
+            for props in trace_props
+            if props.get(axis) is not None and props.get(f"{axis}axis") in (None, axis)
+        ]
+        categories = dict.fromkeys(chain(categoryarray or (), *values))
+        is_date = axis_type == "date" or (
+            axis_type is None and bool(values) and _is_date(values[0])
+        )
+        index = (is_date, {category: i for i, category in enumerate(categories)})
+        self._axis_index[axis] = (key, index)
+        return index
 
     def _get_center_point(self, a, b, axis="x"):
         """Finding the middle point between the two points given on the axis specified.
 
-        Given the axis is categorical then the middle point is calculated by extracting the indexes of `a` and `b`.
-        The index values are then used to calculate the middle point.
+        Given the axis is categorical then the middle point is calculated from the positions of `a` and `b`
+        on the axis, which are looked up in the cached axis index.
 
         Args:
             a (any):
@@ -82,18 +198,112 @@ class Callout:
             float: A numeric value which is the middle point between a and b.
         """
         # Does not work with logs
-        if isinstance(a, float | int):
-            pass
-        else:
-            try:
-                datetime.date.fromisoformat(a)
+        if isinstance(a, str):
+            is_date, positions = self._get_axis_index(axis)
+            if is_date or (a not in positions and _is_date([a])):
                 a, b = pd.to_datetime(a), pd.to_datetime(b)
-            except:
-                if isinstance(a, str):
-                    vals = self.figure.data[0][axis]
-                    a, b = list(vals).index(a), list(vals).index(b)
+            else:
+                for value in (a, b):
+                    if value not in positions:
+                        raise ValueError(
+                            f"{value} is not a category on the {axis} axis"
+                        )
+                a, b = positions[a], positions[b]
         return (b - a) / 2.0 + a
 
+    def _get_circle_size(
+        self,
+        circle_x_pixel_width: int = None,
+        circle_y_pixel_width: int = None,
+        shape_form: str = "round",
+    ) -> tuple:
+        """Returns the x and y radius of a circle highlight in pixels, using the default sizes when not given"""
+        _VALID_SHAPE_FORMS = ["round", "oval"]
+        if (
+            shape_form not in _VALID_SHAPE_FORMS
+            and circle_x_pixel_width is None
+            and circle_y_pixel_width is None
+        ):
+            raise ValueError(
+                f"You must provide a shape for the circle: {_VALID_SHAPE_FORMS} or specify the size of the circle with `circle_x_pixel_width` and `circle_y_pixel_width`"
+            )
+        if shape_form == "round":
+            if circle_x_pixel_width is None:
+                circle_x_pixel_width = self._DEFAULT_CIRCLE_SIZE.get("circular_radius")
+                circle_y_pixel_width = self._DEFAULT_CIRCLE_SIZE.get("circular_radius")
+        else:
+            if circle_x_pixel_width is None:
+                circle_x_pixel_width = self._DEFAULT_CIRCLE_SIZE.get("oval_x_width")
+            if circle_y_pixel_width is None:
+                circle_y_pixel_width = self._DEFAULT_CIRCLE_SIZE.get("oval_y_width")
+        return circle_x_pixel_width, circle_y_pixel_width
+
+    def _add_circle_markers(self, highlights: list[dict], **kwargs) -> None:
+        """Adds round circle highlights as a single marker trace.
+
+        The markers get the fill, line and text style of the circle shapes. A marker is
+        always round, so oval highlights are added as shapes instead.
+
+        Args:
+            highlights (list[dict]):
+                The arguments of `add_circle_highlight` for every highlight, without style overrides.
+            **kwargs:
+                Properties of the marker trace, e.g. `marker_opacity`.
+        """
+        xs, ys, sizes, texts = [], [], [], []
+        for highlight in highlights:
+            highlight = dict(highlight)
+            x_width, y_width = self._get_circle_size(
+                highlight.pop("circle_x_pixel_width", None),
+                highlight.pop("circle_y_pixel_width", None),
+                highlight.pop("shape_form", "round"),
+            )
+            if x_width != y_width:
+                self.add_circle_highlight(
+                    circle_x_pixel_width=x_width,
+                    circle_y_pixel_width=y_width,
+                    **highlight,
+                )
+                continue
+            text = highlight.get("text")
+            xs.append(highlight["x"])
+            ys.append(highlight["y"])
+            sizes.append(2 * x_width)
+            texts.append(
+                None
+                if text is None
+                else f"{text}".format(highlight.get("text_format", ":.1f"))
+            )
+        if not xs:
+            return
+
+        style = self._DEFAULT_CIRCLE_STYLE
+        line = style.get("line", {})
+        has_text = any(text is not None for text in texts)
+        trace = go.Scatter(
+            x=xs,
+            y=ys,
+            mode="markers+text" if has_text else "markers",
+            text=texts if has_text else None,
+            textposition="middle center",
+            textfont=dict(self._DEFAULT_CIRCLE_TEXT_STYLE.get("font", {})),
+            marker=dict(
+                symbol="circle",
+                size=sizes,
+                color=style.get("fillcolor"),
+                line=dict(color=line.get("color"), width=line.get("width")),
+            ),
+            cliponaxis=False,
+            hoverinfo="skip",
+            showlegend=False,
+            name="circle_highlights",
+            meta=CALLOUT_TRACE_META,
+        )
+        trace.update(**kwargs)
+        self._sync_data()
+        self.figure.add_trace(trace)
+
+    @recorded
     def add_circle_highlight(
         self,
         x,
@@ -103,6 +313,7 @@ class Callout:
         shape_form="round",
         text: str = None,
         text_format: str = ":.1f",
+        backend: str = "shape",
         **kwargs,
     ) -> go.Figure:
         """Adding a circle to the graph.
@@ -122,6 +333,14 @@ class Callout:
                 The shape of the circle. This can either be oval or round. If circle_x_pixel_width or circle_y_pixel_width they will override. Defaults to "round".
             text (str, optional):
                 The text inside the buble. Defaults to None.
+            backend (str, optional):
+                How the circle is drawn.
+
+                - 'shape' = A shape with an annotation for the text.
+                - 'marker' = A marker with text, which plotly draws much faster. Oval circles are still drawn as shapes.
+                  The other keyword arguments are properties of the marker trace.
+
+                Defaults to "shape".
 
         Raises:
             AttributeError: Given there isn't enough data to create the circle.
@@ -129,26 +348,29 @@ class Callout:
         Returns:
             go.Figure: The plotly figure.
         """
-        _VALID_SHAPE_FORMS = ["round", "oval"]
-        if (
-            shape_form not in _VALID_SHAPE_FORMS
-            and circle_x_pixel_width is None
-            and circle_y_pixel_width is None
-        ):
-            raise ValueError(
-                f"You must provide a shape for the circle: {_VALID_SHAPE_FORMS} or specify the size of the circle with `circle_x_pixel_width` and `circle_y_pixel_width`"
+        if backend not in _VALID_BACKENDS:
+            raise ValueError(f"Invalid backend. Must be one of {_VALID_BACKENDS}")
+        if backend == "marker":
+            self._add_circle_markers(
+                [
+                    dict(
+                        x=x,
+                        y=y,
+                        circle_x_pixel_width=circle_x_pixel_width,
+                        circle_y_pixel_width=circle_y_pixel_width,
+                        shape_form=shape_form,
+                        text=text,
+                        text_format=text_format,
+                    )
+                ],
+                **kwargs,
             )
-        if shape_form == "round":
-            if circle_x_pixel_width is None:
-                circle_x_pixel_width = self._DEFAULT_CIRCLE_SIZE.get("circular_radius")
-                circle_y_pixel_width = self._DEFAULT_CIRCLE_SIZE.get("circular_radius")
-        else:
-            if circle_x_pixel_width is None:
-                circle_x_pixel_width = self._DEFAULT_CIRCLE_SIZE.get("oval_x_width")
-            if circle_y_pixel_width is None:
-                circle_y_pixel_width = self._DEFAULT_CIRCLE_SIZE.get("oval_y_width")
+            return self.figure
 
-        self.figure.add_shape(
+        circle_x_pixel_width, circle_y_pixel_width = self._get_circle_size(
+            circle_x_pixel_width, circle_y_pixel_width, shape_form
+        )
+        self._add_shape(
             xanchor=x,
             yanchor=y,
             x0=-circle_x_pixel_width,
@@ -159,7 +381,7 @@ class Callout:
             **kwargs,
         )
         if text is not None:
-            self.figure.add_annotation(
+            self._add_annotation(
                 x=x,
                 y=y,
                 text=f"{text}".format(text_format),
@@ -168,6 +390,7 @@ class Callout:
             )
         return self.figure
 
+    @recorded
     def add_square_growth_line(
         self,
         x0,
@@ -218,7 +441,7 @@ class Callout:
         }
 
         for l in [l1, l2, l3]:
-            self.figure.add_shape(**l, **self._DEFAULT_LINE_STYLE, **kwargs)
+            self._add_shape(**l, **self._DEFAULT_LINE_STYLE, **kwargs)
 
         if text is not None:
             self.add_circle_highlight(
@@ -233,6 +456,7 @@ class Callout:
 
         return self.figure
 
+    @recorded
     def add_dash_growth_lines(
         self,
         x0: float,
@@ -273,10 +497,10 @@ class Callout:
         l1 = {"x0": x0, "x1": x_end, "y0": y0, "y1": y0}
         l2 = {"x0": x1, "x1": x_end, "y0": y1, "y1": y1}
         for l in [l1, l2]:
-            self.figure.add_shape(**l, **self._DEFAULT_DASH_LINE_STYLE)
+            self._add_shape(**l, **self._DEFAULT_DASH_LINE_STYLE)
 
         # Arrow
-        self.figure.add_annotation(
+        self._add_annotation(
             x=x_end, ax=x_end, y=y1, ay=y0, **self._DEFAULT_ARROW_STYLE
         )
         if text is not None:
@@ -291,6 +515,77 @@ class Callout:
             )
         return self.figure
 
+    @recorded
+    def add_many(self, df: pd.DataFrame, kind: str, **kwargs) -> go.Figure:
+        """Adding a callout for every row of a DataFrame.
+
+        The columns are the arguments of the callout method, e.g. `x`, `y` and `text` for
+        circle highlights, and any other column is a style override such as `line_color`.
+        Missing values fall back to the defaults. All shapes and annotations are applied
+        in a single layout update, which is much faster than adding them one by one.
+
+        Example:
+            callouts = pd.DataFrame({"x": ["a", "b"], "y": [10, 12], "text": ["+5%", "-3%"]})
+            p.callout.add_many(callouts, kind="circle_highlight")
+
+        Args:
+            df (pd.DataFrame):
+                One row per callout.
+            kind (str):
+                The type of callout.
+
+                - 'circle_highlight' = `add_circle_highlight`.
+                - 'square_growth_line' = `add_square_growth_line`.
+                - 'dash_growth_lines' = `add_dash_growth_lines`.
+            **kwargs:
+                Arguments used for every callout, unless the row sets them. With
+                `backend="marker"` all round circle highlights are drawn as one marker trace,
+                see `add_circle_highlight`.
+
+        Returns:
+            go.Figure: The plotly figure.
+        """
+        if kind not in _VALID_KINDS:
+            raise ValueError(f"Invalid kind. Must be one of {_VALID_KINDS}")
+        add_callout = getattr(self, f"add_{kind}")
+        records = [
+            {
+                key: value
+                for key, value in row.items()
+                if not (pd.api.types.is_scalar(value) and pd.isna(value))
+            }
+            for row in df.to_dict("records")
+        ]
+        if kind == "circle_highlight" and kwargs.get("backend") == "marker":
+            kwargs.pop("backend")
+            styled = set(df.columns) - _CIRCLE_MARKER_ARGUMENTS
+            if styled:
+                raise ValueError(
+                    f"The columns {sorted(styled)} can not be used with backend='marker', pass them as keyword arguments"
+                )
+            shared = {
+                key: value
+                for key, value in kwargs.items()
+                if key in _CIRCLE_MARKER_ARGUMENTS
+            }
+            trace_kwargs = {
+                key: value
+                for key, value in kwargs.items()
+                if key not in _CIRCLE_MARKER_ARGUMENTS
+            }
+            with self._collect():
+                self._add_circle_markers(
+                    [{**shared, **record} for record in records], **trace_kwargs
+                )
+            return self.figure
+
+        rows = [{**kwargs, **record} for record in records]
+        with self._collect():
+            for row in rows:
+                add_callout(**row)
+        return self.figure
+
+    @recorded
     def add_line_differences(
         self,
         primary_trace_name: str,
@@ -330,7 +625,9 @@ class Callout:
                 raise AttributeError(
                     f"The text type must be on of the following: {_VALID_TEXT_TYPES}"
                 )
-        if len(self.figure.data) != 2:
+        self._sync()
+        data = [d for d in self.figure.data if not is_callout_trace(d)]
+        if len(data) != 2:
             raise AttributeError(
                 "This can only be done when there are exactly two traces."
             )
@@ -338,10 +635,10 @@ class Callout:
             raise AttributeError(
                 "The barmode must be group - the bars must be side by side."
             )
-        if type(self.figure.data[0]) != go._bar.Bar:
+        if type(data[0]) != go._bar.Bar:
             raise AttributeError("Only works with bar charts")
         primary_first = None
-        for i, d in enumerate(self.figure.data):
+        for i, d in enumerate(data):
             if d.name == primary_trace_name:
                 primary_xs = list(d.x)
                 primary_ys = list(d.y)
@@ -371,82 +668,192 @@ class Callout:
             overlaying="x", range=[0, len(primary_xs)], showticklabels=False
         )
 
-        # Starting to plot the lines
-        for i, (primary_x, primary_y) in enumerate(zip(primary_xs, primary_ys)):
-            comparison_y = comparison_ys[comparison_xs.index(primary_x)]
-            diff = primary_y - comparison_y
-            if text_type in ["ratio", "percentage"] and comparison_y == 0:
-                # Do not show a diff if the comparison value is 0 and the type is ratio or percentage
-                continue
-            if primary_first:
-                if diff < 0:
-                    x = i + bargap / 2 + (1 - bargap) / 4
-                    x0 = i + bargap / 2
-                    x1 = i + bargap / 2 + (1 - bargap) / 2
-                elif diff > 0:
-                    x = i + 1 - bargap / 2 - (1 - bargap) / 4
-                    x0 = i + 1 - bargap / 2
-                    x1 = i + 1 - bargap / 2 - (1 - bargap) / 2
-                else:
-                    continue
-            elif ~primary_first:
-                if diff < 0:
-                    x = i + 1 - bargap / 2 - (1 - bargap) / 4
-                    x0 = i + 1 - bargap / 2
-                    x1 = i + 1 - bargap / 2 - (1 - bargap) / 2
-                elif diff > 0:
-                    x = i + bargap / 2 + (1 - bargap) / 4
-                    x0 = i + bargap / 2
-                    x1 = i + bargap / 2 + (1 - bargap) / 2
-                else:
-                    continue
-            else:
-                continue
-
-            y_max = max(comparison_y, primary_y)
-
-            # Adding the line and arrow
-            ARROW_STYLE = update_dict(
-                self._DEFAULT_ARROW_STYLE, {"xref": "x2", "axref": "x2"}
-            )
-            self.figure.add_annotation(
-                x=x,
-                ax=x,
-                y=primary_y,
-                ay=comparison_y,
-                **ARROW_STYLE,
-                text="",
-                bgcolor="rgba(0,0,0,0)",
-                **kwargs,
-            )
-            self.figure.add_shape(  # horisontal line
-                **self._DEFAULT_LINE_STYLE,
-                x0=x0,
-                x1=x1,
-                y0=y_max,
-                y1=y_max,
-                xref="x2",
-                **kwargs,
-            )
-
-            # Adding the text
-            if text_type is not None:
-                if text_type == "percentage":
-                    text = f"{diff/comparison_y:{text_format}}"
-                elif text_type == "difference":
-                    text = f"{diff:{text_format}}"
-                elif text_type == "ratio":
-                    text = f"{primary_y/comparison_y:{text_format}}x"
-                self.figure.add_annotation(
+        # Aligning the comparison bars with the primary bars on their first x
+        comparison_index = pd.Index(comparison_xs)
+        is_first = ~comparison_index.duplicated()
+        lookup = comparison_index[is_first].get_indexer(primary_xs)
+        positions = np.flatnonzero(is_first)[lookup]
+        primary = np.asarray(primary_ys, dtype=float)
+        comparison = np.asarray(comparison_ys, dtype=float)[positions]
+        diff = primary - comparison
+
+        # Missing bars give a NaN difference, which is skipped like an equal one
+        keep = (lookup >= 0) & ((diff < 0) | (diff > 0))
+        if text_type in ["ratio", "percentage"]:
+            # Do not show a diff if the comparison value is 0 and the type is ratio or percentage
+            keep &= comparison != 0
+        # The line is drawn over the lower bar, which is the left one when the primary is first
+        on_left = (diff < 0) == primary_first
+        i = np.arange(len(primary_xs))
+        left_edge, right_edge = i + bargap / 2, i + 1 - bargap / 2
+        half_bar = (1 - bargap) / 2
+        xs = np.where(on_left, left_edge + half_bar / 2, right_edge - half_bar / 2)
+        x0s = np.where(on_left, left_edge, right_edge)
+        x1s = np.where(on_left, left_edge + half_bar, right_edge - half_bar)
+
+        ARROW_STYLE = update_dict(
+            dict(self._DEFAULT_ARROW_STYLE), {"xref": "x2", "axref": "x2"}
+        )
+        bars = np.flatnonzero(keep).tolist()
+        texts = [None] * len(bars)
+        if text_type is not None:
+            primary_values = [primary_ys[b] for b in bars]
+            comparison_values = [comparison_ys[positions[b]] for b in bars]
+            if text_type == "percentage":
+                texts = [
+                    f"{(p - c)/c:{text_format}}"
+                    for p, c in zip(primary_values, comparison_values)
+                ]
+            elif text_type == "difference":
+                texts = [
+                    f"{p - c:{text_format}}"
+                    for p, c in zip(primary_values, comparison_values)
+                ]
+            elif text_type == "ratio":
+                texts = [
+                    f"{p/c:{text_format}}x"
+                    for p, c in zip(primary_values, comparison_values)
+                ]
+
+        with self._collect():
+            for b, text in zip(bars, texts):
+                x = xs[b].item()
+                primary_y, comparison_y = primary_ys[b], comparison_ys[positions[b]]
+                y_max = max(comparison_y, primary_y)
+                # Adding the line and arrow
+                self._add_annotation(
                     x=x,
-                    y=y_max + y_text_offset,
-                    text=f"<b>{text}</b>",
+                    ax=x,
+                    y=primary_y,
+                    ay=comparison_y,
+                    **ARROW_STYLE,
+                    text="",
+                    bgcolor="rgba(0,0,0,0)",
+                    **kwargs,
+                )
+                self._add_shape(  # horisontal line
+                    **self._DEFAULT_LINE_STYLE,
+                    x0=x0s[b].item(),
+                    x1=x1s[b].item(),
+                    y0=y_max,
+                    y1=y_max,
                     xref="x2",
-                    **self._DEFAULT_SMALL_TEXT_STYLE,
                     **kwargs,
                 )
+                # Adding the text
+                if text is not None:
+                    self._add_annotation(
+                        x=x,
+                        y=y_max + y_text_offset,
+                        text=f"<b>{text}</b>",
+                        xref="x2",
+                        **self._DEFAULT_SMALL_TEXT_STYLE,
+                        **kwargs,
+                    )
         return self.figure
 
+    def _get_label_shifts(self, ys: list, texts: list, textfont=None) -> np.ndarray:
+        """Returns how many pixels every text must move up so the texts do not overlap.
+
+        The y values are converted to pixels with the plot height, i.e. the figure height
+        without the margins, and the range of the y axis.
+
+        Args:
+            ys (list):
+                The y value of every text.
+            texts (list):
+                The texts, None for no text.
+            textfont (dict, optional):
+                The font of the texts. Defaults to the layout font.
+
+        Returns:
+            np.ndarray: The shift of every text in pixels.
+        """
+        layout = self.figure.layout
+        template = layout.template.layout
+        font_size = go.scatter.Textfont(textfont).size or template.font.size or 12
+        heights = np.array(
+            [
+                0 if text is None else font_size * 1.3 * (text.count("<br>") + 1)
+                for text in texts
+            ]
+        )
+
+        height = layout.height or template.height or 450
+        margin_top = _first_set(layout.margin.t, template.margin.t, 100)
+        margin_bottom = _first_set(layout.margin.b, template.margin.b, 80)
+        plot_height = height - margin_top - margin_bottom
+
+        ys = np.asarray(ys, dtype=float)
+        is_log = layout.yaxis.type == "log"
+        if layout.yaxis.range is not None:
+            y_min, y_max = layout.yaxis.range
+        else:
+            values = [
+                np.asarray(d.y, dtype=float)
+                for d in self.figure.data
+                if getattr(d, "y", None) is not None
+                and getattr(d, "yaxis", None) in (None, "y")
+            ]
+            values = np.concatenate([*values, ys])
+            if is_log:
+                values = np.log10(values[values > 0])
+            y_min, y_max = np.nanmin(values), np.nanmax(values)
+            rangemode = layout.yaxis.rangemode or template.yaxis.rangemode
+            if rangemode == "tozero" and not is_log:
+                y_min, y_max = min(y_min, 0), max(y_max, 0)
+        if is_log:
+            ys = np.log10(ys)
+        scale = plot_height / (y_max - y_min) if y_max > y_min else 1
+
+        positions = (ys - y_min) * scale
+        has_text = heights > 0
+        shifts = np.zeros(len(ys))
+        shifts[has_text] = (
+            spread_labels(
+                positions[has_text], heights[has_text], lower=0, upper=plot_height
+            )
+            - positions[has_text]
+        )
+        return shifts
+
+    def _add_end_label(
+        self, trace, x, y, text, shift, color, marker_size, scatter_kwargs
+    ) -> None:
+        """Adds the text of a line end marker, moved up by `shift` pixels"""
+        font_size = go.scatter.Textfont(scatter_kwargs.get("textfont")).size
+        label_kwargs = dict(
+            x=x,
+            y=y,
+            xref=trace.xaxis or "x",
+            yref=trace.yaxis or "y",
+            text=text,
+            xanchor="left",
+            bgcolor="rgba(0,0,0,0)",
+        )
+        if font_size is not None:
+            label_kwargs["font"] = dict(size=font_size)
+        if abs(shift) > (font_size or 12) / 2:
+            # Moved away from its line, so a leader line points at the marker
+            self._add_annotation(
+                **label_kwargs,
+                showarrow=True,
+                ax=marker_size + 12,
+                ay=-float(shift),
+                arrowcolor=color,
+                arrowhead=0,
+                arrowwidth=1,
+                standoff=marker_size / 2,
+            )
+        else:
+            self._add_annotation(
+                **label_kwargs,
+                showarrow=False,
+                xshift=marker_size / 2 + 2,
+                yshift=float(shift),
+            )
+
+    @recorded
     def add_line_end_marker(
         self,
         traces: list[str] | str = None,
@@ -455,6 +862,7 @@ class Callout:
         text_positions: list[str] | str = None,
         marker_size: int = 10,
         custom_texts: list[str] = None,
+        avoid_overlap: bool = False,
         **kwargs,
     ) -> go.Figure:
         """Creating a marker at the end of the line with optional text.
@@ -483,16 +891,22 @@ class Callout:
                 Defaults to None.
             marker_size (int, optional):
                 The size of the marker. Defaults to 10.
+            avoid_overlap (bool, optional):
+                Place the texts automatically so they do not overlap, instead of using `text_positions`.
+                Texts are moved up or down from their line end, with a leader line when they move far.
+                Defaults to False.
 
         Returns:
             go.Figure: The plotly figure.
         """
 
-        if type(self.figure.data[0]) != go._scatter.Scatter:
+        self._sync()
+        data = [d for d in self.figure.data if not is_callout_trace(d)]
+        if not isinstance(data[0], (go.Scatter, go.Scattergl)):
             raise AttributeError("Only works with scatter charts")
 
         if traces is None:
-            traces = [d.name for d in self.figure.data]
+            traces = [d.name for d in data]
         elif isinstance(traces, str):
             traces = [traces]
 
@@ -516,13 +930,21 @@ class Callout:
         if showlegend is None:
             showlegend = True
 
+        scatter_kwargs = {}
+        trace_kwargs = {}
+        for k, v in kwargs.items():
+            if k in dir(go.Scatter):
+                scatter_kwargs[k] = v
+            else:
+                trace_kwargs[k] = v
+
         i = 0
-        for d in self.figure.data:
+        ends = []
+        for d in data:
             if d.name in traces:
                 x = d.x[-1]
                 y = d.y[-1]
                 name = d.name
-                color = d.line.color
                 if text_type is None:
                     text = None
                 elif text_type == "value":
@@ -539,29 +961,44 @@ class Callout:
                 elif text_type == "custom":
                     showlegend = False
                     text = custom_texts[i] if custom_texts else None
+                ends.append((d, x, y, text, text_positions[i]))
+                i += 1
 
-                scatter_kwargs = {}
-                trace_kwargs = {}
-                for k, v in kwargs.items():
-                    if k in dir(go.Scatter):
-                        scatter_kwargs[k] = v
-                    else:
-                        trace_kwargs[k] = v
+        shifts = None
+        if avoid_overlap and any(text is not None for *_, text, _ in ends):
+            shifts = self._get_label_shifts(
+                [y for _, _, y, _, _ in ends],
+                [text for *_, text, _ in ends],
+                scatter_kwargs.get("textfont"),
+            )
 
-                self.figure.add_trace(
+        markers = []
+        with self._collect():
+            for k, (d, x, y, text, text_position) in enumerate(ends):
+                color = d.line.color
+                if shifts is None or text is None:
+                    text_kwargs = dict(text=[text], textposition=text_position)
+                else:
+                    text_kwargs = {}
+                    self._add_end_label(
+                        d, x, y, text, shifts[k], color, marker_size, scatter_kwargs
+                    )
+                markers.append(
                     go.Scatter(
                         x=[x],
                         y=[y],
-                        mode="markers+text",
-                        text=[text],
+                        mode="markers+text" if text_kwargs else "markers",
                         marker=dict(color=color, size=marker_size),
                         showlegend=False,
-                        name=f"{name}_marker",
-                        textposition=text_positions[i],
+                        name=f"{d.name}_marker",
+                        **text_kwargs,
                         **scatter_kwargs,
-                    ),
-                    **trace_kwargs,
+                    )
                 )
-                i += 1
-        self.figure.update_layout(showlegend=showlegend)
+        if trace_kwargs:
+            for marker in markers:
+                self.figure.add_trace(marker, **trace_kwargs)
+        else:
+            self.figure.add_traces(markers)
+        self._update_layout(showlegend=showlegend)
         return self.figure
@@ -2,3 +2,5 @@ from ._colors import *
 
 from .sequential import sequential_colors, get_sequential_color_list
 from .diverging import diverging_colors, get_diverging_color_list
+from .interpolation import interpolate_colors, interpolate_palettes
+from .mapping import ColorMapper
@@ -1,69 +1,59 @@
-from plotly.express.colors import n_colors, label_rgb
-from .utils import _convert_to_rgb
+from functools import lru_cache
+from .interpolation import to_rgb_array, interpolate_segments, label_rgb_array
+from .utils import PaletteView
 from plotly_presentation._core.options import options
 import numpy as np
 
 
-color_dict = options.get_option("config.colors").get("custom_diverging")
-diverging_colors = {}
+def _get_palettes() -> dict:
+    return options.get_option("config.colors").get("custom_diverging") or {}
 
 
-def create_diverging_color_list(low_color, mid_color, high_color, n) -> list:
-    low_color = _convert_to_rgb(low_color)
-    mid_color = _convert_to_rgb(mid_color)
-    high_color = _convert_to_rgb(high_color)
+def create_diverging_color_list(
+    low_color, mid_color, high_color, n, space: str = "rgb"
+) -> list:
+    """Create n colors going from the low color through the mid to the high color.
 
-    if low_color[:3] == "rgb":
-        color_type = "rgb"
-    else:
-        color_type = "tuple"
+    Args:
+        low_color (str | tuple): Hex, "rgb(r, g, b)" or RGB tuple.
+        mid_color (str | tuple): Hex, "rgb(r, g, b)" or RGB tuple.
+        high_color (str | tuple): Hex, "rgb(r, g, b)" or RGB tuple.
+        n (int): The number of colors.
+        space (str, optional): Interpolate in "rgb" or "oklab". Defaults to "rgb".
 
+    Returns:
+        list: Colors formatted as "rgb(r, g, b)".
+    """
+    anchors = to_rgb_array([low_color, mid_color, high_color])
+    # Both halves are interpolated in one pass: low -> mid and mid -> high
+    n_half = int(np.ceil(n / 2) + 1) if n % 2 == 0 else int(np.ceil(n / 2))
+    low_colors, high_colors = interpolate_segments(
+        anchors[:2], anchors[1:], n=n_half, space=space
+    )
     if n % 2 == 0:
-        low_colors = n_colors(
-            lowcolor=low_color,
-            highcolor=mid_color,
-            n_colors=int(np.ceil(n / 2) + 1),
-            colortype=color_type,
-        )
-        high_colors = n_colors(
-            lowcolor=mid_color,
-            highcolor=high_color,
-            n_colors=int(np.ceil(n / 2) + 1),
-            colortype=color_type,
-        )
-        diverging_color_list = (
-            low_colors[:-1] + high_colors[1:]
-        )  # ensuring that the mid color isn't shown twice
-    else:
-        low_colors = n_colors(
-            lowcolor=low_color,
-            highcolor=mid_color,
-            n_colors=int(np.ceil(n / 2)),
-            colortype=color_type,
-        )
-        high_colors = n_colors(
-            lowcolor=mid_color,
-            highcolor=high_color,
-            n_colors=int(np.ceil(n / 2)),
-            colortype=color_type,
+        low_colors = low_colors[:-1]
+    # ensuring that the mid color isn't shown twice
+    diverging_color_list = np.concatenate([low_colors, high_colors[1:]])
+    return label_rgb_array(diverging_color_list)
+
+
+@lru_cache(maxsize=256)
+def _cached_diverging_color_list(low_color, mid_color, high_color, n) -> tuple:
+    return tuple(
+        create_diverging_color_list(
+            low_color=low_color, mid_color=mid_color, high_color=high_color, n=n
         )
-        diverging_color_list = (
-            low_colors + high_colors[1:]
-        )  # ensuring that the mid color isn't shown twice
-    diverging_color_list = [label_rgb(color) for color in diverging_color_list]
-    return diverging_color_list
+    )
 
 
 def get_diverging_color_list(palette_name: str, n: int) -> list:
-    colors = color_dict.get(palette_name)
+    colors = _get_palettes().get(palette_name)
     low_color = colors[0]
     mid_color = colors[1]
     high_color = colors[2]
-    return create_diverging_color_list(
-        low_color=low_color, mid_color=mid_color, high_color=high_color, n=n
-    )
+    # Cached on the colors rather than the name, so edits to the config are picked up
+    return list(_cached_diverging_color_list(low_color, mid_color, high_color, n))
 
 
-if color_dict is not None:
-    for k, v in color_dict.items():
-        diverging_colors[k] = create_diverging_color_list(v[0], v[1], v[2], n=10)
+# Palettes with 10 colors, computed when looked up
+diverging_colors = PaletteView(_get_palettes, get_diverging_color_list)
@@ -0,0 +1,171 @@
+from collections import namedtuple
+import numpy as np
+from plotly.colors import hex_to_rgb, unlabel_rgb
+
+InterpolatedColors = namedtuple("InterpolatedColors", ["rgb", "hex"])
+
+_VALID_SPACES = ["rgb", "oklab"]
+
+_HEX_DIGITS = np.frombuffer(b"0123456789ABCDEF", dtype=np.uint8)
+
+# Matrices from https://bottosson.github.io/posts/oklab/
+_LINEAR_RGB_TO_LMS = np.array(
+    [
+        [0.4122214708, 0.5363325363, 0.0514459929],
+        [0.2119034982, 0.6806995451, 0.1073969566],
+        [0.0883024619, 0.2817188376, 0.6299787005],
+    ]
+)
+_LMS_TO_OKLAB = np.array(
+    [
+        [0.2104542553, 0.7936177850, -0.0040720468],
+        [1.9779984951, -2.4285922050, 0.4505937099],
+        [0.0259040371, 0.7827717662, -0.8086757660],
+    ]
+)
+_OKLAB_TO_LMS = np.linalg.inv(_LMS_TO_OKLAB)
+_LMS_TO_LINEAR_RGB = np.linalg.inv(_LINEAR_RGB_TO_LMS)
+
+
+def to_rgb_array(colors) -> np.ndarray:
+    """Convert colors to a float array of RGB values between 0 and 255.
+
+    Args:
+        colors (list): Colors as hex strings, "rgb(r, g, b)" strings or RGB tuples.
+
+    Returns:
+        np.ndarray: Array with shape (len(colors), 3).
+    """
+    rgb = []
+    for color in colors:
+        if isinstance(color, str):
+            color = hex_to_rgb(color) if color[0] == "#" else unlabel_rgb(color)
+        rgb.append(color[:3])
+    return np.asarray(rgb, dtype=float).reshape(-1, 3)
+
+
+def to_hex(rgb) -> list:
+    """Convert an array of RGB values between 0 and 255 to "#RRGGBB" strings.
+
+    The values are rounded and clipped to 0-255. The result has the shape of `rgb`
+    without its last axis, as (nested) lists.
+    """
+    rgb = np.clip(np.rint(np.asarray(rgb, dtype=float)), 0, 255).astype(np.intp)
+    # Build the ascii bytes of all strings at once and view them as 7 byte strings
+    chars = np.empty(rgb.shape[:-1] + (7,), dtype=np.uint8)
+    chars[..., 0] = ord("#")
+    chars[..., 1::2] = _HEX_DIGITS[rgb >> 4]
+    chars[..., 2::2] = _HEX_DIGITS[rgb & 15]
+    return chars.view("S7")[..., 0].astype("U7").tolist()
+
+
+def rgb_to_oklab(rgb) -> np.ndarray:
+    """Convert RGB values between 0 and 255 to OKLab, along the last axis"""
+    srgb = np.asarray(rgb, dtype=float) / 255.0
+    linear = np.where(srgb <= 0.04045, srgb / 12.92, ((srgb + 0.055) / 1.055) ** 2.4)
+    lms = np.cbrt(linear @ _LINEAR_RGB_TO_LMS.T)
+    return lms @ _LMS_TO_OKLAB.T
+
+
+def oklab_to_rgb(lab) -> np.ndarray:
+    """Convert OKLab values to RGB values between 0 and 255, along the last axis"""
+    lms = (np.asarray(lab, dtype=float) @ _OKLAB_TO_LMS.T) ** 3
+    linear = np.clip(lms @ _LMS_TO_LINEAR_RGB.T, 0.0, 1.0)
+    srgb = np.where(
+        linear <= 0.0031308,
+        linear * 12.92,
+        1.055 * linear ** (1 / 2.4) - 0.055,
+    )
+    return srgb * 255.0
+
+
+def interpolate_segments(starts, ends, n: int, space: str = "rgb") -> np.ndarray:
+    """Interpolate n colors between each start and end color.
+
+    In RGB space this gives the same values as plotly's `n_colors`.
+
+    Args:
+        starts (np.ndarray): RGB values with shape (segments, 3).
+        ends (np.ndarray): RGB values with shape (segments, 3).
+        n (int): The number of colors per segment, including the start and end.
+        space (str, optional): "rgb" or "oklab". Defaults to "rgb".
+
+    Returns:
+        np.ndarray: Float RGB values between 0 and 255 with shape (segments, n, 3).
+    """
+    if space not in _VALID_SPACES:
+        raise ValueError(f"Invalid color space. Must be one of {_VALID_SPACES}")
+    starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+    ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+    if space == "oklab":
+        starts, ends = rgb_to_oklab(starts), rgb_to_oklab(ends)
+
+    increments = (ends - starts) / max(n - 1, 1)
+    steps = np.arange(n, dtype=float)[None, :, None]
+    colors = starts[:, None, :] + steps * increments[:, None, :]
+
+    if space == "oklab":
+        colors = oklab_to_rgb(colors)
+    return np.clip(colors, 0.0, 255.0)
+
+
+def interpolate_palettes(palettes, n: int, space: str = "rgb") -> InterpolatedColors:
+    """Create n evenly spaced colors for each palette in one pass.
+
+    Every palette is a list of anchor colors, which are spread evenly over the
+    palette. All palettes must have the same number of anchors.
+
+    Args:
+        palettes (list): Lists of anchor colors (hex, "rgb(r, g, b)" or RGB tuples).
+        n (int): The number of colors in each palette.
+        space (str, optional):
+            The space to interpolate in. "rgb" interpolates the RGB values, "oklab"
+            interpolates in the perceptual OKLab space. Defaults to "rgb".
+
+    Returns:
+        InterpolatedColors: `rgb` is a uint8 array with shape (palettes, n, 3) and
+            `hex` is a list with a list of hex strings for each palette.
+    """
+    if space not in _VALID_SPACES:
+        raise ValueError(f"Invalid color space. Must be one of {_VALID_SPACES}")
+    anchors = np.stack([to_rgb_array(palette) for palette in palettes])
+    n_anchors = anchors.shape[1]
+    if n_anchors < 2:
+        raise ValueError("A palette needs at least two anchor colors")
+    if space == "oklab":
+        anchors = rgb_to_oklab(anchors)
+
+    # Position of every output color on the anchors, e.g. 1.5 is halfway between the
+    # second and third anchor
+    positions = np.linspace(0, n_anchors - 1, n)
+    segments = np.minimum(positions.astype(int), n_anchors - 2)
+    fractions = (positions - segments)[None, :, None]
+    colors = anchors[:, segments] + fractions * (
+        anchors[:, segments + 1] - anchors[:, segments]
+    )
+
+    if space == "oklab":
+        colors = oklab_to_rgb(colors)
+    rgb = np.clip(np.rint(colors), 0, 255).astype(np.uint8)
+    return InterpolatedColors(rgb=rgb, hex=to_hex(rgb))
+
+
+def interpolate_colors(colors, n: int, space: str = "rgb") -> InterpolatedColors:
+    """Create n evenly spaced colors through the anchor colors.
+
+    Args:
+        colors (list): The anchor colors (hex, "rgb(r, g, b)" or RGB tuples).
+        n (int): The number of colors.
+        space (str, optional): "rgb" or "oklab". Defaults to "rgb".
+
+    Returns:
+        InterpolatedColors: `rgb` is a uint8 array with shape (n, 3) and `hex` is a
+            list of hex strings.
+    """
+    palettes = interpolate_palettes([colors], n=n, space=space)
+    return InterpolatedColors(rgb=palettes.rgb[0], hex=palettes.hex[0])
+
+
+def label_rgb_array(rgb) -> list:
+    """Format an array of RGB values as "rgb(r, g, b)" strings, like plotly's `label_rgb`"""
+    return ["rgb({}, {}, {})".format(*color) for color in np.asarray(rgb).tolist()]
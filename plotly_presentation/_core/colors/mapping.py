@@ -0,0 +1,142 @@
+import numpy as np
+from ._colors import Color, DivergentColor, SequentialColor
+from .interpolation import interpolate_colors, to_rgb_array
+from .sequential import _get_palettes as _get_sequential_palettes
+from .diverging import _get_palettes as _get_diverging_palettes
+
+_VALID_OUTPUTS = ["hex", "rgba", "array"]
+
+
+class ColorMapper:
+    """Maps numeric values to colors through a precomputed lookup table.
+
+    The palette is sampled once into a table of `lut_size` colors, so coloring an
+    array of values is a normalization followed by a single `np.take`.
+
+    Args:
+        colors (list): The anchor colors of the palette (hex, "rgb(r, g, b)" or tuples).
+        vmin (float, optional): The value mapped to the first color. Defaults to the
+            minimum of the mapped values.
+        vmax (float, optional): The value mapped to the last color. Defaults to the
+            maximum of the mapped values.
+        midpoint (float, optional): If set, the values are normalized symmetrically
+            around it, so the midpoint always gets the middle color. Defaults to None.
+        space (str, optional): Interpolate the palette in "rgb" or "oklab".
+            Defaults to "rgb".
+        alpha (float, optional): The opacity used for "rgba" and "array" outputs.
+            Defaults to 1.
+        nan_color (str, optional): The hex color of missing values.
+            Defaults to Color.NEUTRAL.
+        lut_size (int, optional): The number of colors in the lookup table.
+            Defaults to 256.
+    """
+
+    def __init__(
+        self,
+        colors: list,
+        vmin: float = None,
+        vmax: float = None,
+        midpoint: float = None,
+        space: str = "rgb",
+        alpha: float = 1.0,
+        nan_color: str = None,
+        lut_size: int = 256,
+    ) -> None:
+        self.vmin = vmin
+        self.vmax = vmax
+        self.midpoint = midpoint
+        self.lut_size = lut_size
+
+        if nan_color is None:
+            nan_color = Color.NEUTRAL.value
+        palette = interpolate_colors(colors, n=lut_size, space=space)
+        # The last entry holds the color of missing values
+        rgb = np.vstack([palette.rgb, to_rgb_array([nan_color]).astype(np.uint8)])
+        self._hex_lut = np.array(palette.hex + [nan_color.upper()])
+        self._rgba_lut = np.array(
+            [f"rgba({r}, {g}, {b}, {alpha})" for r, g, b in rgb.tolist()]
+        )
+        self._array_lut = np.column_stack(
+            [rgb, np.full(len(rgb), round(alpha * 255), dtype=np.uint8)]
+        )
+
+    @classmethod
+    def sequential(cls, palette_name: str = None, **kwargs) -> "ColorMapper":
+        """Create a mapper for the theme's sequential colors.
+
+        Args:
+            palette_name (str, optional): A palette from `custom_sequential` in the
+                colors config. Defaults to the `sequential_colors` of the theme.
+        """
+        if palette_name is None:
+            colors = [SequentialColor.START.value, SequentialColor.END.value]
+        else:
+            colors = _get_sequential_palettes()[palette_name]
+        return cls(colors, **kwargs)
+
+    @classmethod
+    def diverging(
+        cls, palette_name: str = None, midpoint: float = 0, **kwargs
+    ) -> "ColorMapper":
+        """Create a mapper for the theme's diverging colors, centered on `midpoint`.
+
+        Args:
+            palette_name (str, optional): A palette from `custom_diverging` in the
+                colors config. Defaults to the `divergent_colors` of the theme.
+            midpoint (float, optional): The value getting the mid color. Defaults to 0.
+        """
+        if palette_name is None:
+            colors = [
+                DivergentColor.START.value,
+                DivergentColor.MID.value,
+                DivergentColor.END.value,
+            ]
+        else:
+            colors = _get_diverging_palettes()[palette_name]
+        return cls(colors, midpoint=midpoint, **kwargs)
+
+    def _get_indices(self, values) -> np.ndarray:
+        """Return the lookup table index of every value"""
+        values = np.asarray(values, dtype=float)
+        finite = np.isfinite(values)
+        if not finite.any():
+            return np.full(values.shape, self.lut_size, dtype=np.intp)
+
+        vmin = np.min(values[finite]) if self.vmin is None else self.vmin
+        vmax = np.max(values[finite]) if self.vmax is None else self.vmax
+        if self.midpoint is None:
+            span = vmax - vmin
+            scaled = (values - vmin) / span if span else np.zeros_like(values)
+        else:
+            half_span = max(abs(vmax - self.midpoint), abs(self.midpoint - vmin))
+            scaled = (
+                0.5 + (values - self.midpoint) / (2 * half_span)
+                if half_span
+                else np.full_like(values, 0.5)
+            )
+
+        indices = np.rint(np.clip(scaled, 0, 1) * (self.lut_size - 1))
+        indices = np.where(finite, indices, self.lut_size)
+        return indices.astype(np.intp)
+
+    def map(self, values, output: str = "hex"):
+        """Map values to colors.
+
+        Args:
+            values (array-like): The values to color. NaN gets the `nan_color`.
+            output (str, optional):
+                - 'hex' = A list of "#RRGGBB" strings.
+                - 'rgba' = A list of "rgba(r, g, b, a)" strings.
+                - 'array' = A uint8 array with shape (n, 4).
+                Defaults to "hex".
+
+        Returns:
+            list | np.ndarray: The colors, ready to use as e.g. `marker.color`.
+        """
+        if output not in _VALID_OUTPUTS:
+            raise ValueError(f"Invalid output. Must be one of {_VALID_OUTPUTS}")
+        indices = self._get_indices(values)
+        if output == "array":
+            return np.take(self._array_lut, indices, axis=0)
+        lut = self._hex_lut if output == "hex" else self._rgba_lut
+        return np.take(lut, indices).tolist()
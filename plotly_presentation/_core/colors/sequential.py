@@ -1,33 +1,42 @@
-from plotly.express.colors import n_colors, label_rgb
-from .utils import _convert_to_rgb
+from functools import lru_cache
+from .interpolation import to_rgb_array, interpolate_segments, label_rgb_array
+from .utils import PaletteView
 from plotly_presentation._core.options import options
 
 
-color_dict = options.get_option("config.colors").get("custom_sequential")
-sequential_colors = {}
+def _get_palettes() -> dict:
+    return options.get_option("config.colors").get("custom_sequential") or {}
 
 
-def create_sequential_color_list(low_color, high_color, n) -> list:
-    low_color = _convert_to_rgb(low_color)
-    high_color = _convert_to_rgb(high_color)
-    if low_color[:3] == "rgb":
-        color_type = "rgb"
-    else:
-        color_type = "tuple"
-    sequential_color_list = n_colors(
-        low_color, high_color, n_colors=n, colortype=color_type
-    )
-    sequential_color_list = [label_rgb(color) for color in sequential_color_list]
-    return sequential_color_list
+def create_sequential_color_list(low_color, high_color, n, space: str = "rgb") -> list:
+    """Create n colors going from the low to the high color.
+
+    Args:
+        low_color (str | tuple): Hex, "rgb(r, g, b)" or RGB tuple.
+        high_color (str | tuple): Hex, "rgb(r, g, b)" or RGB tuple.
+        n (int): The number of colors.
+        space (str, optional): Interpolate in "rgb" or "oklab". Defaults to "rgb".
+
+    Returns:
+        list: Colors formatted as "rgb(r, g, b)".
+    """
+    anchors = to_rgb_array([low_color, high_color])
+    colors = interpolate_segments(anchors[:1], anchors[1:], n=n, space=space)
+    return label_rgb_array(colors[0])
+
+
+@lru_cache(maxsize=256)
+def _cached_sequential_color_list(low_color, high_color, n) -> tuple:
+    return tuple(create_sequential_color_list(low_color, high_color, n))
 
 
 def get_sequential_color_list(palette_name: str, n: int) -> list:
-    colors = color_dict.get(palette_name)
+    colors = _get_palettes().get(palette_name)
     low_color = colors[0]
     high_color = colors[1]
-    return create_sequential_color_list(low_color=low_color, high_color=high_color, n=n)
+    # Cached on the colors rather than the name, so edits to the config are picked up
+    return list(_cached_sequential_color_list(low_color, high_color, n))
 
 
-if color_dict is not None:
-    for k, v in color_dict.items():
-        sequential_colors[k] = create_sequential_color_list(v[0], v[1], n=10)
+# Palettes with 10 colors, computed when looked up
+sequential_colors = PaletteView(_get_palettes, get_sequential_color_list)
@@ -1,4 +1,5 @@
-from plotly.express.colors import hex_to_rgb, label_rgb, convert_to_RGB_255
+import collections.abc
+from plotly.colors import hex_to_rgb, label_rgb, convert_to_RGB_255
 
 
 def _convert_to_rgb(color):
@@ -9,3 +10,34 @@ def _convert_to_rgb(color):
         # color = convert_to_RGB_255(color)
         color = label_rgb(color)
     return color
+
+
+class PaletteView(collections.abc.Mapping):
+    """A read-only view of the configured palettes.
+
+    The color list of a palette is only computed when it is looked up.
+
+    Args:
+        get_palettes (callable): Returns the palette config, mapping names to colors.
+        get_color_list (callable): Called as `get_color_list(palette_name, n)`.
+        n (int, optional): The number of colors in each palette. Defaults to 10.
+    """
+
+    def __init__(self, get_palettes, get_color_list, n: int = 10):
+        self._get_palettes = get_palettes
+        self._get_color_list = get_color_list
+        self._n = n
+
+    def __getitem__(self, palette_name) -> list:
+        if palette_name not in self._get_palettes():
+            raise KeyError(palette_name)
+        return self._get_color_list(palette_name, self._n)
+
+    def __iter__(self):
+        return iter(self._get_palettes())
+
+    def __len__(self) -> int:
+        return len(self._get_palettes())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)})"
@@ -1,8 +1,17 @@
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
 import os
 from pathlib import Path
 import yaml
 from plotly_presentation._core.utils.root_searcher import get_file_path
+from plotly_presentation._core.utils.dict_funcs import freeze
+from plotly_presentation._core.snapshot import (
+    SNAPSHOT_FILENAME,
+    content_hash,
+    parse_yaml,
+    read_snapshot,
+)
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "currsize"])
 
 
 class Options:
@@ -46,6 +55,13 @@ class Options:
             }
         )
 
+        # Parsed config files keyed by resolved path: (mtime_ns, size), frozen value
+        self._cache = {}
+        self._cache_hits = 0
+        self._cache_misses = 0
+        # Compiled theme snapshots keyed by directory: (mtime_ns, size), entries
+        self._snapshots = {}
+
     def get_option(self, option_name):
         """Return the value of the given option"""
         try:
@@ -56,6 +72,30 @@ class Options:
             config_filename = get_file_path(config_filename)
             return self._from_yaml(config_filename)
 
+    def get_config_dirs(self) -> list:
+        """Return the directories the config files are currently read from"""
+        config_dirs = []
+        for option_name in self._options:
+            path = Path(self._get_option(option_name))
+            if not path.is_file():
+                path = Path(get_file_path(self._get_default_option(option_name)))
+                if not path.is_file():
+                    continue
+            if path.parent.resolve() not in config_dirs:
+                config_dirs.append(path.parent.resolve())
+        return config_dirs
+
+    def cache_info(self) -> CacheInfo:
+        """Return the hit/miss counters and size of the config cache"""
+        return CacheInfo(self._cache_hits, self._cache_misses, len(self._cache))
+
+    def cache_clear(self) -> None:
+        """Drop all cached configs and reset the counters"""
+        self._cache.clear()
+        self._snapshots.clear()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
     def _get_option(self, option_name):
         """Return the value of the given option"""
         return self._options[option_name].value
@@ -79,13 +119,47 @@ class Options:
     def _from_yaml(self, filename):
         """Load options from a yaml file.
 
-        Overwrites any options that are specified in the yaml file.
+        The file is parsed once and cached by its resolved path. The cached value is
+        reused until the file's modification time or size changes. The returned value
+        is a read-only view shared between callers.
+
+        If the directory holds a compiled theme snapshot with an entry matching the
+        file's content hash, that entry is used instead of parsing the yaml.
         """
-        # Note: We assume that the contents of the config file are trusted
-        # TODO: Change this file format to be plain yaml and use SafeLoader
-        yaml_options = yaml.load(open(filename), Loader=yaml.UnsafeLoader)
+        path = Path(filename).resolve()
+        stat = path.stat()  # raises FileNotFoundError for missing configs
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._cache.get(path)
+        if cached is not None and cached[0] == signature:
+            self._cache_hits += 1
+            return cached[1]
+
+        self._cache_misses += 1
+        content = path.read_bytes()
+        entry = self._get_snapshot(path.parent).get(path.name)
+        if entry is not None and entry["hash"] == content_hash(content):
+            yaml_options = freeze(entry["data"])
+        else:
+            yaml_options = freeze(parse_yaml(content))
+        self._cache[path] = (signature, yaml_options)
         return yaml_options
 
+    def _get_snapshot(self, config_dir):
+        """Return the compiled snapshot entries of a directory, if any"""
+        try:
+            stat = (config_dir / SNAPSHOT_FILENAME).stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            signature = None
+
+        cached = self._snapshots.get(config_dir)
+        if cached is None or cached[0] != signature:
+            entries = read_snapshot(config_dir) if signature is not None else {}
+            cached = (signature, entries)
+            self._snapshots[config_dir] = cached
+        return cached[1]
+
 
 class OptionValue:
     def __init__(self, value):
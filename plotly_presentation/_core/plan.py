@@ -0,0 +1,138 @@
+from collections import namedtuple
+from functools import wraps
+
+Operation = namedtuple("Operation", ["target", "method", "args", "kwargs"])
+
+# Operations which replace the figure, so everything recorded before them is lost
+_FIGURE_FACTORIES = {
+    ("plotter", "express"),
+    ("comparison", "vertical_stacked_bar_with_total"),
+    ("comparison", "horisontal_stacked_bar_with_total"),
+    ("price_volume", "price_volume_mix_analysis"),
+    ("price_volume", "price_volume_analysis"),
+}
+# Operations which fully overwrite the result of an earlier call of the same method
+_LAST_WINS = {("style", "set_title")}
+# Operations which only merge into the layout, so an earlier identical call is redundant
+_LAYOUT_MERGES = {("style", "set_title"), ("style", "set_legend")}
+
+
+def recorded(method):
+    """Record calls of the method in the active plan instead of running them.
+
+    The decorated object needs a `_plan` attribute, which is None when not recording,
+    and a `_plan_target` naming the object on the plotter ("plotter", "style", ...).
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._plan is None:
+            return method(self, *args, **kwargs)
+        self._plan.record(self._plan_target, method.__name__, args, kwargs)
+        return getattr(self, "figure", None)
+
+    return wrapper
+
+
+class FigurePlan:
+    """The recorded operations of a lazy `Plotter`.
+
+    A plan only holds the operations and their arguments, so it can be inspected,
+    pickled and replayed on another plotter.
+
+    Example:
+        p = Plotter(lazy=True)
+        p.express(type="bar", x=["a", "b"], y=[1, 2])
+        p.style.set_title("Title")
+        p.plan.optimize().operations
+    """
+
+    def __init__(self, operations=None) -> None:
+        self.operations = list(operations or [])
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    def __repr__(self) -> str:
+        lines = [f"{op.target}.{op.method}" for op in self.operations]
+        return f"FigurePlan({lines})"
+
+    def record(self, target: str, method: str, args: tuple, kwargs: dict) -> None:
+        self.operations.append(Operation(target, method, tuple(args), dict(kwargs)))
+
+    def clear(self) -> None:
+        self.operations = []
+
+    def optimize(self) -> "FigurePlan":
+        """Return an equivalent plan with less work.
+
+        - Operations before the last one creating a new figure are dropped.
+        - Superseded `set_title` calls and repeated layout-only calls are dropped.
+        - Consecutive `add_trace`/`add_traces` calls become a single `add_traces`.
+
+        Returns:
+            FigurePlan: The optimized plan.
+        """
+        operations = self.operations
+        for i in range(len(operations) - 1, -1, -1):
+            if operations[i][:2] in _FIGURE_FACTORIES:
+                operations = operations[i:]
+                break
+
+        # Walk backwards, so the kept call of a method is always the last one
+        kept, seen = [], set()
+        for op in reversed(operations):
+            key = op[:2]
+            if key in _LAST_WINS:
+                if key in seen:
+                    continue
+                seen.add(key)
+            elif key in _LAYOUT_MERGES:
+                # Arguments are compared by value, so unhashable ones are fine
+                if any(op == other for other in kept if other[:2] == key):
+                    continue
+            kept.append(op)
+        kept.reverse()
+
+        merged = []
+        for op in kept:
+            traces = _get_plain_traces(op)
+            previous = _get_plain_traces(merged[-1]) if merged else None
+            if traces is not None and previous is not None:
+                merged[-1] = Operation(
+                    "plotter", "add_traces", (previous + traces,), {}
+                )
+            else:
+                merged.append(op)
+        return FigurePlan(merged)
+
+    def execute(self, plotter) -> None:
+        """Run the operations on the plotter as a single batch.
+
+        Args:
+            plotter (Plotter): The plotter to run the plan on. Its own recording is
+                paused meanwhile.
+        """
+        paused = plotter._set_plan(None)
+        try:
+            with plotter.batch():
+                for op in self.operations:
+                    target = (
+                        plotter
+                        if op.target == "plotter"
+                        else getattr(plotter, op.target)
+                    )
+                    getattr(target, op.method)(*op.args, **op.kwargs)
+        finally:
+            plotter._set_plan(paused)
+
+
+def _get_plain_traces(op: Operation) -> list | None:
+    """Return the traces of an add_trace(s) call without subplot arguments"""
+    if op.target != "plotter" or op.kwargs:
+        return None
+    if op.method == "add_trace" and len(op.args) == 1:
+        return [op.args[0]]
+    if op.method == "add_traces" and len(op.args) == 1:
+        return list(op.args[0])
+    return None
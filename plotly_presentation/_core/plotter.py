@@ -1,51 +1,342 @@
+from contextlib import contextmanager
 import plotly.graph_objects as go
 import plotly
-import plotly.express as px
+import plotly.io as pio
+from plotly_presentation._core.batch import LayoutBatch
 from plotly_presentation._core.callouts import Callout
-from plotly_presentation._core.style import Style
+from plotly_presentation._core.plan import FigurePlan, recorded
+from plotly_presentation._core.utils.frame_helper import (
+    aggregate_bar_frame,
+    project_frame,
+)
+from plotly_presentation._core.utils.trace_helper import (
+    consolidate_traces,
+    downsample_trace,
+    DEFAULT_DOWNSAMPLE_METHOD,
+    get_downsample_settings,
+    keep_callout_traces_last,
+    promote_to_webgl,
+    set_express_render_mode,
+)
+from plotly_presentation._core.style import (
+    Style,
+    apply_template,
+    get_slide_size,
+    get_template,
+    slim_template_dict,
+)
 
 
 class Plotter:
+    _plan = None
+    _plan_target = "plotter"
+    # The rows per bar of the last `express(aggregate=...)` chart, else None
+    aggregate_factor = None
+
     def __init__(
-        self, figure: go.Figure = None, slide_layout: str = "slide_100%"
+        self,
+        figure: go.Figure = None,
+        slide_layout: str = "slide_100%",
+        fast: bool = False,
+        validate: bool = True,
+        lazy: bool = False,
     ) -> None:
         """Initiate the plot library with the following extentions:
         .callout
 
         Args:
             slide_layout (str, optional): The size of the slide. Defaults to "slide_100%".
+            fast (bool, optional):
+                Collect the traces, shapes and annotations as plain dicts instead of
+                validating them one by one. They are validated once when the figure
+                is needed, e.g. by `show`, `save` or `materialize`. Defaults to False.
+            validate (bool, optional):
+                Only used with `fast`. If False the figure is never validated and the
+                exports are made straight from the plain dict. Defaults to True.
+            lazy (bool, optional):
+                Record the `express`, `add_trace(s)`, `style` and `callout` calls in
+                `plan` instead of running them. The plan is optimized and run once
+                when the figure is needed, e.g. by `show`, `save` or `materialize`.
+                Defaults to False.
         """
         self.slide_layout = slide_layout
-        if figure is not None:
-            self.figure = figure
-            if (
-                getattr(figure, "data", None)
-                and len(figure.data) > 0
-                and isinstance(figure.data[0], plotly.graph_objs.Waterfall)
-            ):
-                self.style._apply_waterfall_style()
-        else:
-            self.figure = go.Figure()
+        self.fast = fast
+        self.validate = validate
+        self.figure = (
+            apply_template(figure)
+            if figure is not None
+            else go.Figure(layout={"template": get_template()})
+        )
         self._apply_settings()
+        if fast:
+            # The batch is never closed, it is flushed whenever the figure is read
+            self.style._batch = self.callout._batch = LayoutBatch(self.figure)
+        if lazy:
+            self._set_plan(FigurePlan())
+        if (
+            getattr(self.figure, "data", None)
+            and len(self.figure.data) > 0
+            and isinstance(self.figure.data[0], plotly.graph_objs.Waterfall)
+        ):
+            self.style._apply_waterfall_style()
 
     def _apply_settings(self) -> None:
-        self.callout = Callout(self.figure)
-        self.style = Style(self.figure, self.slide_layout)
+        """Attach the callouts and style to the current figure.
+
+        They are created once and then rebound whenever the figure is replaced, so
+        adding traces to the same figure does not redo any of the styling.
+        """
+        if getattr(self, "style", None) is None:
+            self.callout = Callout(self.figure)
+            self.style = Style(self.figure, self.slide_layout)
+        elif self.style.figure is not self.figure:
+            batch = self.style._batch
+            if batch is not None:
+                # Finish the pending updates of the old figure before switching
+                batch.flush()
+                batch.figure = self.figure
+            self.callout._bind_figure(self.figure)
+            self.style._bind_figure(self.figure)
+
+    def _set_plan(self, plan: FigurePlan | None) -> FigurePlan | None:
+        """Start recording into `plan`, or stop recording with None.
 
-    def express(self, type: str, **kwargs) -> go.Figure:
-        self.figure = getattr(px, type)(**kwargs)
+        Returns:
+            FigurePlan | None: The plan recorded into until now.
+        """
+        previous = self._plan
+        self._plan = self.style._plan = self.callout._plan = plan
+        return previous
+
+    @property
+    def plan(self) -> FigurePlan | None:
+        """The operations recorded in lazy mode which have not been run yet"""
+        return self._plan
+
+    def _run_plan(self) -> None:
+        """Run the optimized plan of a lazy plotter and start a new one"""
+        if self._plan:
+            plan = self._plan.optimize()
+            self._plan.clear()
+            plan.execute(self)
+
+    @contextmanager
+    def batch(self):
+        """Defer the layout, shape and annotation updates made through the plotter.
+
+        Updates made by `style` and `callout` inside the block are collected and
+        applied as one validated layout update when the block exits, so e.g. a
+        `FigureWidget` only redraws once. Note that reading the layout inside the
+        block gives the values from before the block.
+
+        Example:
+            with p.batch():
+                p.style.set_title("Title")
+                p.callout.add_circle_highlight(x=1, y=2, text="+10%")
+        """
+        if self.style._batch is not None:
+            # Already batching, the outer block flushes
+            yield self
+            return
+        # The figure the updates go to, as the plotter may not have a figure yet
+        batch = LayoutBatch(self.style.figure)
+        self.style._batch = self.callout._batch = batch
+        try:
+            yield self
+        finally:
+            self.style._batch = self.callout._batch = None
+            batch.flush()
+
+    def _get_downsample_method(self, downsample: bool | str | None) -> str | None:
+        """Resolve the `downsample` argument to a method, None meaning no downsampling"""
+        default_method, _ = get_downsample_settings()
+        if downsample is None:
+            return default_method
+        if downsample is True:
+            return default_method or DEFAULT_DOWNSAMPLE_METHOD
+        return downsample or None
+
+    def _prepare_traces(self, traces, downsample: bool | str | None = None) -> list:
+        """Downsample the line traces to the slide width and draw large ones with WebGL"""
+        method = self._get_downsample_method(downsample)
+        if method is not None:
+            _, points_per_pixel = get_downsample_settings()
+            n_out = points_per_pixel * get_slide_size(self.slide_layout)[0]
+            traces = [downsample_trace(trace, n_out, method) for trace in traces]
+        return [promote_to_webgl(trace) for trace in traces]
+
+    @recorded
+    def express(
+        self,
+        type: str,
+        downsample: bool | str | None = None,
+        aggregate: str = None,
+        **kwargs,
+    ) -> go.Figure:
+        """Create the figure with a plotly.express function.
+
+        Args:
+            type (str): The plotly.express function, e.g. "line".
+            downsample (bool | str, optional):
+                Reduce line traces to a few points per pixel of the slide width:
+                "lttb", "minmax", True for the method of the theme settings (or
+                "lttb"), or False to keep all points. Defaults to None, which uses
+                `downsample` of the theme settings and keeps all points by default.
+            aggregate (str, optional):
+                Only for "bar". Aggregate the rows of `data_frame` to one row per bar
+                with "sum", "mean", "median", "min", "max", "count", "first" or
+                "last", instead of drawing a segment per row. The number of rows
+                per bar is stored in `aggregate_factor`. Defaults to None.
+            **kwargs: The arguments of the plotly.express function.
+
+        Returns:
+            go.Figure: The plotly figure.
+        """
+        # plotly.express pulls in pandas, so it is only imported when used
+        import plotly.express as px
+
+        kwargs.setdefault("template", get_template())
+        project_frame(kwargs)
+        self.aggregate_factor = None
+        if aggregate is not None:
+            if type != "bar":
+                raise ValueError("aggregate is only supported for bar charts")
+            self.aggregate_factor = aggregate_bar_frame(kwargs, aggregate)
+        method = self._get_downsample_method(downsample)
+        set_express_render_mode(type, kwargs, per_trace=method is not None)
+        figure = getattr(px, type)(**kwargs)
+
+        if method is not None and not figure.frames:
+            traces = self._prepare_traces(figure.data, downsample=method)
+            if any(new is not old for new, old in zip(traces, figure.data)):
+                figure.data = []
+                figure.add_traces(traces)
+        self.figure = figure
         self._apply_settings()
         return self.figure
 
-    def add_trace(self, func, **kwargs) -> go.Figure:
+    def materialize(self) -> go.Figure:
+        """Apply everything recorded or collected so far, validating it once.
+
+        This runs the plan of a lazy plotter and applies the traces and updates
+        collected in fast mode or in a batch.
+
+        Returns:
+            go.Figure: The plotly figure.
+        """
+        self._run_plan()
+        self.style._sync()
+        return self.figure
+
+    @recorded
+    def add_trace(
+        self, func, downsample: bool | str | None = None, **kwargs
+    ) -> go.Figure:
+        func = self._prepare_traces([func], downsample=downsample)[0]
+        if self.fast and not kwargs:
+            self.style._batch.add_traces([func])
+            if isinstance(func, plotly.graph_objs.Waterfall):
+                self.style._apply_waterfall_style()
+            return self.figure
+        self.style._sync()
         self.figure.add_trace(func, **kwargs)
+        keep_callout_traces_last(self.figure)
         self._apply_settings()
         if isinstance(func, plotly.graph_objs.Waterfall):
             self.style._apply_waterfall_style()
         return self.figure
 
+    @recorded
+    def add_traces(
+        self, traces, rows=None, cols=None, downsample=None, **kwargs
+    ) -> go.Figure:
+        """Add many traces at once.
+
+        The traces are appended with a single call to plotly's `add_traces` and the
+        settings are applied once, rather than once per trace as with `add_trace`.
+
+        Args:
+            traces (list): The traces to add.
+            rows (int | list[int], optional): Subplot row(s) of the traces. Defaults to None.
+            cols (int | list[int], optional): Subplot column(s) of the traces. Defaults to None.
+            downsample (bool | str, optional): How to reduce line traces, see `express`.
+                Defaults to None, which uses `downsample` of the theme settings.
+
+        Returns:
+            go.Figure: The plotly figure.
+        """
+        traces = self._prepare_traces(traces, downsample=downsample)
+        if self.fast and rows is None and cols is None and not kwargs:
+            self.style._batch.add_traces(traces)
+        else:
+            # Subplot positions are resolved by plotly on the complete figure
+            self.style._sync()
+            self.figure.add_traces(traces, rows=rows, cols=cols, **kwargs)
+            keep_callout_traces_last(self.figure)
+        self._apply_settings()
+        if any(isinstance(trace, plotly.graph_objs.Waterfall) for trace in traces):
+            self.style._apply_waterfall_style()
+        return self.figure
+
+    @recorded
+    def consolidate_traces(self, keep_names: bool = True) -> go.Figure:
+        """Merge the traces drawn with the same style into single traces.
+
+        Charts with hundreds of series, e.g. one grey line per store, render much
+        faster with a few traces. Lines are concatenated with gaps in between and
+        bars which only differ in color get a color per bar. The series names are
+        still shown on hover, but the merged series are no longer in the legend,
+        so only use this when the legend is not needed.
+
+        Args:
+            keep_names (bool, optional): Keep the series name of every point for the
+                hover label. Without it the figure is smaller. Defaults to True.
+
+        Returns:
+            go.Figure: The plotly figure.
+        """
+        self.style._sync()
+        layout = self.figure.layout
+        colorway = layout.colorway or layout.template.layout.colorway
+        traces = consolidate_traces(
+            self.figure.data,
+            colorway=colorway,
+            barmode=layout.barmode,
+            keep_names=keep_names,
+        )
+        if len(traces) < len(self.figure.data):
+            self.figure.data = []
+            self.figure.add_traces(traces)
+        return self.figure
+
+    def _get_export_figure(self) -> dict:
+        """Return the figure to export as a dict, with only the template sections it uses.
+
+        The template is slimmed in the dict, so the figure itself keeps the full
+        template. In fast mode without validation the dict is never validated.
+        """
+        if self.fast and not self.validate:
+            self._run_plan()
+            return slim_template_dict(self.style._batch.to_dict())
+        return slim_template_dict(self.materialize().to_dict())
+
     def show(self):
-        self.figure.show()
+        pio.show(self._get_export_figure(), validate=False)
 
     def save(self, path):
-        self.figure.write_image(path)
+        pio.write_image(self._get_export_figure(), path, validate=False)
+
+    def to_dict(self) -> dict:
+        """Return the figure as a dict, with only the template sections it uses.
+
+        In fast mode without validation this is the raw, unvalidated dict, which
+        shares the trace data with the plotter.
+        """
+        return self._get_export_figure()
+
+    def to_json(self, *args, **kwargs) -> str:
+        """Return the figure as json, with only the template sections it uses"""
+        if not args:
+            # The figure is already validated, or validation is turned off
+            kwargs.setdefault("validate", False)
+        return pio.to_json(self._get_export_figure(), *args, **kwargs)
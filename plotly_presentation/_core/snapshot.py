@@ -0,0 +1,81 @@
+import hashlib
+import pickle
+from pathlib import Path
+import yaml
+
+SNAPSHOT_FILENAME = ".theme_snapshot.pickle"
+THEME_FILES = (
+    "layout_config.yaml",
+    "colors_config.yaml",
+    "callout_settings_config.yaml",
+    "theme_settings_config.yaml",
+)
+_SNAPSHOT_VERSION = 1
+
+# The C loader is much faster, but is only available when libyaml is installed
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def content_hash(content: bytes) -> str:
+    """Return the hash used to match a config file with its snapshot entry"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def parse_yaml(content: bytes):
+    """Parse the content of a config file.
+
+    The files are plain yaml, so the (C) safe loader is tried first. Files using
+    python specific tags are still supported through the unsafe loader.
+    """
+    try:
+        return yaml.load(content, Loader=_SafeLoader)
+    except yaml.constructor.ConstructorError:
+        # Note: We assume that the contents of the config file are trusted
+        return yaml.load(content, Loader=yaml.UnsafeLoader)
+
+
+def compile_snapshot(config_dir) -> Path:
+    """Parse the theme files in `config_dir` and store them in a single snapshot.
+
+    Every entry is keyed by the hash of the file it was parsed from, so an entry is
+    ignored as soon as the yaml file is edited.
+
+    Args:
+        config_dir (str | Path): The directory holding the theme yaml files.
+
+    Returns:
+        Path: The path of the written snapshot.
+    """
+    config_dir = Path(config_dir)
+    files = {}
+    for filename in THEME_FILES:
+        path = config_dir / filename
+        if not path.is_file():
+            continue
+        content = path.read_bytes()
+        files[filename] = {"hash": content_hash(content), "data": parse_yaml(content)}
+
+    snapshot_path = config_dir / SNAPSHOT_FILENAME
+    tmp_path = snapshot_path.with_name(snapshot_path.name + ".tmp")
+    with open(tmp_path, "wb") as outfile:
+        pickle.dump({"version": _SNAPSHOT_VERSION, "files": files}, outfile, protocol=4)
+    tmp_path.replace(snapshot_path)
+    return snapshot_path
+
+
+def read_snapshot(config_dir) -> dict:
+    """Return the snapshot entries for `config_dir`.
+
+    A missing, unreadable or outdated snapshot gives an empty dict, so the caller
+    falls back to parsing the yaml files.
+    """
+    # Note: Like the yaml files, the snapshot is assumed to be trusted
+    try:
+        with open(Path(config_dir) / SNAPSHOT_FILENAME, "rb") as infile:
+            snapshot = pickle.load(infile)
+    except Exception:
+        # Missing file, truncated write, or a snapshot from another library version
+        return {}
+    if not isinstance(snapshot, dict) or snapshot.get("version") != _SNAPSHOT_VERSION:
+        return {}
+    return snapshot.get("files", {})
@@ -9,89 +9,270 @@ from plotly_presentation._core.colors import (
     get_diverging_color_list,
 )
 from plotly_presentation._core.options import options
+from plotly_presentation._core.batch import FigureUpdater
+from plotly_presentation._core.plan import recorded
 import plotly.io as pio
 import plotly.graph_objects as go
 from plotly_presentation._core.utils.dict_funcs import update_dict
+from plotly_presentation._core.utils.trace_helper import is_callout_trace
 
+TEMPLATE_NAME = "presentation_layout"
 
-layout = options.get_option("config.layout")
-
-color_layout = {
-    "annotationdefaults": {
-        "arrowcolor": str(CalloutColor.LINE_COLOR),
-        "bgcolor": str(CalloutColor.TEXT_BG_COLOR),
-        "font": {"color": str(CalloutColor.TEXT_COLOR)},
-    },
-    "colorscale": {
-        "diverging": [
-            [0, str(DivergentColor.START)],
-            [0.5, str(DivergentColor.MID)],
-            [1, str(DivergentColor.END)],
-        ],
-        "sequential": [
-            [0.0, str(SequentialColor.START)],
-            [1.0, str(SequentialColor.END)],
-        ],
-        "sequentialminus": [
-            [0.0, str(SequentialColor.END)],
-            [1.0, str(SequentialColor.START)],
-        ],
-    },
-    "colorway": color_list,
-    "font": {"color": str(PlotColor.TEXT_COLOR)},
-    "paper_bgcolor": str(PlotColor.BG_COLOR),
-    "plot_bgcolor": str(PlotColor.BG_COLOR),
-    # 'plot_bgcolor': PlotColor.BG_COLOR,
-    "xaxis": {
-        "gridcolor": str(PlotColor.BG_COLOR),
-        "linecolor": str(PlotColor.LINE_COLOR),
-        "zerolinecolor": str(PlotColor.LINE_COLOR),
-    },
-    "yaxis": {
-        "gridcolor": str(PlotColor.BG_COLOR),
-        "linecolor": str(PlotColor.LINE_COLOR),
-        "zerolinecolor": str(PlotColor.LINE_COLOR),
+# Layout sections only used by some trace types. They are kept as separate fragments
+# so figures without these traces do not carry them in their exports.
+_SUBPLOT_TRACE_TYPES = {
+    "geo": {"scattergeo", "choropleth"},
+    "mapbox": {"scattermapbox", "choroplethmapbox", "densitymapbox"},
+    "polar": {"scatterpolar", "scatterpolargl", "barpolar"},
+    "scene": {
+        "scatter3d",
+        "surface",
+        "mesh3d",
+        "cone",
+        "streamtube",
+        "volume",
+        "isosurface",
     },
+    "ternary": {"scatterternary"},
 }
-layout = update_dict(color_layout, layout)
 
-pio.templates["presentation_layout"] = go.layout.Template(layout=layout)
-pio.templates.default = "presentation_layout"
+# The validated templates keyed by the subplot sections they include, built on first
+# use by `get_template`. Values are (template, template as plotly json).
+_templates = {}
+# The template layout without subplot sections, and the subplot section fragments
+_template_fragments = None
+# The plotly default template which the presentation template replaced
+_replaced_default = None
+
+
+def get_template(subplots=None) -> go.layout.Template:
+    """Return the presentation template.
+
+    The template is built and validated the first time a figure is created and then
+    reused. It is registered in `plotly.io.templates` as "presentation_layout" and,
+    unless `set_default_template` is False in the theme settings, made plotly's
+    global default template.
+
+    Args:
+        subplots (iterable, optional):
+            Only include these subplot sections (geo, mapbox, polar, scene, ternary).
+            Defaults to None, which includes all of them.
+
+    Returns:
+        go.layout.Template: The presentation template.
+    """
+    if _template_fragments is None:
+        _build_template()
+    subplots = (
+        frozenset(_SUBPLOT_TRACE_TYPES) if subplots is None else frozenset(subplots)
+    )
+    if subplots not in _templates:
+        base_layout, fragments = _template_fragments
+        layout = dict(base_layout)
+        for section in subplots & fragments.keys():
+            layout[section] = fragments[section]
+        template = go.layout.Template(layout=layout)
+        _templates[subplots] = (template, template.to_plotly_json())
+    return _templates[subplots][0]
+
+
+def _build_template() -> None:
+    """Build the template layout fragments and register the full template"""
+    global _template_fragments, _replaced_default
+
+    color_layout = {
+        "annotationdefaults": {
+            "arrowcolor": str(CalloutColor.LINE_COLOR),
+            "bgcolor": str(CalloutColor.TEXT_BG_COLOR),
+            "font": {"color": str(CalloutColor.TEXT_COLOR)},
+        },
+        "colorscale": {
+            "diverging": [
+                [0, str(DivergentColor.START)],
+                [0.5, str(DivergentColor.MID)],
+                [1, str(DivergentColor.END)],
+            ],
+            "sequential": [
+                [0.0, str(SequentialColor.START)],
+                [1.0, str(SequentialColor.END)],
+            ],
+            "sequentialminus": [
+                [0.0, str(SequentialColor.END)],
+                [1.0, str(SequentialColor.START)],
+            ],
+        },
+        "colorway": color_list,
+        "font": {"color": str(PlotColor.TEXT_COLOR)},
+        "paper_bgcolor": str(PlotColor.BG_COLOR),
+        "plot_bgcolor": str(PlotColor.BG_COLOR),
+        # 'plot_bgcolor': PlotColor.BG_COLOR,
+        "xaxis": {
+            "gridcolor": str(PlotColor.BG_COLOR),
+            "linecolor": str(PlotColor.LINE_COLOR),
+            "zerolinecolor": str(PlotColor.LINE_COLOR),
+        },
+        "yaxis": {
+            "gridcolor": str(PlotColor.BG_COLOR),
+            "linecolor": str(PlotColor.LINE_COLOR),
+            "zerolinecolor": str(PlotColor.LINE_COLOR),
+        },
+    }
+    layout = update_dict(color_layout, options.get_option("config.layout"))
+    fragments = {
+        section: layout.pop(section)
+        for section in _SUBPLOT_TRACE_TYPES
+        if section in layout
+    }
+    _template_fragments = (layout, fragments)
+
+    pio.templates[TEMPLATE_NAME] = get_template()
+    theme_settings = options.get_option("config.theme_settings") or {}
+    if theme_settings.get("set_default_template", True):
+        _replaced_default = pio.templates.default
+        pio.templates.default = TEMPLATE_NAME
+
+
+def apply_template(figure) -> go.Figure:
+    """Give a figure created before the template was registered the presentation template.
+
+    The template is registered when the first plotter is created, so a figure
+    passed to it got the plotly default template, which is replaced to style it
+    like the figures created afterwards. Figures without a template get the
+    presentation template as well. Any other template is left untouched,
+    including the plotly default passed to later plotters, as that was chosen
+    explicitly. A figure with the plotly default template passed to the first
+    plotter can not be told apart from one created before, so it is replaced.
+
+    Args:
+        figure (go.Figure): The figure passed to the plotter.
+
+    Returns:
+        go.Figure: The plotly figure.
+    """
+    registered_now = _template_fragments is None
+    template = get_template()
+    if not figure.layout.template.to_plotly_json() or (
+        registered_now
+        and _replaced_default
+        and _replaced_default != TEMPLATE_NAME
+        and figure.layout.template == pio.templates[_replaced_default]
+    ):
+        figure.layout.template = template
+    return figure
+
+
+def get_figure_subplots(figure) -> frozenset:
+    """Return the subplot sections needed by the traces of the figure"""
+    return _get_subplots(trace.type for trace in figure.data)
+
+
+def _get_subplots(trace_types) -> frozenset:
+    """Return the subplot sections needed by the given trace types"""
+    trace_types = set(trace_types)
+    return frozenset(
+        section
+        for section, types in _SUBPLOT_TRACE_TYPES.items()
+        if trace_types & types
+    )
+
+
+def _is_presentation_template(template: dict) -> bool:
+    """Whether the template (as plotly json) is one of the presentation templates"""
+    return any(template == known for _, known in _templates.values())
+
 
+def slim_template(figure) -> go.Figure:
+    """Only keep the template sections needed by the traces of the figure.
+
+    This is done before exporting a figure. Figures using another template than the
+    presentation template are left untouched.
+
+    Args:
+        figure (go.Figure): The figure to slim down.
+
+    Returns:
+        go.Figure: The plotly figure.
+    """
+    template = figure.layout.template.to_plotly_json()
+    if not _is_presentation_template(template):
+        return figure
+    subplots = get_figure_subplots(figure)
+    slim = get_template(subplots)
+    if template != _templates[subplots][1]:
+        figure.layout.template = slim
+    return figure
+
+
+def slim_template_dict(figure: dict) -> dict:
+    """Like `slim_template`, for a figure given as a plain dict.
+
+    Args:
+        figure (dict): The figure with "data" and "layout" keys, which is updated in place.
+
+    Returns:
+        dict: The figure dict.
+    """
+    layout = figure["layout"]
+    if not _is_presentation_template(layout.get("template")):
+        return figure
+    subplots = _get_subplots(trace.get("type", "scatter") for trace in figure["data"])
+    get_template(subplots)
+    layout["template"] = _templates[subplots][1]
+    return figure
+
+
+def get_slide_size(slide_layout: str = "slide_100%") -> tuple:
+    """Return the width and height in pixels of a plot on the slide layout.
+
+    Args:
+        slide_layout (str, optional): The size of the slide. Defaults to "slide_100%".
+
+    Returns:
+        tuple: The (width, height) of the plot.
+    """
+    plot_width, plot_height = 960, 540
+    height_multiplier, width_multiplier = 1.0, 1.0
+
+    if slide_layout == "slide_75%":
+        height_multiplier = 1.0 * 0.8
+        width_multiplier = 0.75 * 0.8
+
+    elif slide_layout == "slide_50%":
+        height_multiplier = 1.0
+        width_multiplier = 0.5
+
+    elif slide_layout == "slide_25%":
+        height_multiplier = 0.5
+        width_multiplier = 0.5
+
+    elif slide_layout == "slide_wide":
+        height_multiplier = 0.75
+        width_multiplier = 1
+
+    return int(plot_width * width_multiplier), int(plot_height * height_multiplier)
+
+
+class Style(FigureUpdater):
+    _plan_target = "style"
 
-class Style:
     def __init__(self, figure, slide_layout) -> None:
         self.figure = figure
         self.slide_layout = slide_layout
         self._set_width_and_height(slide_layout=slide_layout)
 
+    def _bind_figure(self, figure) -> None:
+        """Point the style at another figure and size it to the slide layout"""
+        self.figure = figure
+        self._set_width_and_height(slide_layout=self.slide_layout)
+
     def _set_width_and_height(self, slide_layout="slide_100%"):
         """Set plot width and height based on the layout"""
         self.plot_width = 960
         self.plot_height = 540
-        height_multiplier, width_multiplier = 1.0, 1.0
-
-        if slide_layout == "slide_75%":
-            height_multiplier = 1.0 * 0.8
-            width_multiplier = 0.75 * 0.8
-
-        elif slide_layout == "slide_50%":
-            height_multiplier = 1.0
-            width_multiplier = 0.5
-
-        elif slide_layout == "slide_25%":
-            height_multiplier = 0.5
-            width_multiplier = 0.5
-
-        elif slide_layout == "slide_wide":
-            height_multiplier = 0.75
-            width_multiplier = 1
-
-        self.figure.update_layout(
-            height=int(self.plot_height * height_multiplier),
-            width=int(self.plot_width * width_multiplier),
-        )
+        width, height = get_slide_size(slide_layout)
+        self._update_layout(height=height, width=width)
 
+    @recorded
     def set_color_palette(
         self,
         palette_type: str = None,
@@ -111,6 +292,7 @@ class Style:
         if palette_type is None and color_dict is None:
             raise AttributeError("Either palette_type or color_dict must be provided")
 
+        self._sync()
         if color_dict is not None:
             for key, value in color_dict.items():
                 try:
@@ -122,7 +304,7 @@ class Style:
                         marker_color=value, selector=({"name": key})
                     )
         elif palette_type in ["sequential", "diverging"]:
-            trace_names = [d.name for d in self.figure.data]
+            trace_names = [d.name for d in self.figure.data if not is_callout_trace(d)]
             n_traces = len(trace_names)
 
             if n_traces > 1:
@@ -156,6 +338,7 @@ class Style:
                         )
 
     def _apply_waterfall_style(self):
+        self._sync()
         self.figure.data[0]["increasing"] = {"marker": {"color": Color.POSITIVE.value}}
         self.figure.data[0]["decreasing"] = {"marker": {"color": Color.NEGATIVE.value}}
         self.figure.data[0]["totals"] = {"marker": {"color": Color.NEUTRAL.value}}
@@ -164,6 +347,7 @@ class Style:
             "line": {"width": 0.5, "color": "black", "dash": "solid"},
         }
 
+    @recorded
     def set_legend(
         self,
         position: str = "top",
@@ -228,9 +412,10 @@ class Style:
         if bgcolor:
             legend_dict["bgcolor"] = bgcolor
 
-        self.figure.update_layout(legend=legend_dict)
+        self._update_layout(legend=legend_dict)
         return self.figure
 
+    @recorded
     def set_title(
         self,
         title: str,
@@ -247,7 +432,7 @@ class Style:
         title_size (int): Font size for title
         subtitle_size (int): Font size for subtitle
         """
-        self.figure.update_layout(
+        self._update_layout(
             title={
                 "text": title,
                 "subtitle": {
@@ -1,4 +1,5 @@
 import collections.abc
+import copy
 
 
 def update_dict(d: dict, u: dict) -> dict:
@@ -9,3 +10,38 @@ def update_dict(d: dict, u: dict) -> dict:
         else:
             d[k] = v
     return d
+
+
+class FrozenDict(dict):
+    """A read-only dict.
+
+    It is still a `dict`, so it can be passed straight to plotly, but any attempt to
+    mutate it raises a TypeError. Copies are plain (mutable) dicts.
+    """
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError(f"'{type(self).__name__}' object is immutable")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return {k: copy.deepcopy(v, memo) for k, v in self.items()}
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+def freeze(value):
+    """Return a read-only version of a nested dict/list structure.
+
+    Mappings become `FrozenDict` and lists become tuples, recursively.
+    """
+    if isinstance(value, collections.abc.Mapping):
+        return FrozenDict({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
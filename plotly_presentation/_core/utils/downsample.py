@@ -0,0 +1,111 @@
+import numpy as np
+
+DOWNSAMPLE_METHODS = ["lttb", "minmax"]
+
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """Select n_out points with Largest-Triangle-Three-Buckets.
+
+    The first and last point are always kept. The other points are split into
+    n_out - 2 buckets and from each bucket the point forming the largest triangle
+    with the previously selected point and the average of the next bucket is kept.
+
+    Args:
+        x (np.ndarray): Sorted numeric x values.
+        y (np.ndarray): The y values, without NaN.
+        n_out (int): The number of points to keep.
+
+    Returns:
+        np.ndarray: The sorted indices of the kept points.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bucket i holds the points edges[i]:edges[i + 1]
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    counts = np.diff(edges)
+    averages_x = np.add.reduceat(x, edges[:-1]) / counts
+    averages_y = np.add.reduceat(y, edges[:-1]) / counts
+    # The third point of the triangle: the average of the next bucket, or the last point
+    next_x = np.append(averages_x[1:], x[-1])
+    next_y = np.append(averages_y[1:], y[-1])
+
+    indices = np.empty(n_out, dtype=np.intp)
+    indices[0], indices[-1] = 0, n - 1
+    selected = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[selected], y[selected]
+        # Twice the triangle area, the factor does not change the maximum
+        areas = np.abs(
+            (ax - next_x[i]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[i] - ay)
+        )
+        selected = lo + int(np.argmax(areas))
+        indices[i + 1] = selected
+    return indices
+
+
+def minmax_indices(y, n_out: int) -> np.ndarray:
+    """Select the minimum and maximum of n_out / 2 equally sized buckets.
+
+    This keeps the envelope of the line, which suits noisy signals. The first and
+    last point are always kept.
+
+    Args:
+        y (np.ndarray): The y values, without NaN.
+        n_out (int): The approximate number of points to keep.
+
+    Returns:
+        np.ndarray: The sorted indices of the kept points.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    n_buckets = n_out // 2
+    if n_out >= n or n_buckets < 1:
+        return np.arange(n)
+
+    size = -(-n // n_buckets)
+    n_buckets = -(-n // size)
+    padding = n_buckets * size - n
+    starts = np.arange(n_buckets) * size
+    mins = np.pad(y, (0, padding), constant_values=np.inf).reshape(n_buckets, size)
+    maxs = np.pad(y, (0, padding), constant_values=-np.inf).reshape(n_buckets, size)
+    return np.unique(
+        np.concatenate(
+            [
+                [0, n - 1],
+                starts + np.argmin(mins, axis=1),
+                starts + np.argmax(maxs, axis=1),
+            ]
+        )
+    )
+
+
+def downsample_indices(x, y, n_out: int, method: str = "lttb") -> np.ndarray:
+    """Select about n_out points of a line, always keeping its minimum and maximum.
+
+    Args:
+        x (np.ndarray): Sorted numeric x values.
+        y (np.ndarray): The y values, without NaN.
+        n_out (int): The number of points to keep.
+        method (str, optional):
+            - 'lttb' = Largest-Triangle-Three-Buckets, keeps the shape of the line.
+            - 'minmax' = The minimum and maximum of every bucket.
+            Defaults to "lttb".
+
+    Returns:
+        np.ndarray: The sorted indices of the kept points.
+    """
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(
+            f"Invalid downsample method. Must be one of {DOWNSAMPLE_METHODS}"
+        )
+    if len(y) <= n_out:
+        return np.arange(len(y))
+    if method == "minmax":
+        return minmax_indices(y, n_out)
+    indices = lttb_indices(x, y, n_out)
+    return np.union1d(indices, [np.argmin(y), np.argmax(y)])
@@ -0,0 +1,255 @@
+import logging
+from collections.abc import Hashable
+
+logger = logging.getLogger(__name__)
+
+_VALID_AGGREGATES = ["sum", "mean", "median", "min", "max", "count", "first", "last"]
+# plotly.express bar arguments which split the bars into groups
+_GROUP_ARGUMENTS = [
+    "color",
+    "pattern_shape",
+    "facet_row",
+    "facet_col",
+    "animation_frame",
+    "animation_group",
+]
+# plotly.express bar arguments with a value per row, which can not be aggregated
+_ROW_ARGUMENTS = [
+    "text",
+    "hover_name",
+    "hover_data",
+    "custom_data",
+    "base",
+    "error_x",
+    "error_x_minus",
+    "error_y",
+    "error_y_minus",
+]
+
+
+def _is_horizontal(kwargs: dict) -> bool:
+    """Whether plotly.express draws the bars horizontally, i.e. the values are on x"""
+    orientation = kwargs.get("orientation")
+    if orientation is not None:
+        return orientation == "h"
+    df, x, y = kwargs["data_frame"], kwargs.get("x"), kwargs.get("y")
+    # Like plotly.express: numeric x and a categorical y give horizontal bars
+    return (
+        isinstance(x, str)
+        and isinstance(y, str)
+        and df[x].dtype.kind in "iufc"
+        and df[y].dtype.kind not in "iufc"
+    )
+
+
+def aggregate_bar_frame(kwargs: dict, aggregate: str) -> float:
+    """Aggregate the data frame of a plotly.express bar chart to one row per bar.
+
+    The frame is grouped on the category axis and the color, pattern and facet
+    columns, keeping their order of appearance, and the value column(s) are
+    aggregated.
+
+    Args:
+        kwargs (dict): The arguments of `px.bar`. The data frame is replaced by the
+            aggregated frame.
+        aggregate (str): How the values are aggregated, e.g. "sum" or "mean".
+
+    Returns:
+        float: The reduction factor, i.e. the number of rows per bar.
+    """
+    if aggregate not in _VALID_AGGREGATES:
+        raise ValueError(f"Invalid aggregate. Must be one of {_VALID_AGGREGATES}")
+    df = kwargs.get("data_frame")
+    if df is None:
+        raise ValueError("aggregate needs the data to be passed as data_frame")
+    for argument in _ROW_ARGUMENTS:
+        if kwargs.get(argument) is not None:
+            raise ValueError(f"aggregate can not be combined with {argument}")
+
+    value_argument, category_argument = (
+        ("x", "y") if _is_horizontal(kwargs) else ("y", "x")
+    )
+    values = kwargs.get(value_argument)
+    if values is None or isinstance(values, str):
+        value_columns = [] if values is None else [values]
+    else:
+        value_columns = list(values)
+    if not value_columns or any(column not in df.columns for column in value_columns):
+        raise ValueError(
+            f"aggregate needs {value_argument} to be column(s) of data_frame"
+        )
+    group_columns = []
+    for argument in [category_argument, *_GROUP_ARGUMENTS]:
+        column = kwargs.get(argument)
+        if (
+            isinstance(column, str)
+            and column in df.columns
+            and column not in group_columns
+        ):
+            group_columns.append(column)
+    if not group_columns:
+        raise ValueError(
+            f"aggregate needs {category_argument} to be a column of data_frame"
+        )
+
+    aggregated = (
+        df.groupby(group_columns, sort=False, observed=True, dropna=False)[
+            value_columns
+        ]
+        .agg(aggregate)
+        .reset_index()
+    )
+    kwargs["data_frame"] = aggregated
+    factor = len(df) / max(len(aggregated), 1)
+    logger.info(
+        "Aggregated %d rows to %d bars with %s (%.1fx fewer)",
+        len(df),
+        len(aggregated),
+        aggregate,
+        factor,
+    )
+    return factor
+
+
+# plotly.express arguments which can refer to columns of the data frame
+_COLUMN_ARGUMENTS = [
+    "x",
+    "y",
+    "z",
+    "a",
+    "b",
+    "c",
+    "r",
+    "theta",
+    "x_start",
+    "x_end",
+    "lat",
+    "lon",
+    "locations",
+    "names",
+    "values",
+    "parents",
+    "path",
+    "dimensions",
+    "ids",
+    "base",
+    "size",
+    "text",
+    "hover_name",
+    "hover_data",
+    "custom_data",
+    "error_x",
+    "error_x_minus",
+    "error_y",
+    "error_y_minus",
+    "error_z",
+    "error_z_minus",
+    "animation_frame",
+    "animation_group",
+    "facet_row",
+    "facet_col",
+    "line_group",
+    "color",
+    "symbol",
+    "line_dash",
+    "pattern_shape",
+]
+# Arguments which place the data. Without any of them plotly.express uses all columns
+_POSITION_ARGUMENTS = [
+    "x",
+    "y",
+    "z",
+    "a",
+    "b",
+    "c",
+    "r",
+    "theta",
+    "x_start",
+    "x_end",
+    "lat",
+    "lon",
+    "locations",
+    "names",
+    "values",
+    "parents",
+    "path",
+    "dimensions",
+]
+
+
+def _is_column(value, columns) -> bool:
+    """Whether value is the name of one of the columns"""
+    return isinstance(value, Hashable) and value in columns
+
+
+def _get_referenced_columns(kwargs: dict, columns) -> list | None:
+    """Return the columns used by a plotly.express call, in order of appearance.
+
+    Column names may be any hashable label, e.g. the integers of a frame built from
+    a numpy array. None means that plotly.express may use columns which are not
+    named, or that an argument could not be classified, so all of them must be kept.
+    """
+    if all(kwargs.get(argument) is None for argument in _POSITION_ARGUMENTS):
+        # Wide mode, or dimensions defaulting to all columns
+        return None
+    if "dimensions" in kwargs and kwargs["dimensions"] is None:
+        return None
+
+    referenced = []
+    for argument in _COLUMN_ARGUMENTS:
+        value = kwargs.get(argument)
+        if value is None:
+            continue
+        if isinstance(value, dict):
+            # hover_data: {column: bool/format} or {name: (format, values)}
+            names = [
+                key
+                for key, setting in value.items()
+                if setting is None or isinstance(setting, (bool, str))
+            ]
+        elif _is_column(value, columns):
+            names = [value]
+        elif isinstance(value, (list, tuple)) and all(
+            _is_column(item, columns) for item in value
+        ):
+            names = list(value)
+        elif isinstance(value, (list, tuple, range)) or hasattr(value, "__array__"):
+            # Values instead of column names, e.g. an array or a list of labels
+            continue
+        elif isinstance(value, Hashable):
+            # Not a column, checked below
+            names = [value]
+        else:
+            return None
+        for name in names:
+            if name not in columns:
+                # e.g. the name of the index, which plotly.express resolves itself
+                return None
+            if name not in referenced:
+                referenced.append(name)
+    return referenced
+
+
+def project_frame(kwargs: dict) -> None:
+    """Only pass the columns plotly.express uses.
+
+    The data frame in `kwargs` is replaced by a frame with just the referenced
+    columns. The columns are not copied, the new frame shares their data. Frames
+    which are not pandas frames, or calls which may use unnamed columns, are left
+    as they are.
+
+    Args:
+        kwargs (dict): The arguments of the plotly.express function.
+    """
+    # plotly.express imports pandas anyway, so it is only imported when used
+    import pandas as pd
+
+    df = kwargs.get("data_frame")
+    if not isinstance(df, pd.DataFrame) or not df.columns.is_unique:
+        return
+    columns = _get_referenced_columns(kwargs, df.columns)
+    if columns is None or len(columns) == len(df.columns):
+        return
+    projected = pd.DataFrame({column: df[column] for column in columns}, copy=False)
+    projected.columns.name = df.columns.name
+    kwargs["data_frame"] = projected
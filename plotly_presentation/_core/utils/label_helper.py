@@ -0,0 +1,60 @@
+import numpy as np
+
+
+def _isotonic_regression(values: np.ndarray) -> np.ndarray:
+    """Return the closest non-decreasing sequence (pool adjacent violators)"""
+    means, counts = [], []
+    for value in values.tolist():
+        mean, count = value, 1
+        while means and means[-1] > mean:
+            previous_mean, previous_count = means.pop(), counts.pop()
+            mean = (previous_mean * previous_count + mean * count) / (
+                previous_count + count
+            )
+            count += previous_count
+        means.append(mean)
+        counts.append(count)
+    return np.repeat(means, counts)
+
+
+def spread_labels(
+    positions, heights, lower: float = None, upper: float = None
+) -> np.ndarray:
+    """Move labels apart so that they do not overlap.
+
+    The labels are sorted by their wanted position and keep that order. Labels which
+    would overlap are moved apart as a group, centered on their wanted positions, so
+    every label moves as little as possible. Sorting makes this O(n log n).
+
+    Args:
+        positions (array-like): The wanted center of every label, e.g. in pixels.
+        heights (array-like | float): The height of every label, in the same unit.
+        lower (float, optional): The lowest the bottom of a label may be. Defaults to None.
+        upper (float, optional): The highest the top of a label may be. When the labels do
+            not fit between lower and upper, they run over the upper bound. Defaults to None.
+
+    Returns:
+        np.ndarray: The new centers of the labels, in the original order.
+    """
+    positions = np.asarray(positions, dtype=float)
+    heights = np.broadcast_to(np.asarray(heights, dtype=float), positions.shape)
+    if len(positions) == 0:
+        return positions.copy()
+
+    order = np.argsort(positions, kind="stable")
+    wanted, sorted_heights = positions[order], heights[order]
+    # The distance of every label from the first one, when the labels touch
+    offsets = np.concatenate(
+        [[0.0], np.cumsum((sorted_heights[:-1] + sorted_heights[1:]) / 2)]
+    )
+    # Touching labels move together, so the first-label position of every label
+    # must be non-decreasing: the closest such positions are an isotonic regression
+    bases = _isotonic_regression(wanted - offsets)
+    if upper is not None:
+        bases = np.minimum(bases, upper - sorted_heights[-1] / 2 - offsets[-1])
+    if lower is not None:
+        bases = np.maximum(bases, lower + sorted_heights[0] / 2)
+
+    spread = np.empty_like(positions)
+    spread[order] = bases + offsets
+    return spread
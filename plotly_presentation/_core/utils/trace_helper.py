@@ -0,0 +1,540 @@
+import json
+import logging
+import re
+import numpy as np
+import plotly.graph_objects as go
+from plotly_presentation._core.options import options
+from plotly_presentation._core.utils.downsample import downsample_indices
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WEBGL_THRESHOLD = 50_000
+DEFAULT_DOWNSAMPLE_METHOD = "lttb"
+DEFAULT_DOWNSAMPLE_POINTS_PER_PIXEL = 2
+
+# SVG trace types and their WebGL counterpart
+_WEBGL_TRACE_TYPES = {"scatter": go.Scattergl, "scatterpolar": go.Scatterpolargl}
+# Line trace types which can be downsampled
+_DOWNSAMPLE_TRACE_TYPES = {"scatter", "scattergl"}
+# Per point properties which are downsampled together with x and y
+_POINT_PROPERTIES = [
+    ("x",),
+    ("y",),
+    ("text",),
+    ("hovertext",),
+    ("customdata",),
+    ("ids",),
+    ("textposition",),
+    ("marker", "color"),
+    ("marker", "size"),
+    ("marker", "symbol"),
+    ("marker", "opacity"),
+]
+# Top level per point properties, which are not validated when promoting a dict
+_DATA_PROPERTIES = {"x", "y", "r", "theta", "text", "hovertext", "customdata", "ids"}
+# The meta of the traces added by callouts, which are not data of the chart
+CALLOUT_TRACE_META = "plotly_presentation.callout"
+# plotly.express functions taking a `render_mode`
+_WEBGL_EXPRESS_TYPES = {"scatter", "line", "scatter_polar", "line_polar"}
+
+
+def get_webgl_threshold() -> int | None:
+    """Return the number of points above which scatter traces are drawn with WebGL.
+
+    It is set with `webgl_threshold` in the theme settings. None disables WebGL
+    promotion.
+    """
+    theme_settings = options.get_option("config.theme_settings") or {}
+    return theme_settings.get("webgl_threshold", DEFAULT_WEBGL_THRESHOLD)
+
+
+def _get_trace_type(trace) -> str:
+    """Return the type of a trace object or a trace dict, e.g. "scatter" """
+    if isinstance(trace, dict):
+        return trace.get("type", "scatter")
+    return trace.type
+
+
+def _get_property(trace, key: str):
+    """Return a top level property of a trace object or a trace dict"""
+    if isinstance(trace, dict):
+        return trace.get(key)
+    return getattr(trace, key, None)
+
+
+def is_callout_trace(trace) -> bool:
+    """Whether a trace object or trace dict was added by a callout, e.g. circle markers"""
+    return _get_property(trace, "meta") == CALLOUT_TRACE_META
+
+
+def sort_callout_traces_last(traces) -> list:
+    """Return the traces with the traces added by callouts moved to the end.
+
+    plotly picks the automatic color of a trace by its position, so the chart
+    traces keep the colors they would have without the callouts, which are drawn
+    on top of them.
+    """
+    callouts = [trace for trace in traces if is_callout_trace(trace)]
+    if not callouts:
+        return list(traces)
+    return [trace for trace in traces if not is_callout_trace(trace)] + callouts
+
+
+def keep_callout_traces_last(figure) -> None:
+    """Move the traces added by callouts behind the traces added after them"""
+    data = figure.data
+    ordered = sort_callout_traces_last(data)
+    if any(new is not old for new, old in zip(ordered, data)):
+        figure.data = ordered
+
+
+def count_points(trace) -> int:
+    """Return the number of points of a trace object or a trace dict"""
+    for axis in ("y", "x", "r", "theta"):
+        values = _get_property(trace, axis)
+        if values is not None:
+            return len(values)
+    return 0
+
+
+def promote_to_webgl(trace, threshold: int = None):
+    """Convert a large scatter trace to its WebGL version.
+
+    Traces with more points than the threshold are returned as `go.Scattergl` (or
+    `go.Scatterpolargl`) with the same properties. Traces using properties WebGL
+    does not support, e.g. `stackgroup` or spline lines, are kept as they are.
+    Trace dicts, as collected in fast mode, stay dicts: only their properties other
+    than the data are validated against the WebGL type.
+
+    Args:
+        trace (BaseTraceType | dict): The trace to convert.
+        threshold (int, optional): The maximum number of points of an SVG trace.
+            Defaults to the `webgl_threshold` of the theme settings.
+
+    Returns:
+        BaseTraceType | dict: The promoted trace, or the trace itself.
+    """
+    webgl_type = _WEBGL_TRACE_TYPES.get(_get_trace_type(trace))
+    if webgl_type is None:
+        return trace
+    if threshold is None:
+        threshold = get_webgl_threshold()
+        if threshold is None:
+            return trace
+    n_points = count_points(trace)
+    if n_points <= threshold:
+        return trace
+
+    if isinstance(trace, dict):
+        properties = {
+            key: value
+            for key, value in trace.items()
+            if key not in _DATA_PROPERTIES and key != "type"
+        }
+    else:
+        properties = dict(trace.to_plotly_json())
+        properties.pop("type", None)
+    try:
+        promoted = webgl_type(properties)
+    except ValueError as e:
+        logger.debug(
+            "Keeping trace %r as %s: %s",
+            _get_property(trace, "name"),
+            _get_trace_type(trace),
+            e,
+        )
+        return trace
+    if isinstance(trace, dict):
+        promoted = {**trace, "type": webgl_type._path_str}
+    logger.info(
+        "Drawing trace %r with %d points as %s (webgl_threshold=%d)",
+        _get_property(trace, "name"),
+        n_points,
+        webgl_type._path_str,
+        threshold,
+    )
+    return promoted
+
+
+def _count_express_rows(kwargs: dict) -> int:
+    """Return the number of rows plotly.express will plot"""
+    data_frame = kwargs.get("data_frame")
+    if data_frame is not None:
+        return len(data_frame)
+    for key in ("x", "y", "r", "theta"):
+        values = kwargs.get(key)
+        if values is not None and not isinstance(values, str):
+            return len(values)
+    return 0
+
+
+def set_express_render_mode(type: str, kwargs: dict, per_trace: bool = False) -> None:
+    """Choose SVG or WebGL for a plotly.express chart based on the WebGL threshold.
+
+    Nothing is changed when `render_mode` is given or the threshold is disabled.
+
+    Args:
+        type (str): The plotly.express function, e.g. "line".
+        kwargs (dict): The arguments of the function, which are updated in place.
+        per_trace (bool, optional): Always draw with SVG, as the traces are
+            promoted one by one afterwards (e.g. after downsampling). Defaults to False.
+    """
+    if type not in _WEBGL_EXPRESS_TYPES or "render_mode" in kwargs:
+        return
+    if per_trace:
+        kwargs["render_mode"] = "svg"
+        return
+    threshold = get_webgl_threshold()
+    if threshold is None:
+        return
+    n_rows = _count_express_rows(kwargs)
+    # WebGL traces do not support spline lines or animations
+    if (
+        n_rows <= threshold
+        or kwargs.get("line_shape") == "spline"
+        or kwargs.get("animation_frame") is not None
+    ):
+        kwargs["render_mode"] = "svg"
+        return
+    kwargs["render_mode"] = "webgl"
+    logger.info(
+        "Drawing %s chart with %d rows with WebGL (webgl_threshold=%d)",
+        type,
+        n_rows,
+        threshold,
+    )
+
+
+def get_downsample_settings() -> tuple:
+    """Return the default downsample method and the number of points per pixel.
+
+    They are set with `downsample` and `downsample_points_per_pixel` in the theme
+    settings. A method of None, the default, disables downsampling.
+    """
+    theme_settings = options.get_option("config.theme_settings") or {}
+    return (
+        theme_settings.get("downsample"),
+        theme_settings.get(
+            "downsample_points_per_pixel", DEFAULT_DOWNSAMPLE_POINTS_PER_PIXEL
+        ),
+    )
+
+
+def _get_numeric_x(x, n_points: int) -> np.ndarray | None:
+    """Return the x values as sorted floats, or None if the line can not be downsampled.
+
+    Categories and strings (e.g. dates as text) are treated as evenly spaced.
+    """
+    if x is None:
+        return np.arange(n_points, dtype=float)
+    x = np.asarray(x)
+    if len(x) != n_points:
+        return None
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype("datetime64[ns]").astype(np.int64)
+    elif not np.issubdtype(x.dtype, np.number):
+        return np.arange(n_points, dtype=float)
+    x = x.astype(float)
+    if not np.isfinite(x).all() or np.any(np.diff(x) < 0):
+        return None
+    return x
+
+
+def _take_points(properties: dict, path: tuple, indices: np.ndarray, n_points: int):
+    """Replace the per point property at `path` by the selected points.
+
+    Nested dicts on the path are copied, so the original trace is not changed.
+    """
+    *parents, key = path
+    for parent in parents:
+        child = properties.get(parent)
+        if not isinstance(child, dict):
+            return
+        properties[parent] = properties = dict(child)
+    values = properties.get(key)
+    if (
+        values is None
+        or isinstance(values, str)
+        or not hasattr(values, "__len__")
+        or len(values) != n_points
+    ):
+        return
+    properties[key] = np.asarray(values)[indices]
+
+
+def downsample_trace(trace, n_out: int, method: str = DEFAULT_DOWNSAMPLE_METHOD):
+    """Reduce a line trace to about n_out points.
+
+    Only line traces (`go.Scatter`/`go.Scattergl` drawn with lines) with sorted x
+    values and without missing values are reduced. Stacked and filled-to-next
+    traces are kept, as their points must line up with the other traces. The
+    minimum and maximum of the line are always kept. Trace dicts, as collected in
+    fast mode, are reduced to new dicts without validating them.
+
+    Args:
+        trace (BaseTraceType | dict): The trace to reduce.
+        n_out (int): The number of points to keep.
+        method (str, optional): "lttb" or "minmax", see `downsample_indices`.
+            Defaults to "lttb".
+
+    Returns:
+        BaseTraceType | dict: A new trace with the selected points, or the trace itself.
+    """
+    trace_y = _get_property(trace, "y")
+    if _get_trace_type(trace) not in _DOWNSAMPLE_TRACE_TYPES or trace_y is None:
+        return trace
+    mode = _get_property(trace, "mode")
+    if (
+        (mode is not None and "lines" not in mode)
+        or _get_property(trace, "stackgroup")
+        or _get_property(trace, "fill") in ("tonext", "tonextx", "tonexty")
+    ):
+        return trace
+    n_points = len(trace_y)
+    if n_points <= n_out:
+        return trace
+    name = _get_property(trace, "name")
+    try:
+        y = np.asarray(trace_y, dtype=float)
+    except (TypeError, ValueError):
+        return trace
+    x = _get_numeric_x(_get_property(trace, "x"), n_points)
+    if x is None or not np.isfinite(y).all():
+        logger.debug("Not downsampling trace %r: unsorted x or missing y", name)
+        return trace
+
+    indices = downsample_indices(x, y, n_out, method=method)
+    if isinstance(trace, dict):
+        properties = dict(trace)
+    else:
+        properties = dict(trace.to_plotly_json())
+        properties.pop("type", None)
+    for path in _POINT_PROPERTIES:
+        _take_points(properties, path, indices, n_points)
+    logger.info(
+        "Downsampled trace %r from %d to %d points (%s)",
+        name,
+        n_points,
+        len(indices),
+        method,
+    )
+    if isinstance(trace, dict):
+        return properties
+    return type(trace)(properties)
+
+
+# Per point properties which prevent merging a trace, as only x and y are merged
+_MERGE_BLOCKING_PROPERTIES = [
+    path for path in _POINT_PROPERTIES if path not in [("x",), ("y",)]
+]
+# Properties which identify a trace rather than style it
+_IDENTITY_PROPERTIES = {"name", "uid", "legendgroup", "showlegend", "x", "y"}
+# Bar properties which only place the bars of a trace next to other traces
+_BAR_GROUP_PROPERTIES = {"offsetgroup", "alignmentgroup"}
+
+
+def _get_trace_color(trace, index: int, colorway: list):
+    """Return the color of a trace, resolving automatic colors from the colorway"""
+    if type(trace) is go.Bar:
+        color = trace.marker.color
+    else:
+        color = trace.line.color or trace.marker.color
+    if color is None and colorway:
+        color = colorway[index % len(colorway)]
+    return color
+
+
+def _get_style_key(trace, index: int, colorway: list, barmode: str) -> str | None:
+    """Return a key which is equal for traces drawn with the same style.
+
+    Colors coming from the colorway are resolved, so traces with different
+    automatic colors get different keys. None means the trace can not be merged.
+    """
+    if is_callout_trace(trace):
+        return None
+    if type(trace) in (go.Scatter, go.Scattergl):
+        if trace.connectgaps:
+            return None
+    elif type(trace) is go.Bar:
+        if barmode == "group":
+            return None
+    else:
+        return None
+    if trace.y is None or any(
+        _has_point_values(trace, path) for path in _MERGE_BLOCKING_PROPERTIES
+    ):
+        return None
+
+    properties = {
+        key: value
+        for key, value in trace.to_plotly_json().items()
+        if key not in _IDENTITY_PROPERTIES
+    }
+    if type(trace) is go.Bar:
+        for key in _BAR_GROUP_PROPERTIES:
+            properties.pop(key, None)
+        # The color of a bar becomes a per point color, so it is not part of the style
+        properties["marker"] = dict(properties.get("marker") or {})
+        properties["marker"].pop("color", None)
+    else:
+        properties["color"] = _get_trace_color(trace, index, colorway)
+    properties["hovertemplate"] = _replace_name(
+        properties.pop("hovertemplate", None), trace.name, "%{customdata}"
+    )
+    return json.dumps(properties, sort_keys=True, default=str)
+
+
+def _replace_name(template: str | None, name: str | None, replacement: str):
+    """Replace the trace name in a hovertemplate like "variable=<name><br>...".
+
+    Only a whole value after "=" is replaced, so short names do not match inside
+    e.g. "<br>" or "%{x}".
+    """
+    if template is None or not name:
+        return template
+    pattern = "=" + re.escape(str(name)) + "(?=<br>|<extra>|$)"
+    return re.sub(pattern, lambda _: "=" + replacement, template)
+
+
+def _has_point_values(trace, path: tuple) -> bool:
+    value = trace
+    for key in path:
+        value = getattr(value, key, None)
+        if value is None:
+            return False
+    return not isinstance(value, str) and hasattr(value, "__len__")
+
+
+def _merge_traces(traces: list, colors: list, keep_names: bool = True):
+    """Merge traces with the same style into one trace.
+
+    Lines are separated by a point without y value, bars get a color per point.
+    With `keep_names` the trace names are kept per point in customdata.
+    """
+    first = traces[0]
+    is_bar = type(first) is go.Bar
+    xs, ys, names, point_colors = [], [], [], []
+    for trace, color in zip(traces, colors):
+        y = np.asarray(trace.y)
+        x = np.arange(len(y)) if trace.x is None else np.asarray(trace.x)
+        if len(y) == 0:
+            continue
+        xs.append(x)
+        ys.append(y)
+        names.append(np.full(len(y), trace.name or "", dtype=object))
+        if is_bar:
+            point_colors.append(np.full(len(y), color, dtype=object))
+        else:
+            # Repeating the last x keeps its type; the missing y breaks the line
+            xs.append(x[-1:])
+            ys.append(np.array([np.nan]))
+            names.append(np.array([""], dtype=object))
+
+    properties = dict(first.to_plotly_json())
+    for key in ("type", "name", "uid", "legendgroup", *_BAR_GROUP_PROPERTIES):
+        properties.pop(key, None)
+    properties["x"] = np.concatenate(xs)
+    properties["y"] = np.concatenate(ys)
+    properties["showlegend"] = False
+    template = properties.pop("hovertemplate", None)
+    if keep_names:
+        properties["customdata"] = np.concatenate(names)
+        if template is not None and first.name:
+            properties["hovertemplate"] = _replace_name(
+                template, first.name, "%{customdata}"
+            )
+        else:
+            properties["hovertemplate"] = "(%{x}, %{y})<extra>%{customdata}</extra>"
+    elif template is not None:
+        properties["hovertemplate"] = _replace_name(template, first.name, "")
+    if is_bar:
+        properties["marker"] = dict(properties.get("marker") or {})
+        properties["marker"]["color"] = np.concatenate(point_colors)
+    else:
+        properties["line"] = dict(properties.get("line") or {})
+        properties["line"]["color"] = colors[0]
+    return type(first)(properties)
+
+
+def _pin_color(trace, index: int, colorway: list) -> None:
+    """Set the automatic color of a trace, as it moves to another position"""
+    if type(trace) not in (go.Scatter, go.Scattergl, go.Bar):
+        return
+    color = _get_trace_color(trace, index, colorway)
+    if type(trace) is go.Bar:
+        if trace.marker.color is None:
+            trace.marker.color = color
+    elif trace.line.color is None and trace.marker.color is None:
+        trace.line.color = color
+
+
+def _get_bar_positions(trace) -> list:
+    """Return the category positions of the bars of a trace"""
+    positions = trace.y if trace.orientation == "h" else trace.x
+    if positions is None:
+        return list(range(len(trace.y if trace.orientation != "h" else trace.x)))
+    return np.asarray(positions, dtype=object).tolist()
+
+
+def consolidate_traces(
+    traces, colorway: list = None, barmode: str = None, keep_names: bool = True
+) -> list:
+    """Merge traces drawn with the same style into a single trace.
+
+    Lines with the same style are concatenated, separated by a gap, and bars
+    which only differ in color become one trace with a color per bar. The name of
+    every point is kept in `customdata` and shown on hover, but the merged traces
+    are not shown in the legend. Traces with per point text, customdata or marker
+    arrays, lines connecting gaps and grouped bars are kept as they are, as are
+    bars which would end up on top of each other.
+
+    Args:
+        traces (list): The traces of the figure.
+        colorway (list, optional): The colorway of the figure, used for traces
+            without their own color. Defaults to None.
+        barmode (str, optional): The barmode of the figure. Defaults to None.
+        keep_names (bool, optional): Keep the series name of every point for the
+            hover label. Without it the figure is smaller. Defaults to True.
+
+    Returns:
+        list: The consolidated traces, in the order of their first trace.
+    """
+    groups = {}
+    for index, trace in enumerate(traces):
+        key = _get_style_key(trace, index, colorway, barmode)
+        groups.setdefault(index if key is None else key, []).append(index)
+
+    merged_groups = {}
+    for indices in groups.values():
+        group = [traces[i] for i in indices]
+        if len(group) < 2:
+            continue
+        if type(group[0]) is go.Bar:
+            positions = [
+                position for trace in group for position in _get_bar_positions(trace)
+            ]
+            if len(set(positions)) != len(positions):
+                # The bars would be drawn on top of each other
+                continue
+        colors = [
+            _get_trace_color(trace, i, colorway) for i, trace in zip(indices, group)
+        ]
+        merged_groups[indices[0]] = (
+            set(indices),
+            _merge_traces(group, colors, keep_names=keep_names),
+        )
+
+    if not merged_groups:
+        return list(traces)
+    result, merged_indices = [], set()
+    for index, trace in enumerate(traces):
+        if index in merged_groups:
+            indices, merged = merged_groups[index]
+            merged_indices |= indices
+            result.append(merged)
+        elif index not in merged_indices:
+            if len(result) != index:
+                _pin_color(trace, index, colorway)
+            result.append(trace)
+    logger.info("Consolidated %d traces into %d", len(traces), len(result))
+    return result
@@ -0,0 +1,38 @@
+"""Theme tools.
+
+Compile the theme yaml files into a snapshot which is loaded instead of parsing the
+yaml on start up:
+
+    python -m plotly_presentation.theme compile [CONFIG_DIR ...]
+
+Without a directory, the directories the config files are currently read from are
+compiled (PLOTLY_CONFIG_DIR or ~/.plotly_presentation, and the library defaults).
+"""
+
+import argparse
+from plotly_presentation._core.options import options
+from plotly_presentation._core.snapshot import compile_snapshot
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m plotly_presentation.theme")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    compile_parser = subparsers.add_parser(
+        "compile", help="Compile the theme yaml files into a snapshot"
+    )
+    compile_parser.add_argument(
+        "config_dirs",
+        nargs="*",
+        help="Directories holding the theme yaml files. Defaults to the ones in use.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "compile":
+        config_dirs = args.config_dirs or options.get_config_dirs()
+        for config_dir in config_dirs:
+            print(f"Compiled {compile_snapshot(config_dir)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -428,6 +428,42 @@ class TestComparison(unittest.TestCase):
         self.assertIsNotNone(comp.figure)
         self.assertIsInstance(comp.figure, go.Figure)
 
+    def test_vertical_stacked_bar_single_trace(self):
+        df = self.df_no_color.copy()
+        per_category = Comparison().vertical_stacked_bar_with_total(
+            df.copy(), x="Country", y="Percentage", total_category="All"
+        )
+        single = Comparison().vertical_stacked_bar_with_total(
+            df.copy(),
+            x="Country",
+            y="Percentage",
+            total_category="All",
+            single_trace=True,
+        )
+        self.assertEqual(len(single.data), 1)
+        self.assertEqual(list(single.data[0].x), [t.x[0] for t in per_category.data])
+        self.assertEqual(
+            list(single.data[0].marker.color),
+            [t.marker.color for t in per_category.data],
+        )
+
+    def test_horisontal_stacked_bar_single_trace_partial_color_map(self):
+        comp = Comparison()
+        comp.horisontal_stacked_bar_with_total(
+            self.df_no_color.copy(),
+            x="Percentage",
+            y="Country",
+            total_category="All",
+            single_trace=True,
+            color_discrete_map={"All": "red"},
+            color_discrete_sequence=["blue", "green"],
+        )
+        self.assertEqual(len(comp.figure.data), 1)
+        colors = dict(zip(comp.figure.data[0].y, comp.figure.data[0].marker.color))
+        # Like plotly.express, unmapped categories continue the sequence
+        self.assertEqual(colors["All"], "red")
+        self.assertEqual(set(colors.values()), {"red", "blue", "green"})
+
 
 if __name__ == "__main__":
     unittest.main()
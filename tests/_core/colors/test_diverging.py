@@ -1,5 +1,10 @@
 import unittest
-from plotly_presentation._core.colors.diverging import create_diverging_color_list
+from plotly_presentation._core.colors.diverging import (
+    create_diverging_color_list,
+    get_diverging_color_list,
+    diverging_colors,
+    _cached_diverging_color_list,
+)
 import plotly.express as px
 
 
@@ -43,3 +48,14 @@ class CalloutTest(unittest.TestCase):
             "rgb(0,0,0)", "rgb(255,255,255)", "rgb(10,10,10)", 11
         )
         self.assertEqual(len(colors), 11)
+
+    def test_get_diverging_color_list_is_cached(self):
+        _cached_diverging_color_list.cache_clear()
+        colors = get_diverging_color_list("reds", 5)
+        self.assertEqual(get_diverging_color_list("reds", 5), colors)
+        info = _cached_diverging_color_list.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+
+    def test_diverging_colors_view(self):
+        self.assertEqual(list(diverging_colors), ["reds"])
+        self.assertEqual(len(diverging_colors["reds"]), 10)
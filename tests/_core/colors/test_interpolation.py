@@ -0,0 +1,71 @@
+import unittest
+import numpy as np
+from plotly.colors import n_colors
+from plotly_presentation._core.colors.interpolation import (
+    interpolate_colors,
+    interpolate_palettes,
+    interpolate_segments,
+    label_rgb_array,
+    oklab_to_rgb,
+    rgb_to_oklab,
+    to_hex,
+    to_rgb_array,
+)
+
+
+class TestInterpolation(unittest.TestCase):
+    def test_to_rgb_array(self):
+        rgb = to_rgb_array(["#D73809", "rgb(1, 2, 3)", (4, 5, 6)])
+        np.testing.assert_array_equal(rgb, [[215, 56, 9], [1, 2, 3], [4, 5, 6]])
+
+    def test_to_hex(self):
+        self.assertEqual(
+            to_hex([[215, 56, 9], [300, -1, 127.6]]), ["#D73809", "#FF0080"]
+        )
+
+    def test_segments_match_plotly(self):
+        low, high = (215, 56, 9), (249, 143, 112)
+        expected = n_colors(low, high, 7, colortype="tuple")
+        actual = interpolate_segments([low], [high], n=7)[0]
+        self.assertEqual([tuple(c) for c in actual.tolist()], expected)
+
+    def test_interpolate_colors(self):
+        colors = interpolate_colors(["#000000", "#ffffff"], n=3)
+        self.assertEqual(colors.rgb.dtype, np.uint8)
+        self.assertEqual(colors.rgb.shape, (3, 3))
+        self.assertEqual(colors.hex, ["#000000", "#808080", "#FFFFFF"])
+
+    def test_interpolate_through_mid_anchor(self):
+        colors = interpolate_colors(["#000000", "#ff0000", "#ffffff"], n=5)
+        self.assertEqual(
+            colors.hex, ["#000000", "#800000", "#FF0000", "#FF8080", "#FFFFFF"]
+        )
+
+    def test_interpolate_palettes(self):
+        palettes = interpolate_palettes(
+            [["#000000", "#ffffff"], ["#ff0000", "#0000ff"]], n=4
+        )
+        self.assertEqual(palettes.rgb.shape, (2, 4, 3))
+        self.assertEqual(palettes.hex[1][0], "#FF0000")
+        self.assertEqual(palettes.hex[1][-1], "#0000FF")
+
+    def test_oklab_round_trip(self):
+        rgb = np.array([[215.0, 56.0, 9.0], [0.0, 0.0, 0.0], [255.0, 255.0, 255.0]])
+        np.testing.assert_allclose(oklab_to_rgb(rgb_to_oklab(rgb)), rgb, atol=1e-6)
+
+    def test_oklab_keeps_anchors(self):
+        colors = interpolate_colors(["#D73809", "#60748D"], n=5, space="oklab")
+        self.assertEqual(colors.hex[0], "#D73809")
+        self.assertEqual(colors.hex[-1], "#60748D")
+        self.assertNotEqual(
+            colors.hex, interpolate_colors(["#D73809", "#60748D"], n=5).hex
+        )
+
+    def test_invalid_space(self):
+        with self.assertRaises(ValueError):
+            interpolate_colors(["#000000", "#ffffff"], n=3, space="hsv")
+
+    def test_label_rgb_array(self):
+        self.assertEqual(
+            label_rgb_array([[0.0, 127.5, 255.0]]), ["rgb(0.0, 127.5, 255.0)"]
+        )
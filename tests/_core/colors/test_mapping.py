@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+from plotly_presentation._core.colors import (
+    Color,
+    ColorMapper,
+    DivergentColor,
+    SequentialColor,
+)
+
+
+class TestColorMapper(unittest.TestCase):
+    def test_sequential_ends(self):
+        mapper = ColorMapper.sequential()
+        colors = mapper.map([0, 5, 10])
+        self.assertEqual(colors[0], SequentialColor.START.value.upper())
+        self.assertEqual(colors[-1], SequentialColor.END.value.upper())
+
+    def test_custom_sequential_palette(self):
+        colors = ColorMapper.sequential("ice").map([1, 2])
+        self.assertEqual(colors, ["#60748D", "#A3B0C0"])
+
+    def test_diverging_is_symmetric_around_midpoint(self):
+        mapper = ColorMapper.diverging()
+        colors = mapper.map([-1, 0, 10])
+        self.assertEqual(colors[-1], DivergentColor.END.value.upper())
+        # -1 is much closer to the midpoint than 10, so it is not the start color
+        self.assertNotEqual(colors[0], DivergentColor.START.value.upper())
+        self.assertEqual(mapper.map([0, -10, 10])[0], colors[1])
+
+    def test_fixed_range(self):
+        mapper = ColorMapper(["#000000", "#ffffff"], vmin=0, vmax=255, lut_size=256)
+        self.assertEqual(mapper.map([-10, 128, 300]), ["#000000", "#808080", "#FFFFFF"])
+
+    def test_nan_values(self):
+        colors = ColorMapper(["#000000", "#ffffff"]).map([0, np.nan, 1])
+        self.assertEqual(colors[1], Color.NEUTRAL.value.upper())
+        all_nan = ColorMapper(["#000000", "#ffffff"]).map([np.nan])
+        self.assertEqual(all_nan, [Color.NEUTRAL.value.upper()])
+
+    def test_constant_values(self):
+        self.assertEqual(
+            ColorMapper(["#000000", "#ffffff"]).map([3, 3]), ["#000000", "#000000"]
+        )
+
+    def test_outputs(self):
+        mapper = ColorMapper(["#000000", "#ffffff"], alpha=0.5)
+        self.assertEqual(
+            mapper.map([0, 1], output="rgba")[1], "rgba(255, 255, 255, 0.5)"
+        )
+        array = mapper.map(np.array([0, 1]), output="array")
+        self.assertEqual(array.dtype, np.uint8)
+        np.testing.assert_array_equal(array, [[0, 0, 0, 128], [255, 255, 255, 128]])
+        with self.assertRaises(ValueError):
+            mapper.map([0, 1], output="rgb")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,10 @@
 import unittest
-from plotly_presentation._core.colors.sequential import create_sequential_color_list
+from plotly_presentation._core.colors.sequential import (
+    create_sequential_color_list,
+    get_sequential_color_list,
+    sequential_colors,
+    _cached_sequential_color_list,
+)
 import plotly.express as px
 
 
@@ -20,3 +25,33 @@ class CalloutTest(unittest.TestCase):
     def test_create_sequential_color_list_length_rgb(self):
         colors = create_sequential_color_list("rgb(0,0,0)", "rgb(255,255,255)", 6)
         self.assertEqual(len(colors), 6)
+
+    def test_get_sequential_color_list_is_cached(self):
+        _cached_sequential_color_list.cache_clear()
+        colors = get_sequential_color_list("reds", 5)
+        colors.append("rgb(0, 0, 0)")
+        self.assertEqual(get_sequential_color_list("reds", 5), colors[:5])
+        info = _cached_sequential_color_list.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+
+    def test_sequential_colors_view(self):
+        self.assertIn("reds", sequential_colors)
+        self.assertEqual(len(sequential_colors["reds"]), 10)
+        with self.assertRaises(KeyError):
+            sequential_colors["unknown"]
+
+    def test_create_sequential_color_list_same_for_all_inputs(self):
+        expected = [
+            "rgb(0.0, 0.0, 0.0)",
+            "rgb(127.5, 127.5, 127.5)",
+            "rgb(255.0, 255.0, 255.0)",
+        ]
+        self.assertEqual(
+            create_sequential_color_list("#000000", "#ffffff", 3), expected
+        )
+        self.assertEqual(
+            create_sequential_color_list((0, 0, 0), (255, 255, 255), 3), expected
+        )
+        self.assertEqual(
+            create_sequential_color_list("rgb(0,0,0)", "rgb(255,255,255)", 3), expected
+        )
@@ -1,5 +1,5 @@
 import unittest
-from plotly_presentation._core.colors.utils import _convert_to_rgb
+from plotly_presentation._core.colors.utils import _convert_to_rgb, PaletteView
 
 
 class TestConvertToRGB(unittest.TestCase):
@@ -20,3 +20,19 @@ class TestConvertToRGB(unittest.TestCase):
         expected_color = "rgb(0, 0, 0)"
         color = _convert_to_rgb(color=color)
         self.assertEqual(color, expected_color)
+
+
+class TestPaletteView(unittest.TestCase):
+    def test_lookup_is_lazy(self):
+        calls = []
+
+        def get_color_list(palette_name, n):
+            calls.append((palette_name, n))
+            return [palette_name] * n
+
+        view = PaletteView(lambda: {"a": [], "b": []}, get_color_list, n=3)
+        self.assertEqual(list(view), ["a", "b"])
+        self.assertEqual(len(view), 2)
+        self.assertEqual(calls, [])
+        self.assertEqual(view["b"], ["b", "b", "b"])
+        self.assertEqual(calls, [("b", 3)])
@@ -71,6 +71,53 @@ class TestAnalysis(unittest.TestCase):
         )
         self.assertIsInstance(self.analysis.figure, go.Figure)
 
+    def test_lazy_comparison_is_recorded(self):
+        analysis = Analysis(lazy=True)
+        df = pd.DataFrame({"Country": ["Germany", "France"], "Percentage": [90, 80]})
+        analysis.comparison.horisontal_stacked_bar_with_total(
+            df=df,
+            x="Percentage",
+            y="Country",
+            calculate_total=True,
+            total_formula="mean",
+        )
+        self.assertIsNone(analysis.figure)
+        self.assertEqual(analysis.plan.operations[0].target, "comparison")
+        self.assertIsInstance(analysis.materialize(), go.Figure)
+        self.assertEqual(len(analysis.plan), 0)
+
+    def test_lazy_comparison_with_style(self):
+        analysis = Analysis(lazy=True)
+        df = pd.DataFrame({"Country": ["Germany", "France"], "Percentage": [90, 80]})
+        analysis.comparison.horisontal_stacked_bar_with_total(
+            df=df,
+            x="Percentage",
+            y="Country",
+            calculate_total=True,
+            total_formula="mean",
+        )
+        analysis.style.set_title("Title")
+        figure = analysis.materialize()
+        self.assertIs(analysis.style.figure, figure)
+        self.assertIn("Title", figure.layout.title.text)
+
+    def test_batch_around_comparison(self):
+        analysis = Analysis()
+        df = pd.DataFrame({"Country": ["Germany", "France"], "Percentage": [90, 80]})
+        with analysis.batch():
+            analysis.comparison.horisontal_stacked_bar_with_total(
+                df=df,
+                x="Percentage",
+                y="Country",
+                calculate_total=True,
+                total_formula="mean",
+            )
+            analysis.style.set_title("Title")
+        self.assertIn("Title", analysis.figure.layout.title.text)
+        # The batch is flushed even when no chart has been created yet
+        with Analysis().batch() as empty:
+            empty.style.set_title("Title")
+
     def test_price_volume_wrapper(self):
         self.analysis.figure = None
         df = pd.DataFrame(
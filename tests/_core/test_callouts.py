@@ -1,8 +1,10 @@
 import unittest
 from plotly_presentation._core.plotter import Plotter
+from plotly_presentation._core.callouts import Callout
 import plotly.graph_objs as go
 import plotly.express as px
 import pandas as pd
+import numpy as np
 
 
 class CalloutTest(unittest.TestCase):
@@ -85,6 +87,40 @@ class CalloutTest(unittest.TestCase):
         line_annotation = p.figure.layout.annotations[0]
         self.assertEqual(line_annotation.x < 0.5, True)
 
+    def test_line_differences_texts_and_skipped_bars(self):
+        p = Plotter()
+        p.express(
+            type="bar",
+            x=["cat1", "cat2", "cat3", "cat4", "cat1", "cat2", "cat3"],
+            y=[2, 3, 1, 5, 1, 3, 0],
+            color=["a", "a", "a", "a", "b", "b", "b"],
+            barmode="group",
+        )
+        p.callout.add_line_differences(
+            primary_trace_name="a", text_type="difference", text_format=".0f"
+        )
+        # Equal bars and categories without a comparison bar are skipped
+        self.assertEqual(len(p.figure.layout.shapes), 2)
+        texts = [a.text for a in p.figure.layout.annotations if a.text]
+        self.assertEqual(texts, ["<b>1</b>", "<b>1</b>"])
+        self.assertEqual([s.y0 for s in p.figure.layout.shapes], [2, 1])
+
+    def test_line_differences_skip_missing_values(self):
+        p = Plotter()
+        p.express(
+            type="bar",
+            x=["cat1", "cat2", "cat3", "cat1", "cat2", "cat3"],
+            y=[2, np.nan, 3, 1, 3, np.nan],
+            color=["a", "a", "a", "b", "b", "b"],
+            barmode="group",
+        )
+        p.callout.add_line_differences(
+            primary_trace_name="a", text_type="difference", text_format=".0f"
+        )
+        self.assertEqual(len(p.figure.layout.shapes), 1)
+        texts = [a.text for a in p.figure.layout.annotations if a.text]
+        self.assertEqual(texts, ["<b>1</b>"])
+
     # Test circle highlights
     def test_circle_highlight_annotation_shape_count(self):
         p = Plotter()
@@ -106,6 +142,32 @@ class CalloutTest(unittest.TestCase):
         trace_count = len(p.figure.data)
         self.assertEqual(trace_count, 6)
 
+    def test_end_line_marker_webgl(self):
+        p = Plotter()
+        p.express(
+            type="line",
+            data_frame=self.df,
+            x="date",
+            y=["GOOG", "AAPL"],
+            render_mode="webgl",
+        )
+        p.callout.add_line_end_marker()
+        self.assertEqual([d.type for d in p.figure.data][2:], ["scatter", "scatter"])
+        self.assertEqual(p.figure.data[2].marker.color, p.figure.data[0].line.color)
+
+    def test_end_line_marker_avoid_overlap(self):
+        p = Plotter()
+        for i in range(5):
+            p.add_trace(go.Scatter(x=[0, 1], y=[0, 10 + i / 100], name=f"s{i}"))
+        p.callout.add_line_end_marker(text_type="category", avoid_overlap=True)
+        annotations = p.figure.layout.annotations
+        self.assertEqual([a.text for a in annotations], [f"s{i}" for i in range(5)])
+        self.assertEqual(len(p.figure.data), 10)
+        self.assertIsNone(p.figure.data[5].text)
+        # The labels are moved apart by at least the font height
+        shifts = sorted(-a.ay if a.showarrow else a.yshift for a in annotations)
+        self.assertGreaterEqual(min(np.diff(shifts)), 12)
+
     def test_end_line_marker_count_custom(self):
         p = Plotter()
         p.express(type="line", data_frame=self.df, x="date", y=["GOOG", "AAPL", "FB"])
@@ -228,6 +290,22 @@ class CalloutTest(unittest.TestCase):
         expected_center = 1
         self.assertEqual(actual_center, expected_center)
 
+    def test_get_center_point_follows_changed_categories(self):
+        p = Plotter()
+        p.add_trace(go.Bar(x=["a", "b", "c"], y=[1, 2, 3]))
+        self.assertEqual(p.callout._get_center_point(a="a", b="b"), 0.5)
+        # The index is reused until the figure changes
+        index = p.callout._get_axis_index()
+        self.assertIs(p.callout._get_axis_index(), index)
+        p.callout.add_circle_highlight(x="a", y=1)
+        self.assertIs(p.callout._get_axis_index(), index)
+        p.figure.data[0].x = ["c", "b", "a"]
+        self.assertEqual(p.callout._get_center_point(a="a", b="b"), 1.5)
+        p.figure.layout.xaxis.categoryarray = ["b", "a"]
+        self.assertEqual(p.callout._get_center_point(a="a", b="c"), 1.5)
+        p.figure.layout.xaxis.type = "date"
+        self.assertTrue(p.callout._get_axis_index()[0])
+
     def test_get_center_point_categorical_y(self):
         p = Plotter()
         p.express(
@@ -275,6 +353,24 @@ class CalloutTest(unittest.TestCase):
         expected_center = pd.to_datetime("2018-01-15 00:00:00")
         self.assertEqual(actual_center, expected_center)
 
+    def test_get_center_point_spans_all_traces(self):
+        p = Plotter()
+        p.add_trace(go.Bar(x=["cat1", "cat2"], y=[1, 2]))
+        self.assertEqual(p.callout._get_center_point(a="cat1", b="cat2"), 0.5)
+        # The index is rebuilt for the new trace
+        p.add_trace(go.Bar(x=["cat2", "cat3"], y=[1, 2]))
+        self.assertEqual(p.callout._get_center_point(a="cat1", b="cat3"), 1)
+        with self.assertRaises(ValueError):
+            p.callout._get_center_point(a="cat1", b="cat4")
+
+    def test_get_center_point_category_array(self):
+        p = Plotter()
+        p.add_trace(go.Bar(x=["cat1", "cat2", "cat3"], y=[1, 2, 3]))
+        p.figure.update_xaxes(
+            categoryorder="array", categoryarray=["cat3", "cat2", "cat1"]
+        )
+        self.assertEqual(p.callout._get_center_point(a="cat3", b="cat2"), 0.5)
+
     def test_valid_circle_shapes(self):
         p = Plotter()
         try:
@@ -401,3 +497,123 @@ class CalloutTest(unittest.TestCase):
 
         actual_annotations = len(p.figure.layout.annotations)
         self.assertEqual(actual_annotations, 2)
+
+    def test_default_styles_are_shared(self):
+        c1 = Callout(go.Figure())
+        c2 = Callout(go.Figure())
+        self.assertIs(c1._DEFAULT_CIRCLE_STYLE, c2._DEFAULT_CIRCLE_STYLE)
+        with self.assertRaises(TypeError):
+            c1._DEFAULT_LINE_STYLE["type"] = "rect"
+
+    def test_line_differences_does_not_change_arrow_style(self):
+        p = Plotter()
+        p.express(
+            type="bar", x=["cat1", "cat1"], y=[1, 3], color=["a", "b"], barmode="group"
+        )
+        p.callout.add_line_differences(primary_trace_name="b")
+        self.assertEqual(p.callout._DEFAULT_ARROW_STYLE["xref"], "x")
+
+    def test_add_many_matches_single_callouts(self):
+        callouts = pd.DataFrame(
+            {
+                "x": ["a", "b"],
+                "y": [1, 2],
+                "text": ["+1%", None],
+                "opacity": [0.5, None],
+            }
+        )
+        p = Plotter()
+        p.add_trace(go.Bar(x=["a", "b"], y=[1, 2]))
+        p.callout.add_many(callouts, kind="circle_highlight")
+
+        expected = Plotter()
+        expected.add_trace(go.Bar(x=["a", "b"], y=[1, 2]))
+        expected.callout.add_circle_highlight(x="a", y=1, text="+1%", opacity=0.5)
+        expected.callout.add_circle_highlight(x="b", y=2)
+        self.assertEqual(p.figure.layout.shapes, expected.figure.layout.shapes)
+        self.assertEqual(
+            p.figure.layout.annotations, expected.figure.layout.annotations
+        )
+
+    def test_add_many_growth_lines(self):
+        callouts = pd.DataFrame(
+            {"x0": ["a", "b"], "x1": ["c", "d"], "y0": [1, 2], "y1": [3, 4]}
+        )
+        p = Plotter()
+        p.add_trace(go.Bar(x=["a", "b", "c", "d"], y=[1, 2, 3, 4]))
+        p.callout.add_many(callouts, kind="square_growth_line", y_top=5, text="x")
+        self.assertEqual(len(p.figure.layout.shapes), 8)
+        self.assertEqual([a.x for a in p.figure.layout.annotations], [1.0, 2.0])
+
+    def test_circle_highlight_marker_backend(self):
+        p = Plotter()
+        p.callout.add_circle_highlight(x=0, y=0, text="+1%", backend="marker")
+        marker = p.figure.data[0]
+        radius = p.callout._DEFAULT_CIRCLE_SIZE.get("circular_radius")
+        self.assertEqual(list(marker.marker.size), [2 * radius])
+        self.assertEqual(list(marker.text), ["+1%"])
+        self.assertEqual(
+            marker.marker.line.color, p.callout._DEFAULT_CIRCLE_STYLE["line"]["color"]
+        )
+        self.assertEqual(len(p.figure.layout.shapes), 0)
+        # Markers are always round, so ovals stay shapes
+        p.callout.add_circle_highlight(x=1, y=1, shape_form="oval", backend="marker")
+        self.assertEqual(len(p.figure.data), 1)
+        self.assertEqual(len(p.figure.layout.shapes), 1)
+        with self.assertRaises(ValueError):
+            p.callout.add_circle_highlight(x=0, y=0, backend="svg")
+
+    def test_add_many_marker_backend(self):
+        callouts = pd.DataFrame(
+            {"x": [0, 1, 2], "y": [1, 2, 3], "text": ["a", None, "c"]}
+        )
+        p = Plotter()
+        p.callout.add_many(
+            callouts, kind="circle_highlight", backend="marker", marker_opacity=0.5
+        )
+        self.assertEqual(len(p.figure.data), 1)
+        self.assertEqual(list(p.figure.data[0].text), ["a", None, "c"])
+        self.assertEqual(p.figure.data[0].marker.opacity, 0.5)
+        with self.assertRaises(ValueError):
+            p.callout.add_many(
+                callouts.assign(opacity=0.5), kind="circle_highlight", backend="marker"
+            )
+
+    def test_marker_backend_is_not_chart_data(self):
+        p = Plotter()
+        p.add_trace(go.Scatter(x=[0, 1], y=[1, 2], name="a"))
+        p.callout.add_circle_highlight(x=1, y=2, text="+1%", backend="marker")
+        p.add_trace(go.Scatter(x=[0, 1], y=[2, 3], name="b"))
+        p.callout.add_line_end_marker(text_type="category")
+        texts = [d.text[0] for d in p.figure.data if d.mode == "markers+text"]
+        self.assertNotIn("circle_highlights", texts)
+        self.assertEqual(len(p.figure.data), 5)
+        p.style.set_color_palette(palette_type="sequential", palette_name="reds")
+        (marker,) = p.figure.select_traces(selector={"name": "circle_highlights"})
+        self.assertEqual(
+            marker.marker.color, p.callout._DEFAULT_CIRCLE_STYLE["fillcolor"]
+        )
+        p.consolidate_traces()
+        self.assertIn("circle_highlights", [d.name for d in p.figure.data])
+
+        bars = Plotter()
+        bars.express(
+            type="bar", x=["c1", "c1"], y=[1, 3], color=["a", "b"], barmode="group"
+        )
+        bars.callout.add_circle_highlight(x="c1", y=3, backend="marker")
+        bars.callout.add_line_differences(primary_trace_name="b")
+        self.assertEqual(len(bars.figure.layout.shapes), 1)
+
+    def test_marker_backend_keeps_colorway_positions(self):
+        for p in [Plotter(), Plotter(fast=True, validate=False)]:
+            p.add_trace(go.Scatter(x=[0, 1], y=[1, 2], name="a"))
+            p.callout.add_circle_highlight(x=1, y=2, backend="marker")
+            p.add_trace(go.Scatter(x=[0, 1], y=[2, 3], name="b"))
+            # plotly colors traces by position, so "b" keeps the second color
+            names = [d["name"] for d in p.to_dict()["data"]]
+            self.assertEqual(names, ["a", "b", "circle_highlights"])
+
+    def test_add_many_invalid_kind(self):
+        p = Plotter()
+        with self.assertRaises(ValueError):
+            p.callout.add_many(pd.DataFrame({"x": [0], "y": [0]}), kind="arrow")
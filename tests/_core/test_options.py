@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from plotly_presentation._core.options import Options
+
+
+class OptionsCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.config_dir = Path(self.tmp_dir.name)
+        self.config_path = self.config_dir / "colors_config.yaml"
+        self.config_path.write_text("color_list:\n  - '#000000'\n")
+        with mock.patch.dict(os.environ, {"PLOTLY_CONFIG_DIR": str(self.config_dir)}):
+            self.options = Options()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_parsed_once(self):
+        first = self.options.get_option("config.colors")
+        second = self.options.get_option("config.colors")
+        self.assertIs(first, second)
+        info = self.options.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1))
+
+    def test_invalidated_when_file_changes(self):
+        first = self.options.get_option("config.colors")
+        self.config_path.write_text("color_list:\n  - '#000000'\n  - '#ffffff'\n")
+        second = self.options.get_option("config.colors")
+        self.assertEqual(first["color_list"], ("#000000",))
+        self.assertEqual(second["color_list"], ("#000000", "#ffffff"))
+        self.assertEqual(self.options.cache_info().misses, 2)
+
+    def test_cached_value_is_read_only(self):
+        config = self.options.get_option("config.colors")
+        with self.assertRaises(TypeError):
+            config["color_list"] = []
+        with self.assertRaises(AttributeError):
+            config["color_list"].append("#ffffff")
+
+    def test_falls_back_to_default_config(self):
+        layout = self.options.get_option("config.layout")
+        self.assertIn("xaxis", layout)
+        self.assertIs(layout, self.options.get_option("config.layout"))
+
+    def test_cache_clear(self):
+        self.options.get_option("config.colors")
+        self.options.cache_clear()
+        self.assertEqual(tuple(self.options.cache_info()), (0, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import pickle
+import unittest
+import plotly.graph_objects as go
+from plotly_presentation._core.plan import FigurePlan, Operation
+from plotly_presentation._core.plotter import Plotter
+
+
+class FigurePlanTests(unittest.TestCase):
+    def test_lazy_plotter_records_operations(self):
+        p = Plotter(lazy=True)
+        figure = p.add_trace(go.Bar(x=["a"], y=[1]))
+        p.style.set_title("Title")
+        p.callout.add_circle_highlight(x="a", y=1, text="1")
+        self.assertEqual(len(figure.data), 0)
+        self.assertEqual(
+            [(op.target, op.method) for op in p.plan.operations],
+            [
+                ("plotter", "add_trace"),
+                ("style", "set_title"),
+                ("callout", "add_circle_highlight"),
+            ],
+        )
+
+    def test_materialize_runs_plan_once(self):
+        p = Plotter(lazy=True)
+        p.add_trace(go.Bar(x=["a", "b"], y=[1, 2]))
+        p.style.set_title("Title")
+        p.callout.add_circle_highlight(x="a", y=1, text="1")
+        figure = p.materialize()
+        self.assertEqual(len(figure.data), 1)
+        self.assertEqual(figure.layout.title.text, "Title")
+        self.assertEqual(len(figure.layout.shapes), 1)
+        self.assertEqual(len(p.plan), 0)
+        # Operations recorded afterwards are applied to the same figure
+        p.callout.add_circle_highlight(x="b", y=2, text="2")
+        self.assertEqual(len(p.materialize().layout.shapes), 2)
+
+    def test_optimize_drops_work_before_new_figure(self):
+        plan = FigurePlan()
+        plan.record("plotter", "add_trace", (go.Bar(),), {})
+        plan.record("style", "set_title", ("Old",), {})
+        plan.record("plotter", "express", (), {"type": "bar"})
+        plan.record("style", "set_title", ("New",), {})
+        self.assertEqual(
+            plan.optimize().operations,
+            [
+                Operation("plotter", "express", (), {"type": "bar"}),
+                Operation("style", "set_title", ("New",), {}),
+            ],
+        )
+
+    def test_optimize_drops_superseded_layout_calls(self):
+        plan = FigurePlan()
+        plan.record("style", "set_title", ("First",), {})
+        plan.record("style", "set_legend", (), {"position": "top"})
+        plan.record("style", "set_legend", (), {"position": "bottom"})
+        plan.record("style", "set_legend", (), {"position": "top"})
+        plan.record("style", "set_title", ("Second",), {})
+        self.assertEqual(
+            [op.args or op.kwargs for op in plan.optimize().operations],
+            [{"position": "bottom"}, {"position": "top"}, ("Second",)],
+        )
+
+    def test_optimize_merges_trace_additions(self):
+        traces = [go.Bar(x=["a"], y=[i]) for i in range(3)]
+        plan = FigurePlan()
+        plan.record("plotter", "add_trace", (traces[0],), {})
+        plan.record("plotter", "add_traces", (traces[1:],), {})
+        plan.record("plotter", "add_trace", (go.Bar(),), {"row": 1, "col": 1})
+        operations = plan.optimize().operations
+        self.assertEqual(
+            operations[0], Operation("plotter", "add_traces", (traces,), {})
+        )
+        self.assertEqual(operations[1].method, "add_trace")
+
+    def test_optimized_plan_gives_same_figure(self):
+        def build(p):
+            p.add_trace(go.Scatter(x=[0, 1], y=[0, 1], name="a"))
+            p.express(type="line", x=[0, 1, 2], y=[1, 2, 3])
+            p.style.set_title("One")
+            p.add_trace(go.Scatter(x=[0, 1], y=[2, 1], name="b"))
+            p.style.set_legend(position="bottom")
+            p.style.set_title("Two")
+            p.callout.add_circle_highlight(x=1, y=2, text="+1")
+            return p.to_dict()
+
+        self.assertEqual(build(Plotter(lazy=True)), build(Plotter()))
+
+    def test_plan_can_be_cached_and_replayed(self):
+        p = Plotter(lazy=True)
+        p.add_trace(go.Bar(x=["a", "b"], y=[1, 2]))
+        p.style.set_title("Title")
+        plan = pickle.loads(pickle.dumps(p.plan.optimize()))
+        other = Plotter()
+        plan.execute(other)
+        self.assertEqual(other.to_dict(), p.to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,10 @@
 import unittest
+import numpy as np
+import pandas as pd
 from plotly_presentation._core.plotter import Plotter
 import plotly.graph_objs as go
 from plotly.subplots import make_subplots
+from plotly_presentation._core.options import options
 
 
 class PlotterTests(unittest.TestCase):
@@ -37,6 +40,193 @@ class PlotterTests(unittest.TestCase):
         p.add_trace(go.Bar(x=[1], y=[1]), row=1, col=2)
         self.assertEqual(p.figure.data[-1].xaxis, "x2")
 
+    def test_add_trace_reuses_callout_and_style(self):
+        p = Plotter()
+        callout, style = p.callout, p.style
+        misses = options.cache_info().misses
+        for i in range(50):
+            p.add_trace(go.Scatter(x=[0, 1], y=[i, i + 1]))
+        self.assertIs(p.callout, callout)
+        self.assertIs(p.style, style)
+        self.assertEqual(options.cache_info().misses, misses)
+
+    def test_express_rebinds_callout_and_style(self):
+        p = Plotter(slide_layout="slide_50%")
+        callout = p.callout
+        p.express(type="bar", x=[1, 2, 3], y=[1, 2, 3])
+        self.assertIs(p.callout, callout)
+        self.assertIs(p.callout.figure, p.figure)
+        self.assertIs(p.style.figure, p.figure)
+        self.assertEqual(p.figure.layout.width, 480)
+
+    def test_waterfall_figure_is_styled(self):
+        fig = go.Figure(go.Waterfall(x=["a", "b"], y=[1, -1]))
+        p = Plotter(figure=fig)
+        self.assertIsNotNone(p.figure.data[0].increasing.marker.color)
+
+    def test_to_dict_only_includes_used_template_sections(self):
+        p = Plotter()
+        p.add_trace(go.Bar(x=[1, 2, 3], y=[1, 2, 3]))
+        template_layout = p.to_dict()["layout"]["template"]["layout"]
+        self.assertNotIn("geo", template_layout)
+        self.assertIn("bargap", template_layout)
+        self.assertIn('"bargap"', p.to_json())
+
+    def test_export_keeps_the_full_template(self):
+        p = Plotter()
+        p.add_trace(go.Bar(x=[1], y=[1]))
+        self.assertNotIn("geo", p.to_dict()["layout"]["template"]["layout"])
+        p.to_json()
+        p.add_trace(go.Scattergeo(lat=[1], lon=[1]))
+        self.assertEqual(p.figure.layout.template.layout.geo.landcolor, "white")
+        self.assertIn("geo", p.to_dict()["layout"]["template"]["layout"])
+
+    def test_add_traces(self):
+        p = Plotter()
+        traces = [go.Scatter(x=[0, 1], y=[i, i + 1], name=str(i)) for i in range(20)]
+        figure = p.add_traces(traces)
+        self.assertIs(figure, p.figure)
+        self.assertEqual([d.name for d in p.figure.data], [str(i) for i in range(20)])
+        self.assertEqual(p.figure.layout.width, 960)
+
+    def test_add_traces_to_subplots(self):
+        p = Plotter(figure=make_subplots(rows=1, cols=2))
+        p.add_traces([go.Bar(x=[1], y=[1]), go.Bar(x=[1], y=[2])], rows=1, cols=[1, 2])
+        self.assertEqual([d.xaxis for d in p.figure.data], ["x", "x2"])
+
+    def test_add_traces_waterfall(self):
+        p = Plotter()
+        p.add_traces([go.Waterfall(x=["a", "b"], y=[1, -1])])
+        self.assertIsNotNone(p.figure.data[0].increasing.marker.color)
+
+    def test_batch_defers_layout_updates(self):
+        p = Plotter()
+        p.add_trace(go.Bar(x=["a", "b", "c"], y=[1, 2, 3]))
+        with p.batch():
+            p.style.set_title("Title")
+            p.callout.add_circle_highlight(x="a", y=1, text="1")
+            self.assertIsNone(p.figure.layout.title.text)
+            self.assertEqual(len(p.figure.layout.shapes), 0)
+        self.assertEqual(p.figure.layout.title.text, "Title")
+        self.assertEqual(len(p.figure.layout.shapes), 1)
+        self.assertEqual(len(p.figure.layout.annotations), 1)
+
+    def test_batch_keeps_shape_order(self):
+        p = Plotter()
+        p.add_trace(go.Bar(x=["a", "b", "c"], y=[1, 2, 3]))
+        p.callout.add_circle_highlight(x="a", y=1, text="0")
+        with p.batch():
+            with p.batch():
+                for i in range(1, 4):
+                    p.callout.add_circle_highlight(x="a", y=i, text=str(i))
+            self.assertEqual(len(p.figure.layout.annotations), 1)
+        self.assertEqual(
+            [a.text for a in p.figure.layout.annotations], ["0", "1", "2", "3"]
+        )
+        self.assertEqual([s.yanchor for s in p.figure.layout.shapes], [1, 1, 2, 3])
+
+    def test_batch_flushes_on_figure_change(self):
+        p = Plotter()
+        old_figure = p.figure
+        with p.batch():
+            p.style.set_title("Old")
+            p.express(type="bar", x=["a"], y=[1])
+            p.style.set_title("New")
+        self.assertEqual(old_figure.layout.title.text, "Old")
+        self.assertEqual(p.figure.layout.title.text, "New")
+
+    def test_fast_mode_collects_until_materialized(self):
+        p = Plotter(fast=True)
+        p.add_trace({"type": "scatter", "x": [0, 1], "y": [1, 2], "name": "a"})
+        p.add_trace(go.Scatter(x=[0, 1], y=[2, 1], name="b"))
+        p.callout.add_circle_highlight(x=1, y=1, text="1")
+        self.assertEqual(len(p.figure.data), 0)
+        figure = p.materialize()
+        self.assertEqual([d.name for d in figure.data], ["a", "b"])
+        self.assertEqual(len(figure.layout.shapes), 1)
+
+    def test_fast_mode_reads_pending_traces(self):
+        p = Plotter(fast=True)
+        p.add_trace({"type": "scatter", "x": [0, 1], "y": [1, 2], "name": "a"})
+        p.callout.add_line_end_marker(text_type="value")
+        self.assertEqual(len(p.figure.data), 2)
+
+    def test_fast_mode_without_validation(self):
+        p = Plotter(fast=True, validate=False)
+        x = np.arange(3)
+        p.add_trace({"type": "scatter", "x": x, "y": x, "name": "a"})
+        p.style.set_title("Title")
+        figure = p.to_dict()
+        self.assertIs(figure["data"][0]["x"], x)
+        self.assertEqual(figure["layout"]["title"]["text"], "Title")
+        self.assertNotIn("geo", figure["layout"]["template"]["layout"])
+        self.assertEqual(len(p.figure.data), 0)
+        self.assertIn('"Title"', p.to_json())
+
+    def test_fast_mode_prepares_trace_dicts(self):
+        p = Plotter(fast=True, validate=False, slide_layout="slide_50%")
+        x = np.arange(60_000)
+        p.add_trace({"type": "scatter", "x": x, "y": x, "name": "a"}, downsample=False)
+        p.add_trace({"x": x, "y": np.sin(x / 1000), "name": "b"}, downsample=True)
+        data = p.to_dict()["data"]
+        self.assertEqual(data[0]["type"], "scattergl")
+        self.assertIs(data[0]["x"], x)
+        self.assertLessEqual(len(data[1]["y"]), 2 * 480 + 2)
+
+    def test_large_scatter_is_drawn_with_webgl(self):
+        p = Plotter()
+        x = np.arange(60_000)
+        p.add_trace(go.Scatter(x=x, y=x, name="large"), downsample=False)
+        p.add_trace(go.Scatter(x=[0, 1], y=[0, 1], name="small"))
+        self.assertEqual([d.type for d in p.figure.data], ["scattergl", "scatter"])
+        p.express(type="line", x=x, y=x, downsample=False)
+        self.assertEqual(p.figure.data[0].type, "scattergl")
+
+    def test_line_is_downsampled_to_slide_width(self):
+        x = np.arange(100_000)
+        y = np.sin(x / 1000)
+        y[12_345] = 5
+        p = Plotter(slide_layout="slide_50%")
+        p.add_trace(go.Scatter(x=x, y=y, name="full"))
+        self.assertEqual(len(p.figure.data[0].y), 100_000)
+        p.add_trace(go.Scatter(x=x, y=y, name="line"), downsample=True)
+        self.assertEqual(p.figure.data[1].type, "scatter")
+        self.assertLessEqual(len(p.figure.data[1].y), 2 * 480 + 2)
+        self.assertEqual(max(p.figure.data[1].y), 5)
+
+        p.express(type="line", x=x, y=y)
+        self.assertEqual(len(p.figure.data[0].y), 100_000)
+        p.express(type="line", x=x, y=y, downsample="minmax")
+        self.assertLessEqual(len(p.figure.data[0].y), 2 * 480 + 2)
+        self.assertEqual(max(p.figure.data[0].y), 5)
+
+    def test_express_bar_aggregate(self):
+        df = pd.DataFrame(
+            {"month": ["Jan", "Feb"] * 50, "region": ["A"] * 60 + ["B"] * 40, "v": 1}
+        )
+        p = Plotter()
+        p.express(
+            type="bar", data_frame=df, x="month", y="v", color="region", aggregate="sum"
+        )
+        self.assertEqual([list(d.y) for d in p.figure.data], [[30, 30], [20, 20]])
+        self.assertEqual(p.aggregate_factor, 25.0)
+        p.express(type="bar", data_frame=df, x="month", y="v")
+        self.assertIsNone(p.aggregate_factor)
+        with self.assertRaises(ValueError):
+            p.express(type="line", data_frame=df, x="month", y="v", aggregate="sum")
+
+    def test_consolidate_traces(self):
+        p = Plotter()
+        for i in range(50):
+            p.add_trace(go.Scatter(x=[0, 1], y=[i, i + 1], line_color="#cccccc"))
+        p.add_trace(go.Scatter(x=[0, 1], y=[0, 2], name="highlight"))
+        with self.assertLogs("plotly_presentation", level="INFO") as logs:
+            p.consolidate_traces()
+        self.assertEqual(len(p.figure.data), 2)
+        self.assertEqual(len(p.figure.data[0].y), 150)
+        self.assertEqual(p.figure.data[1].name, "highlight")
+        self.assertIn("Consolidated 51 traces into 2", logs.output[0])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from plotly_presentation._core import options as options_module
+from plotly_presentation._core.options import Options
+from plotly_presentation._core.snapshot import (
+    SNAPSHOT_FILENAME,
+    compile_snapshot,
+    read_snapshot,
+)
+
+
+class SnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.config_dir = Path(self.tmp_dir.name)
+        self.config_path = self.config_dir / "colors_config.yaml"
+        self.config_path.write_text("color_list:\n  - '#000000'\n")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _options(self):
+        with mock.patch.dict(os.environ, {"PLOTLY_CONFIG_DIR": str(self.config_dir)}):
+            return Options()
+
+    def test_compile_snapshot(self):
+        snapshot_path = compile_snapshot(self.config_dir)
+        self.assertEqual(snapshot_path, self.config_dir / SNAPSHOT_FILENAME)
+        entries = read_snapshot(self.config_dir)
+        self.assertEqual(list(entries), ["colors_config.yaml"])
+        self.assertEqual(
+            entries["colors_config.yaml"]["data"]["color_list"], ["#000000"]
+        )
+
+    def test_options_use_snapshot(self):
+        compile_snapshot(self.config_dir)
+        with mock.patch.object(options_module, "parse_yaml") as parse_yaml:
+            config = self._options().get_option("config.colors")
+        parse_yaml.assert_not_called()
+        self.assertEqual(config["color_list"], ("#000000",))
+
+    def test_stale_snapshot_is_ignored(self):
+        compile_snapshot(self.config_dir)
+        self.config_path.write_text("color_list:\n  - '#ffffff'\n")
+        config = self._options().get_option("config.colors")
+        self.assertEqual(config["color_list"], ("#ffffff",))
+
+    def test_corrupt_snapshot_is_ignored(self):
+        (self.config_dir / SNAPSHOT_FILENAME).write_bytes(b"not a pickle")
+        self.assertEqual(read_snapshot(self.config_dir), {})
+        config = self._options().get_option("config.colors")
+        self.assertEqual(config["color_list"], ("#000000",))
+
+    def test_theme_compile_command(self):
+        from plotly_presentation.theme import main
+
+        with mock.patch("builtins.print"):
+            self.assertEqual(main(["compile", str(self.config_dir)]), 0)
+        self.assertTrue((self.config_dir / SNAPSHOT_FILENAME).is_file())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,19 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
+from pathlib import Path
+import plotly.io as pio
 from plotly_presentation._core.plotter import Plotter
 from plotly_presentation._core.colors import SequentialColor, DivergentColor
-from plotly_presentation._core.style import Style
+from plotly_presentation._core.style import (
+    Style,
+    get_template,
+    get_figure_subplots,
+    slim_template,
+)
 import plotly.graph_objects as go
 import plotly.express as px
 
@@ -439,3 +451,103 @@ class StyleTest(unittest.TestCase):
         self.assertEqual(title.text, "Stock Prices")
         self.assertIsNotNone(title.subtitle)
         self.assertEqual(title.subtitle.text, None)
+
+
+_TEMPLATE_PROBE = """
+import json
+import plotly.io as pio
+import plotly.graph_objects as go
+default = pio.templates.default
+from plotly_presentation._core import style
+after_import = pio.templates.default
+from plotly_presentation._core.plotter import Plotter
+passed = Plotter(figure=go.Figure(go.Bar(x=[1], y=[1])))
+dark = Plotter(figure=go.Figure(layout={"template": "plotly_dark"}))
+explicit = Plotter(figure=go.Figure(layout={"template": default}))
+blank = go.Figure()
+blank.layout.template = None
+unset = Plotter(figure=blank)
+p = Plotter()
+print(json.dumps({
+    "passed_bargap": passed.figure.layout.template.layout.bargap,
+    "dark_bgcolor": dark.figure.layout.template.layout.paper_bgcolor,
+    "explicit_kept": explicit.figure.layout.template == pio.templates[default],
+    "unset_bargap": unset.figure.layout.template.layout.bargap,
+    "default": default,
+    "after_import": after_import,
+    "after_plotter": pio.templates.default,
+    "figure_bargap": p.figure.layout.template.layout.bargap,
+}))
+"""
+
+
+class TemplateTest(unittest.TestCase):
+    def _run_probe(self, env=None):
+        output = subprocess.run(
+            [sys.executable, "-c", _TEMPLATE_PROBE],
+            check=True,
+            capture_output=True,
+            text=True,
+            env={**os.environ, **(env or {})},
+        ).stdout
+        return json.loads(output.strip().splitlines()[-1])
+
+    def test_template_is_cached(self):
+        self.assertIs(get_template(), get_template())
+
+    def test_template_without_subplots(self):
+        template = get_template(subplots=[])
+        self.assertIsNone(template.layout.geo.landcolor)
+        self.assertEqual(template.layout.bargap, 0.2)
+        self.assertEqual(get_template().layout.geo.landcolor, "white")
+
+    def test_figure_subplots(self):
+        figure = go.Figure([go.Bar(x=[1], y=[1]), go.Scattergeo(lat=[1], lon=[1])])
+        self.assertEqual(get_figure_subplots(figure), frozenset(["geo"]))
+
+    def test_slim_template(self):
+        p = Plotter()
+        p.add_trace(go.Bar(x=[1, 2], y=[1, 2]))
+        slim_template(p.figure)
+        self.assertIsNone(p.figure.layout.template.layout.scene.xaxis.gridcolor)
+        self.assertEqual(p.figure.layout.template.layout.bargap, 0.2)
+
+        p.add_trace(go.Scatterpolar(r=[1, 2], theta=[0, 90]))
+        slim_template(p.figure)
+        self.assertIsNotNone(p.figure.layout.template.layout.polar.radialaxis.ticks)
+        self.assertIsNone(p.figure.layout.template.layout.scene.xaxis.gridcolor)
+
+    def test_slim_template_ignores_other_templates(self):
+        figure = go.Figure(go.Bar(x=[1], y=[1]), layout={"template": "plotly_dark"})
+        slim_template(figure)
+        self.assertEqual(
+            figure.layout.template,
+            go.Figure(layout={"template": "plotly_dark"}).layout.template,
+        )
+
+    def test_template_registered_on_first_figure(self):
+        result = self._run_probe()
+        self.assertEqual(result["after_import"], result["default"])
+        self.assertEqual(result["after_plotter"], "presentation_layout")
+        self.assertEqual(result["figure_bargap"], 0.2)
+
+    def test_passed_in_figure_gets_template(self):
+        result = self._run_probe()
+        self.assertEqual(result["passed_bargap"], 0.2)
+        # A figure with its own template keeps it
+        self.assertEqual(
+            result["dark_bgcolor"],
+            pio.templates["plotly_dark"].layout.paper_bgcolor,
+        )
+        # Once registered, the plotly default template was chosen explicitly
+        self.assertTrue(result["explicit_kept"])
+        self.assertEqual(result["unset_bargap"], 0.2)
+
+    def test_opt_out_of_global_default(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            Path(tmp_dir, "theme_settings_config.yaml").write_text(
+                "set_default_template: False\n"
+            )
+            result = self._run_probe({"PLOTLY_CONFIG_DIR": tmp_dir})
+        self.assertEqual(result["after_plotter"], result["default"])
+        self.assertEqual(result["figure_bargap"], 0.2)
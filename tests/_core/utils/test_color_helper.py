@@ -0,0 +1,42 @@
+import unittest
+import numpy as np
+from plotly_presentation._core.utils.color_helper import (
+    adjust_color_brightness,
+    adjust_colors_brightness,
+)
+
+
+class AdjustColorsBrightnessTest(unittest.TestCase):
+    def test_matches_single_color_function(self):
+        colors = ["#D73809", "60748d", "#000000", "#FFFFFF", "#7f7f7f"]
+        levels = [-5, -1, 5, 3, 0]
+        expected = [adjust_color_brightness(c, l) for c, l in zip(colors, levels)]
+        self.assertEqual(adjust_colors_brightness(colors, levels), expected)
+
+    def test_single_level_for_all_colors(self):
+        colors = [(215, 56, 9), (96, 116, 141)]
+        expected = [adjust_color_brightness(c, 2) for c in colors]
+        self.assertEqual(adjust_colors_brightness(colors, 2), expected)
+
+    def test_array_input(self):
+        rgb = np.array([[215, 56, 9], [250, 250, 250]])
+        self.assertEqual(adjust_colors_brightness(rgb, [1, 1]), ["#ED3E0A", "#FFFFFF"])
+
+    def test_empty_input(self):
+        self.assertEqual(adjust_colors_brightness([], 1), [])
+
+    def test_invalid_level(self):
+        with self.assertRaises(ValueError):
+            adjust_colors_brightness(["#D73809"], 6)
+        with self.assertRaises(ValueError):
+            adjust_colors_brightness(["#D73809"], 1.5)
+
+    def test_invalid_hex(self):
+        with self.assertRaises(ValueError):
+            adjust_colors_brightness(["#D7380"], 1)
+        with self.assertRaises(ValueError):
+            adjust_colors_brightness(["#D7380G"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,7 @@
+import copy
+import pickle
 import unittest
-from plotly_presentation._core.utils.dict_funcs import update_dict
+from plotly_presentation._core.utils.dict_funcs import update_dict, freeze, FrozenDict
 
 
 class UpdateDictTest(unittest.TestCase):
@@ -19,3 +21,31 @@ class UpdateDictTest(unittest.TestCase):
         d1 = update_dict(existing_dict, new_values)
         d2 = update_dict(new_values, existing_dict)
         self.assertEqual(d1, d2)
+
+
+class FreezeTest(unittest.TestCase):
+    def test_nested_values_are_frozen(self):
+        frozen = freeze({"col": {"col1": "a"}, "var": [1, {"a": 1}]})
+        self.assertIsInstance(frozen, FrozenDict)
+        self.assertIsInstance(frozen["col"], FrozenDict)
+        self.assertEqual(frozen["var"], (1, {"a": 1}))
+        with self.assertRaises(TypeError):
+            frozen["col"]["col1"] = "aa"
+        with self.assertRaises(TypeError):
+            frozen.update({"new": 1})
+
+    def test_copies_are_mutable(self):
+        frozen = freeze({"col": {"col1": "a"}})
+        copied = copy.deepcopy(frozen)
+        copied["col"]["col1"] = "aa"
+        self.assertEqual(type(copied), dict)
+        self.assertEqual(frozen["col"]["col1"], "a")
+
+    def test_pickle(self):
+        frozen = freeze({"col": {"col1": "a"}})
+        self.assertEqual(pickle.loads(pickle.dumps(frozen)), frozen)
+
+    def test_update_dict_does_not_mutate_frozen_source(self):
+        frozen = freeze({"col": {"col1": "a"}})
+        new_dict = update_dict({"col": {"col2": "b"}}, frozen)
+        self.assertEqual(new_dict, {"col": {"col1": "a", "col2": "b"}})
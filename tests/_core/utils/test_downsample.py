@@ -0,0 +1,102 @@
+import unittest
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly_presentation._core.utils.downsample import (
+    downsample_indices,
+    lttb_indices,
+    minmax_indices,
+)
+from plotly_presentation._core.utils.trace_helper import downsample_trace
+
+
+class DownsampleIndicesTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.x = np.arange(10_000, dtype=float)
+        self.y = rng.normal(size=10_000).cumsum()
+
+    def test_lttb_keeps_first_and_last(self):
+        indices = lttb_indices(self.x, self.y, 100)
+        self.assertEqual(len(indices), 100)
+        self.assertEqual(indices[0], 0)
+        self.assertEqual(indices[-1], 9_999)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+
+    def test_lttb_picks_spike(self):
+        y = np.zeros(1_000)
+        y[500] = 1
+        self.assertIn(500, lttb_indices(np.arange(1_000), y, 10))
+
+    def test_minmax_keeps_bucket_extremes(self):
+        indices = minmax_indices(self.y, 100)
+        self.assertLessEqual(len(indices), 102)
+        buckets = np.array_split(np.arange(10_000), 50)
+        for bucket in buckets:
+            self.assertIn(bucket[np.argmax(self.y[bucket])], indices)
+            self.assertIn(bucket[np.argmin(self.y[bucket])], indices)
+
+    def test_extremes_are_kept(self):
+        for method in ["lttb", "minmax"]:
+            indices = downsample_indices(self.x, self.y, 50, method=method)
+            self.assertIn(np.argmax(self.y), indices)
+            self.assertIn(np.argmin(self.y), indices)
+
+    def test_short_input_is_kept(self):
+        np.testing.assert_array_equal(
+            downsample_indices(self.x[:10], self.y[:10], 50), np.arange(10)
+        )
+
+    def test_invalid_method(self):
+        with self.assertRaises(ValueError):
+            downsample_indices(self.x, self.y, 50, method="mean")
+
+
+class DownsampleTraceTest(unittest.TestCase):
+    def test_point_properties_are_reduced(self):
+        x = pd.date_range("2024-01-01", periods=5_000, freq="min").to_numpy()
+        y = np.sin(np.arange(5_000) / 100)
+        trace = go.Scatter(
+            x=x,
+            y=y,
+            text=[str(i) for i in range(5_000)],
+            marker={"color": np.arange(5_000), "line": {"width": 1}},
+            line={"color": "#D73809"},
+            name="a",
+        )
+        reduced = downsample_trace(trace, 100)
+        self.assertLessEqual(len(reduced.y), 102)
+        self.assertEqual(len(reduced.x), len(reduced.y))
+        self.assertEqual(len(reduced.text), len(reduced.y))
+        self.assertEqual(len(reduced.marker.color), len(reduced.y))
+        self.assertEqual(reduced.marker.line.width, 1)
+        self.assertEqual(reduced.line.color, "#D73809")
+        self.assertEqual(reduced.text[5], str(int(reduced.marker.color[5])))
+        # The original trace is untouched
+        self.assertEqual(len(trace.marker.color), 5_000)
+
+    def test_trace_dicts_are_reduced(self):
+        y = np.sin(np.arange(5_000) / 100)
+        trace = {"y": y, "marker": {"color": np.arange(5_000)}, "name": "a"}
+        reduced = downsample_trace(trace, 100)
+        self.assertIsInstance(reduced, dict)
+        self.assertLessEqual(len(reduced["y"]), 102)
+        self.assertEqual(len(reduced["marker"]["color"]), len(reduced["y"]))
+        self.assertEqual(reduced["name"], "a")
+        self.assertEqual(len(trace["marker"]["color"]), 5_000)
+        markers = {"type": "scatter", "y": y, "mode": "markers"}
+        self.assertIs(downsample_trace(markers, 100), markers)
+
+    def test_traces_which_can_not_be_reduced(self):
+        y = np.arange(5_000, dtype=float)
+        unsorted = go.Scatter(x=y[::-1], y=y)
+        markers = go.Scatter(y=y, mode="markers")
+        stacked = go.Scatter(y=y, stackgroup="one")
+        missing = go.Scatter(y=np.where(y == 10, np.nan, y))
+        bar = go.Bar(y=y)
+        for trace in [unsorted, markers, stacked, missing, bar]:
+            self.assertIs(downsample_trace(trace, 100), trace)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import numpy as np
+import pandas as pd
+from plotly_presentation._core.utils.frame_helper import (
+    aggregate_bar_frame,
+    project_frame,
+)
+
+
+class AggregateBarFrameTest(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame(
+            {
+                "month": ["Feb", "Jan", "Feb", "Jan", "Feb", "Jan"],
+                "region": ["A", "A", "B", "A", "A", "B"],
+                "sales": [1, 2, 3, 4, 5, 6],
+                "cost": [1, 1, 1, 1, 1, 1],
+            }
+        )
+
+    def test_sum_per_bar_keeps_order(self):
+        kwargs = {"data_frame": self.df, "x": "month", "y": "sales", "color": "region"}
+        factor = aggregate_bar_frame(kwargs, "sum")
+        expected = pd.DataFrame(
+            {
+                "month": ["Feb", "Jan", "Feb", "Jan"],
+                "region": ["A", "A", "B", "B"],
+                "sales": [6, 6, 3, 6],
+            }
+        )
+        pd.testing.assert_frame_equal(kwargs["data_frame"], expected)
+        self.assertEqual(factor, 1.5)
+
+    def test_horizontal_bars_aggregate_x(self):
+        kwargs = {"data_frame": self.df, "x": "sales", "y": "month"}
+        aggregate_bar_frame(kwargs, "mean")
+        self.assertEqual(kwargs["data_frame"]["sales"].tolist(), [3, 4])
+
+    def test_wide_form_values(self):
+        kwargs = {"data_frame": self.df, "x": "month", "y": ["sales", "cost"]}
+        aggregate_bar_frame(kwargs, "max")
+        self.assertEqual(
+            kwargs["data_frame"].columns.tolist(), ["month", "sales", "cost"]
+        )
+        self.assertEqual(kwargs["data_frame"]["sales"].tolist(), [5, 6])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            aggregate_bar_frame(
+                {"data_frame": self.df, "x": "month", "y": "sales"}, "sums"
+            )
+        with self.assertRaises(ValueError):
+            aggregate_bar_frame({"x": ["a"], "y": [1]}, "sum")
+        with self.assertRaises(ValueError):
+            aggregate_bar_frame(
+                {"data_frame": self.df, "x": "month", "y": "sales", "text": "cost"},
+                "sum",
+            )
+
+
+class ProjectFrameTest(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame(
+            {
+                "a": [1.0, 2.0],
+                "b": [3.0, 4.0],
+                "c": ["x", "y"],
+                "d": ["u", "v"],
+                "e": [5, 6],
+            }
+        )
+
+    def test_only_referenced_columns_are_kept(self):
+        kwargs = {
+            "data_frame": self.df,
+            "x": "c",
+            "y": ["a", "b"],
+            "hover_data": {"e": ":.1f", "extra": ("", [1, 2])},
+        }
+        project_frame(kwargs)
+        projected = kwargs["data_frame"]
+        self.assertEqual(projected.columns.tolist(), ["c", "a", "b", "e"])
+        self.assertTrue(np.shares_memory(projected["a"].to_numpy(), self.df["a"]))
+
+    def test_values_are_not_columns(self):
+        kwargs = {"data_frame": self.df, "x": "c", "y": [7, 8], "color": ["p", "q"]}
+        project_frame(kwargs)
+        self.assertEqual(kwargs["data_frame"].columns.tolist(), ["c"])
+
+    def test_integer_column_names(self):
+        df = pd.DataFrame(np.arange(6).reshape(2, 3))
+        kwargs = {"data_frame": df, "x": 0, "y": [2], "color": np.array([1, 1])}
+        project_frame(kwargs)
+        self.assertEqual(kwargs["data_frame"].columns.tolist(), [0, 2])
+
+    def test_frame_is_kept_when_all_columns_may_be_used(self):
+        for kwargs in [
+            {"data_frame": self.df},
+            {"data_frame": self.df, "color": "c"},
+            {"data_frame": self.df, "x": "index_name"},
+            {"data_frame": self.df, "dimensions": None, "color": "c"},
+            {"data_frame": self.df, "x": "c", "y": 3},
+            {"data_frame": self.df, "x": "c", "y": {"a"}},
+        ]:
+            project_frame(kwargs)
+            self.assertIs(kwargs["data_frame"], self.df)
+
+
+if __name__ == "__main__":
+    unittest.main()
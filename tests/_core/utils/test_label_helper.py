@@ -0,0 +1,33 @@
+import unittest
+import numpy as np
+from plotly_presentation._core.utils.label_helper import spread_labels
+
+
+class SpreadLabelsTest(unittest.TestCase):
+    def test_separate_labels_are_kept(self):
+        np.testing.assert_array_equal(spread_labels([0, 50, 20], 10), [0, 50, 20])
+
+    def test_overlapping_labels_are_centered(self):
+        np.testing.assert_allclose(spread_labels([12, 10, 11], 10), [21, 1, 11])
+
+    def test_labels_stay_within_bounds(self):
+        np.testing.assert_allclose(
+            spread_labels([0, 1, 2, 98], 10, lower=0, upper=100), [5, 15, 25, 95]
+        )
+
+    def test_labels_which_do_not_fit_run_over_the_top(self):
+        spread = spread_labels(np.zeros(5), 10, lower=0, upper=20)
+        np.testing.assert_allclose(np.sort(spread), [5, 15, 25, 35, 45])
+
+    def test_labels_of_different_heights(self):
+        spread = spread_labels([0, 0], [10, 30])
+        self.assertEqual(spread[1] - spread[0], 20)
+
+    def test_many_labels_do_not_overlap(self):
+        positions = np.random.default_rng(0).random(1000) * 100
+        spread = np.sort(spread_labels(positions, 2))
+        self.assertGreaterEqual(np.diff(spread).min(), 2 - 1e-9)
+
+
+if __name__ == "__main__":
+    unittest.main()
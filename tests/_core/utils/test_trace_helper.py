@@ -0,0 +1,149 @@
+import unittest
+import numpy as np
+import plotly.graph_objects as go
+from plotly_presentation._core.utils.trace_helper import (
+    consolidate_traces,
+    count_points,
+    promote_to_webgl,
+    set_express_render_mode,
+)
+
+
+class PromoteToWebglTest(unittest.TestCase):
+    def test_small_trace_is_kept(self):
+        trace = go.Scatter(x=[0, 1], y=[0, 1])
+        self.assertIs(promote_to_webgl(trace, threshold=10), trace)
+
+    def test_large_trace_is_promoted(self):
+        x = np.arange(20)
+        trace = go.Scatter(x=x, y=x, name="a", line={"color": "#D73809", "width": 3})
+        with self.assertLogs("plotly_presentation", level="INFO") as logs:
+            promoted = promote_to_webgl(trace, threshold=10)
+        self.assertIsInstance(promoted, go.Scattergl)
+        self.assertEqual(promoted.name, "a")
+        self.assertEqual(promoted.line.color, "#D73809")
+        np.testing.assert_array_equal(promoted.y, x)
+        self.assertIn("scattergl", logs.output[0])
+
+    def test_unsupported_properties_are_kept(self):
+        x = np.arange(20)
+        trace = go.Scatter(x=x, y=x, line_shape="spline")
+        self.assertIs(promote_to_webgl(trace, threshold=10), trace)
+
+    def test_other_traces_are_kept(self):
+        trace = go.Bar(x=np.arange(20), y=np.arange(20))
+        self.assertIs(promote_to_webgl(trace, threshold=10), trace)
+
+    def test_trace_dicts_are_promoted(self):
+        x = np.arange(20)
+        trace = {"type": "scatter", "x": x, "y": x, "line": {"color": "#D73809"}}
+        promoted = promote_to_webgl(trace, threshold=10)
+        self.assertEqual(promoted, {**trace, "type": "scattergl"})
+        self.assertIs(promoted["y"], x)
+        self.assertEqual(trace["type"], "scatter")
+        spline = {"x": x, "y": x, "line": {"shape": "spline"}}
+        self.assertIs(promote_to_webgl(spline, threshold=10), spline)
+
+    def test_count_points(self):
+        self.assertEqual(count_points(go.Scatter(x=[1, 2, 3])), 3)
+        self.assertEqual(count_points(go.Scatter()), 0)
+        self.assertEqual(count_points({"type": "bar", "y": [1, 2]}), 2)
+
+
+class ExpressRenderModeTest(unittest.TestCase):
+    def test_render_mode_follows_threshold(self):
+        small = {"x": list(range(10)), "y": list(range(10))}
+        set_express_render_mode("line", small)
+        self.assertEqual(small["render_mode"], "svg")
+
+        large = {"x": list(range(60_000)), "y": list(range(60_000))}
+        set_express_render_mode("line", large)
+        self.assertEqual(large["render_mode"], "webgl")
+
+    def test_explicit_render_mode_is_kept(self):
+        kwargs = {"x": list(range(60_000)), "render_mode": "svg"}
+        set_express_render_mode("scatter", kwargs)
+        self.assertEqual(kwargs["render_mode"], "svg")
+
+    def test_other_charts_are_untouched(self):
+        kwargs = {"x": list(range(60_000))}
+        set_express_render_mode("bar", kwargs)
+        self.assertNotIn("render_mode", kwargs)
+
+
+class ConsolidateTracesTest(unittest.TestCase):
+    def test_lines_with_same_style_are_merged(self):
+        grey = {"color": "#cccccc", "width": 1}
+        traces = [
+            go.Scatter(x=[0, 1], y=[1, 2], name="a", line=grey),
+            go.Scatter(x=[0, 1, 2], y=[3, 4, 5], name="b", line=grey),
+            go.Scatter(x=[0, 1], y=[5, 6], name="highlight"),
+        ]
+        result = consolidate_traces(traces, colorway=["#D73809", "#60748D", "#000"])
+        self.assertEqual(len(result), 2)
+        merged = result[0]
+        np.testing.assert_array_equal(merged.x, [0, 1, 1, 0, 1, 2, 2])
+        np.testing.assert_array_equal(merged.y, [1, 2, np.nan, 3, 4, 5, np.nan])
+        self.assertEqual(list(merged.customdata), ["a", "a", "", "b", "b", "b", ""])
+        self.assertEqual(merged.line.color, "#cccccc")
+        self.assertFalse(merged.showlegend)
+        # The highlight keeps the third colorway color, although it is now second
+        self.assertEqual(result[1].line.color, "#000")
+
+    def test_one_letter_names_in_hovertemplate(self):
+        traces = [
+            go.Scatter(
+                x=[0, 1],
+                y=[i, i + 1],
+                name=name,
+                line_color="grey",
+                hovertemplate=f"variable={name}<br>x=%{{x}}<br>y=%{{y}}<extra></extra>",
+            )
+            for i, name in enumerate(["a", "b", "x"])
+        ]
+        (merged,) = consolidate_traces(traces)
+        self.assertEqual(
+            merged.hovertemplate,
+            "variable=%{customdata}<br>x=%{x}<br>y=%{y}<extra></extra>",
+        )
+        self.assertEqual(list(merged.customdata[:3]), ["a", "a", ""])
+
+    def test_automatic_colors_are_not_merged(self):
+        traces = [go.Scatter(y=[1, 2]), go.Scatter(y=[3, 4])]
+        self.assertEqual(len(consolidate_traces(traces, colorway=["red", "blue"])), 2)
+        self.assertEqual(len(consolidate_traces(traces, colorway=["red"])), 1)
+
+    def test_bars_get_a_color_per_bar(self):
+        traces = [
+            go.Bar(x=["a"], y=[1], name="a", marker_color="red"),
+            go.Bar(x=["b"], y=[2], name="b", marker_color="blue"),
+        ]
+        (merged,) = consolidate_traces(traces)
+        self.assertEqual(list(merged.x), ["a", "b"])
+        self.assertEqual(list(merged.marker.color), ["red", "blue"])
+        self.assertEqual(list(merged.customdata), ["a", "b"])
+
+    def test_overlapping_and_grouped_bars_are_kept(self):
+        traces = [go.Bar(x=["a"], y=[1]), go.Bar(x=["a"], y=[2])]
+        self.assertEqual(len(consolidate_traces(traces, colorway=["red"])), 2)
+        traces = [go.Bar(x=["a"], y=[1]), go.Bar(x=["b"], y=[2])]
+        self.assertEqual(
+            len(consolidate_traces(traces, colorway=["red"], barmode="group")), 2
+        )
+
+    def test_per_point_properties_are_kept(self):
+        traces = [
+            go.Scatter(y=[1, 2], text=["x", "y"], line_color="grey"),
+            go.Scatter(y=[3, 4], line_color="grey"),
+        ]
+        self.assertEqual(len(consolidate_traces(traces)), 2)
+
+    def test_without_names(self):
+        traces = [go.Scatter(y=[1], line_color="grey") for _ in range(3)]
+        (merged,) = consolidate_traces(traces, keep_names=False)
+        self.assertIsNone(merged.customdata)
+        self.assertEqual(len(merged.y), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import json
+import subprocess
+import sys
+import unittest
+
+# Generous upper bound for `import plotly_presentation` in a fresh interpreter.
+# The package surface is lazy, so the import itself should only take a few ms.
+_IMPORT_TIME_BUDGET_SECONDS = 0.5
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import plotly_presentation
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def _run_probe(code):
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+class LazyImportTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.result = _run_probe(_PROBE)
+
+    def test_import_time_budget(self):
+        self.assertLess(self.result["elapsed"], _IMPORT_TIME_BUDGET_SECONDS)
+
+    def test_import_does_not_load_heavy_modules(self):
+        modules = set(self.result["modules"])
+        for module in [
+            "plotly_presentation.examples",
+            "plotly_presentation._core.plotter",
+            "plotly.express",
+            "pandas",
+        ]:
+            self.assertNotIn(module, modules)
+
+    def test_plotter_does_not_load_plotly_express(self):
+        result = _run_probe(
+            "import json, sys\n"
+            "from plotly_presentation import Plotter\n"
+            "print(json.dumps({'modules': sorted(sys.modules)}))"
+        )
+        self.assertNotIn("plotly.express", result["modules"])
+        self.assertNotIn("plotly_presentation.examples", result["modules"])
+
+    def test_renderer_is_not_changed_until_examples_are_used(self):
+        result = _run_probe(
+            "import json\n"
+            "import plotly.io as pio\n"
+            "default = pio.renderers.default\n"
+            "import plotly_presentation\n"
+            "from plotly_presentation import Plotter, Analysis\n"
+            "print(json.dumps({'unchanged': pio.renderers.default == default}))"
+        )
+        self.assertTrue(result["unchanged"])
+
+    def test_lazy_attributes(self):
+        import plotly_presentation
+        from plotly_presentation._core.plotter import Plotter
+        from plotly_presentation._core.analysis import Analysis
+
+        self.assertIs(plotly_presentation.Plotter, Plotter)
+        self.assertIs(plotly_presentation.Analysis, Analysis)
+        self.assertIn("examples", dir(plotly_presentation))
+
+    def test_unknown_attribute(self):
+        import plotly_presentation
+
+        with self.assertRaises(AttributeError):
+            plotly_presentation.some_attribute_that_does_not_exist
+
+
+if __name__ == "__main__":
+    unittest.main()